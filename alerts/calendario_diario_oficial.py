@@ -0,0 +1,207 @@
+"""
+Calendario de publicación del Diario Oficial y estimación del número de edición.
+
+El Diario Oficial publica una edición de lunes a sábado, salvo feriados. Como cada
+día de publicación suma exactamente una edición, el número de una fecha es el de
+una edición conocida más los días de publicación entre ambas. Ese conteo se hace
+en forma cerrada (semanas completas más el resto, menos los feriados del rango
+buscados con bisect), sin recorrer el calendario día a día.
+"""
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+# Lunes desde el que se cuentan los días de publicación (la edición electrónica parte el 17/08/2016)
+EPOCA = date(2016, 8, 15)
+
+# Feriados fijos (mes, día)
+FERIADOS_FIJOS = [
+    (1, 1),    # Año Nuevo
+    (5, 1),    # Día del Trabajo
+    (5, 21),   # Glorias Navales
+    (7, 16),   # Virgen del Carmen
+    (8, 15),   # Asunción de la Virgen
+    (9, 18),   # Independencia
+    (9, 19),   # Glorias del Ejército
+    (11, 1),   # Todos los Santos
+    (12, 8),   # Inmaculada Concepción
+    (12, 25),  # Navidad
+]
+
+# Día Nacional de los Pueblos Indígenas (Ley 21.357): el día del solsticio de invierno
+SOLSTICIO_INVIERNO = {2021: 21, 2022: 21, 2023: 21, 2024: 20, 2025: 20, 2026: 21, 2027: 21, 2028: 20}
+
+# Feriados que se fijan por ley cada año (elecciones, "puentes")
+FERIADOS_EXTRAORDINARIOS = {
+    2024: [date(2024, 6, 9), date(2024, 9, 20), date(2024, 10, 26), date(2024, 10, 27)],
+    2025: [date(2025, 11, 16), date(2025, 12, 14)],
+    2026: [],
+}
+
+# Años cuyos feriados extraordinarios están al día; fuera de ellos la estimación es menos confiable
+ANIOS_CUBIERTOS = frozenset(FERIADOS_EXTRAORDINARIOS)
+
+# Probabilidad de que un día de publicación no traiga sorpresas (feriado no previsto,
+# edición extraordinaria); la confianza de una estimación decae con la distancia a la referencia
+CONFIANZA_POR_DIA = 0.99
+
+
+class EstimacionEdicion(NamedTuple):
+    """Número de edición estimado para una fecha y qué tan confiable es (0 a 1)"""
+    numero: int
+    confianza: float
+    referencia: date
+    dias_publicacion: int
+
+
+def _pascua(anio: int) -> date:
+    """Domingo de Pascua (algoritmo de Meeus/Jones/Butcher)"""
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(anio, mes, dia + 1)
+
+
+def _trasladar_a_lunes(dia: date) -> date:
+    """Ley 19.668: de martes a jueves pasa al lunes anterior; el viernes, al lunes siguiente"""
+    dia_semana = dia.weekday()
+    if 1 <= dia_semana <= 3:
+        return dia - timedelta(days=dia_semana)
+    if dia_semana == 4:
+        return dia + timedelta(days=3)
+    return dia
+
+
+def _iglesias_evangelicas(anio: int) -> date:
+    """Ley 20.299: si el 31 de octubre es martes pasa al viernes 27; si es miércoles, al viernes 2"""
+    dia = date(anio, 10, 31)
+    if dia.weekday() == 1:
+        return date(anio, 10, 27)
+    if dia.weekday() == 2:
+        return date(anio, 11, 2)
+    return dia
+
+
+@lru_cache(maxsize=None)
+def feriados(anio: int) -> Tuple[date, ...]:
+    """Feriados nacionales del año, ordenados"""
+    dias = {date(anio, mes, dia) for mes, dia in FERIADOS_FIJOS}
+    pascua = _pascua(anio)
+    dias.add(pascua - timedelta(days=2))  # Viernes Santo
+    dias.add(pascua - timedelta(days=1))  # Sábado Santo
+    dias.add(_trasladar_a_lunes(date(anio, 6, 29)))   # San Pedro y San Pablo
+    dias.add(_trasladar_a_lunes(date(anio, 10, 12)))  # Encuentro de Dos Mundos
+    dias.add(_iglesias_evangelicas(anio))
+    if anio >= 2021:
+        dias.add(date(anio, 6, SOLSTICIO_INVIERNO.get(anio, 21)))
+    dias.update(FERIADOS_EXTRAORDINARIOS.get(anio, []))
+    return tuple(sorted(dias))
+
+
+@lru_cache(maxsize=None)
+def _feriados_de_publicacion(anio: int) -> Tuple[date, ...]:
+    """Feriados del año que caen de lunes a sábado (los que quitan una edición)"""
+    return tuple(d for d in feriados(anio) if d.weekday() < 6 and d >= EPOCA)
+
+
+@lru_cache(maxsize=None)
+def _feriados_antes_de(anio: int) -> int:
+    """Feriados de publicación desde EPOCA hasta el fin del año anterior"""
+    if anio <= EPOCA.year:
+        return 0
+    return _feriados_antes_de(anio - 1) + len(_feriados_de_publicacion(anio - 1))
+
+
+def es_dia_de_publicacion(dia: date) -> bool:
+    """Si en la fecha corresponde una edición ordinaria"""
+    return dia.weekday() < 6 and dia not in feriados(dia.year)
+
+
+def ordinal(dia: date) -> int:
+    """Días de publicación desde EPOCA hasta la fecha, inclusive"""
+    semanas, resto = divmod((dia - EPOCA).days, 7)
+    lunes_a_sabado = semanas * 6 + min(resto + 1, 6)
+    feriados_hasta = _feriados_antes_de(dia.year) + bisect_right(_feriados_de_publicacion(dia.year), dia)
+    return lunes_a_sabado - feriados_hasta
+
+
+def dias_de_publicacion(desde: date, hasta: date) -> int:
+    """Días de publicación en (desde, hasta]; negativo si hasta es anterior"""
+    return ordinal(hasta) - ordinal(desde)
+
+
+def estimar(dia: date, referencia: Tuple[date, int]) -> EstimacionEdicion:
+    """
+    Estima la edición de la fecha a partir de una edición conocida (fecha, número).
+    La confianza es 0 si la fecha no es día de publicación, cae con cada día de
+    publicación que la separa de la referencia y se reduce a la mitad si el rango
+    incluye años sin feriados extraordinarios cargados.
+    """
+    fecha_ref, numero_ref = referencia
+    dias = dias_de_publicacion(fecha_ref, dia)
+    confianza = CONFIANZA_POR_DIA ** abs(dias)
+    if not es_dia_de_publicacion(dia):
+        confianza = 0.0
+    elif any(anio not in ANIOS_CUBIERTOS for anio in range(min(fecha_ref, dia).year, max(fecha_ref, dia).year + 1)):
+        confianza /= 2
+    return EstimacionEdicion(numero_ref + dias, round(confianza, 4), fecha_ref, dias)
+
+
+class Discrepancia(NamedTuple):
+    """Par de ediciones conocidas consecutivas que el calendario no explica"""
+    fecha_anterior: date
+    fecha: date
+    esperado: int
+    registrado: int
+
+
+def validar(ediciones: Dict[date, int]) -> Tuple[int, List[Discrepancia]]:
+    """
+    Contrasta el calendario con ediciones conocidas: para cada par de fechas
+    consecutivas, la diferencia de número debe ser igual a los días de publicación
+    entre ellas. Retorna (pares que coinciden, discrepancias).
+    """
+    ordenadas = sorted((d, int(n)) for d, n in ediciones.items())
+    aciertos = 0
+    discrepancias = []
+    for (fecha_anterior, numero_anterior), (dia, numero) in zip(ordenadas, ordenadas[1:]):
+        esperado = numero_anterior + dias_de_publicacion(fecha_anterior, dia)
+        if esperado == numero:
+            aciertos += 1
+        else:
+            discrepancias.append(Discrepancia(fecha_anterior, dia, esperado, numero))
+    return aciertos, discrepancias
+
+
+def fuera_de_calendario(ediciones: Dict[date, int]) -> List[date]:
+    """
+    Fechas de ediciones conocidas que contradicen a sus vecinas: un tramo cuyo desfase
+    con el calendario (número menos días de publicación) difiere del de las ediciones
+    anteriores y posteriores, que sí coinciden entre sí; p. ej. números corridos en uno
+    durante unos días. Un cambio de desfase que se mantiene hasta el final (un feriado
+    no previsto) no se descarta. Son los tramos entre dos discrepancias de validar().
+    """
+    tramos: List[Tuple[int, List[date]]] = []
+    for dia, numero in sorted((d, int(n)) for d, n in ediciones.items()):
+        desfase = numero - ordinal(dia)
+        if tramos and tramos[-1][0] == desfase:
+            tramos[-1][1].append(dia)
+        else:
+            tramos.append((desfase, [dia]))
+
+    descartadas = []
+    vigente = tramos[0][0] if tramos else None
+    for (desfase, dias), siguiente in zip(tramos[1:], tramos[2:]):
+        if desfase != vigente and siguiente[0] == vigente:
+            descartadas += dias
+        else:
+            vigente = desfase
+    return descartadas
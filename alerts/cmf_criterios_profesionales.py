@@ -2,6 +2,10 @@
 Criterios profesionales para análisis de hechos esenciales CMF
 Basado en mejores prácticas de Bloomberg/Refinitiv
 """
+import re
+from functools import lru_cache
+
+from alerts.utils.keyword_matcher import BuscadorPalabras
 
 # Empresas IPSA (actualizar semestralmente según cambios en el índice)
 EMPRESAS_IPSA = {
@@ -239,24 +243,86 @@ CATEGORIAS_HECHOS = {
     }
 }
 
+class _BuscadorEmpresas:
+    """
+    Coincidencia en ambos sentidos entre un nombre y una lista de empresas: alguna
+    empresa de la lista aparece dentro del nombre (una sola regex con todas las
+    alternativas) o el nombre es parte de alguna empresa (conjunto de todas sus
+    subcadenas). Ambas consultas toman tiempo constante respecto del tamaño de la lista.
+    """
+
+    def __init__(self, empresas):
+        empresas = sorted(empresas, key=len, reverse=True)
+        self._regex = re.compile('|'.join(re.escape(e) for e in empresas))
+        self._subcadenas = frozenset(
+            e[i:j] for e in empresas for i in range(len(e)) for j in range(i + 1, len(e) + 1)
+        )
+        self._vacia = bool(empresas)  # "" está contenido en cualquier empresa
+
+    def coincide(self, nombre_upper):
+        if not nombre_upper:
+            return self._vacia
+        return nombre_upper in self._subcadenas or self._regex.search(nombre_upper) is not None
+
+_BUSCADOR_IPSA = _BuscadorEmpresas(EMPRESAS_IPSA)
+_BUSCADOR_ESTRATEGICAS = _BuscadorEmpresas(EMPRESAS_ESTRATEGICAS)
+
+@lru_cache(maxsize=4096)
+def clasificar_empresa(nombre_empresa):
+    """
+    Clasifica una entidad por nombre (en mayúsculas y sin espacios en los extremos).
+
+    Returns:
+        tuple: (es_ipsa, es_estrategica)
+    """
+    nombre_upper = nombre_empresa.upper().strip()
+    es_ipsa = _BUSCADOR_IPSA.coincide(nombre_upper)
+    return es_ipsa, es_ipsa or _BUSCADOR_ESTRATEGICAS.coincide(nombre_upper)
+
 def es_empresa_ipsa(nombre_empresa):
     """Verifica si la empresa pertenece al IPSA"""
-    nombre_upper = nombre_empresa.upper().strip()
-    for empresa_ipsa in EMPRESAS_IPSA:
-        if empresa_ipsa in nombre_upper or nombre_upper in empresa_ipsa:
-            return True
-    return False
+    return clasificar_empresa(nombre_empresa)[0]
 
 def es_empresa_estrategica(nombre_empresa):
     """Verifica si la empresa es estratégica (IPSA o adicional)"""
-    if es_empresa_ipsa(nombre_empresa):
-        return True
-    
-    nombre_upper = nombre_empresa.upper().strip()
-    for empresa in EMPRESAS_ESTRATEGICAS:
-        if empresa in nombre_upper or nombre_upper in empresa:
-            return True
-    return False
+    return clasificar_empresa(nombre_empresa)[1]
+
+class _ClasificadorCategorias:
+    """
+    Busca todas las palabras clave de CATEGORIAS_HECHOS en una sola pasada por el
+    texto (ver BuscadorPalabras) y elige la categoría de mayor prioridad encontrada.
+    """
+
+    def __init__(self, categorias):
+        self._prioridad = {}
+        for prioridad, info in enumerate(categorias.values()):
+            for keyword in info["keywords"]:
+                self._prioridad.setdefault(keyword, prioridad)
+        self._categorias = list(categorias)
+        self._buscador = BuscadorPalabras(self._prioridad)
+
+    def clasificar(self, texto):
+        """(categoría de mayor prioridad o None, palabras clave encontradas en orden de aparición)"""
+        encontradas = self._buscador.encontrar(texto)
+        if not encontradas:
+            return None, ()
+        prioridad = min(self._prioridad[k] for k in encontradas)
+        return self._categorias[prioridad], tuple(encontradas)
+
+_CLASIFICADOR_CATEGORIAS = _ClasificadorCategorias(CATEGORIAS_HECHOS)
+
+@lru_cache(maxsize=1024)
+def clasificar_criticidad(titulo, materia=""):
+    """
+    Categoría del hecho según sus palabras clave y todas las palabras clave que
+    aparecen en el título y la materia (para explicar la clasificación). Se memoriza
+    por texto: cada pasada de filtrado vuelve a clasificar los mismos hechos.
+
+    Returns:
+        tuple: (categoria, palabras_clave)
+    """
+    categoria, palabras_clave = _CLASIFICADOR_CATEGORIAS.clasificar(f"{titulo} {materia}".lower())
+    return categoria or "RUTINARIO", palabras_clave
 
 def evaluar_criticidad_hecho(titulo, materia, entidad):
     """
@@ -265,17 +331,8 @@ def evaluar_criticidad_hecho(titulo, materia, entidad):
     Returns:
         tuple: (categoria, peso_base, es_prioritaria)
     """
-    texto_completo = f"{titulo} {materia}".lower()
-    es_prioritaria = es_empresa_estrategica(entidad)
-    
-    # Evaluar cada categoría
-    for categoria, info in CATEGORIAS_HECHOS.items():
-        for keyword in info["keywords"]:
-            if keyword in texto_completo:
-                return categoria, info["peso"], es_prioritaria
-    
-    # Por defecto es rutinario
-    return "RUTINARIO", CATEGORIAS_HECHOS["RUTINARIO"]["peso"], es_prioritaria
+    categoria, _ = clasificar_criticidad(titulo, materia)
+    return categoria, CATEGORIAS_HECHOS[categoria]["peso"], es_empresa_estrategica(entidad)
 
 def calcular_relevancia_profesional(titulo, materia, entidad, contexto_adicional=""):
     """
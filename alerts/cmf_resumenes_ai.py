@@ -2,11 +2,25 @@
 Generador de resúmenes con IA para hechos esenciales CMF
 """
 import os
-import requests
 from dotenv import load_dotenv
+from alerts.services.summary_store import summary_store, version_prompt
+from alerts.utils import http_client
 
 load_dotenv()
 
+PROMPT_RESUMEN_CMF = """Eres un analista financiero experto. Genera un resumen conciso (máximo 2 líneas) de este hecho esencial para inversionistas.
+
+{contexto}
+
+El resumen debe:
+1. Explicar brevemente qué acción tomó la empresa
+2. Mencionar el impacto potencial para inversionistas
+3. Ser objetivo y profesional
+4. NO incluir emojis ni caracteres especiales
+
+Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales."""
+VERSION_PROMPT_RESUMEN_CMF = version_prompt(PROMPT_RESUMEN_CMF)
+
 def generar_resumen_cmf_openai(entidad, materia, texto_pdf=None):
     """
     Genera un resumen usando OpenAI para hechos esenciales CMF
@@ -21,17 +35,7 @@ def generar_resumen_cmf_openai(entidad, materia, texto_pdf=None):
         if texto_pdf and len(texto_pdf) > 100:
             contexto += f"\n\nDetalles del hecho:\n{texto_pdf[:3000]}"
         
-        prompt = f"""Eres un analista financiero experto. Genera un resumen conciso (máximo 2 líneas) de este hecho esencial para inversionistas.
-
-{contexto}
-
-El resumen debe:
-1. Explicar brevemente qué acción tomó la empresa
-2. Mencionar el impacto potencial para inversionistas
-3. Ser objetivo y profesional
-4. NO incluir emojis ni caracteres especiales
-
-Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales."""
+        prompt = PROMPT_RESUMEN_CMF.format(contexto=contexto)
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -48,7 +52,7 @@ Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales.""
             "max_tokens": 150
         }
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=data,
@@ -81,17 +85,7 @@ def generar_resumen_cmf_groq(entidad, materia, texto_pdf=None):
         if texto_pdf and len(texto_pdf) > 100:
             contexto += f"\n\nDetalles del hecho:\n{texto_pdf[:2000]}"
         
-        prompt = f"""Eres un analista financiero experto. Genera un resumen conciso (máximo 2 líneas) de este hecho esencial para inversionistas.
-
-{contexto}
-
-El resumen debe:
-1. Explicar brevemente qué acción tomó la empresa
-2. Mencionar el impacto potencial para inversionistas
-3. Ser objetivo y profesional
-4. NO incluir emojis ni caracteres especiales
-
-Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales."""
+        prompt = PROMPT_RESUMEN_CMF.format(contexto=contexto)
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -108,7 +102,7 @@ Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales.""
             "max_tokens": 150
         }
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.groq.com/openai/v1/chat/completions",
             headers=headers,
             json=data,
@@ -127,20 +121,23 @@ Responde SOLO con el resumen, sin introducciones ni explicaciones adicionales.""
         print(f"[Groq] Error generando resumen CMF: {str(e)}")
         return None
 
-def generar_resumen_cmf(entidad, materia, texto_pdf=None):
+def generar_resumen_cmf(entidad, materia, texto_pdf=None, url=None):
     """
     Genera un resumen con IA para hechos esenciales CMF.
     Intenta con OpenAI primero, luego con Groq.
+    Si el mismo hecho ya se resumió con el prompt actual, reutiliza el resumen guardado.
     """
-    # Intentar con OpenAI
-    resumen = generar_resumen_cmf_openai(entidad, materia, texto_pdf)
-    if resumen:
-        return resumen
-    
-    # Si falla OpenAI, intentar con Groq
-    resumen = generar_resumen_cmf_groq(entidad, materia, texto_pdf)
+    resumen = summary_store.obtener_o_generar(
+        url,
+        f"{entidad}\n{materia}\n{texto_pdf or ''}",
+        VERSION_PROMPT_RESUMEN_CMF,
+        [
+            ('gpt-4o-mini', lambda: generar_resumen_cmf_openai(entidad, materia, texto_pdf)),
+            ('mixtral-8x7b-32768', lambda: generar_resumen_cmf_groq(entidad, materia, texto_pdf)),
+        ]
+    )
     if resumen:
         return resumen
     
     # Si todo falla, retornar un resumen básico
-    return f"{entidad} - {materia}"
\ No newline at end of file
+    return f"{entidad} - {materia}"
@@ -2,12 +2,81 @@
 Evaluador de relevancia basado en IA para publicaciones del Diario Oficial
 """
 import os
-import requests
+import re
+import json
+import hashlib
+import threading
 from dotenv import load_dotenv
+from alerts.reglas_relevancia import motor_reglas
+from alerts.services.verdict_cache import VerdictCache
+from alerts.utils import http_client
+
+# Criterios compartidos por los prompts de evaluación
+CRITERIOS_RELEVANCIA = """Una publicación es RELEVANTE si cumple TODOS estos criterios:
+- Tiene alcance nacional o afecta a múltiples regiones
+- Impacta a un sector económico completo o múltiples empresas
+- Y además cumple alguno de estos:
+  1. Crea o modifica leyes, decretos supremos o políticas públicas importantes
+  2. Establece nuevos procedimientos o requisitos de cumplimiento obligatorio
+  3. Modifica significativamente tarifas, precios o impuestos (no ajustes rutinarios)
+  4. Establece medidas de emergencia nacionales
+  5. Define estrategias nacionales de desarrollo
+  6. Abre procesos de consulta ciudadana nacional
+  7. Convoca a licitaciones públicas de gran envergadura (>1000 UF)
+  8. Actualiza o establece programas de regulación ambiental o normas de emisión
+  9. Define nuevos estándares ambientales o modifica los existentes
+  10. Es emitido por el SII (Servicio de Impuestos Internos) - SIEMPRE relevante
+  11. Es emitido por la CMF y afecta empresas IPSA o mercados regulados
+
+Una publicación NO es relevante si:
+1. Es un nombramiento o designación individual
+2. Es una rectificación o fe de erratas
+3. Afecta solo a una persona, empresa o localidad específica
+4. Es un permiso o concesión individual
+5. Es de alcance muy local o específico
+6. Son ajustes rutinarios de precios (combustibles, kerosene)
+7. Son medidas fitosanitarias locales o regionales
+8. Afecta solo a beneficiarios de programas específicos
+9. Es una resolución de alcance limitado a una región o comuna"""
+
+PROMPT_LOTE = """Eres un experto en análisis de normativas chilenas. Evalúa si cada una de las siguientes publicaciones del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
+
+{criterios}
+
+Publicaciones (una por línea, con su número):
+{items}
+
+Responde SOLO con un objeto JSON con este formato exacto, incluyendo TODAS las publicaciones:
+{{"resultados": [{{"id": 1, "relevante": true, "razon": "Explicación en una línea"}}]}}"""
+
+PROMPT_INDIVIDUAL = """Eres un experto en análisis de normativas chilenas. Evalúa si la siguiente publicación del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
+
+{criterios}
+
+{contexto}
+
+Responde SOLO con:
+RELEVANTE: [SÍ/NO]
+RAZÓN: [Explicación en una línea]"""
+
+# Cambia automáticamente al modificar cualquier prompt, invalidando los veredictos guardados
+VERSION_PROMPT = hashlib.sha256(
+    (CRITERIOS_RELEVANCIA + PROMPT_LOTE + PROMPT_INDIVIDUAL).encode('utf-8')
+).hexdigest()[:16]
+
 
 class EvaluadorRelevancia:
     """Evalúa la relevancia de publicaciones usando IA"""
     
+    # Número máximo de títulos por prompt en la evaluación por lotes
+    TAMANO_LOTE = 40
+    
+    # Veredictos persistentes en la base de datos (None para desactivar)
+    cache_veredictos = VerdictCache(VERSION_PROMPT)
+    
+    # Marca por hilo para saber si un veredicto terminó saliendo de las reglas
+    _estado = threading.local()
+    
     def __init__(self):
         load_dotenv()
         
@@ -48,25 +117,204 @@ class EvaluadorRelevancia:
         Evalúa si una publicación es relevante para incluir en el informe diario.
         Retorna: (es_relevante: bool, justificacion: str)
         """
-        # Si hay OpenAI configurado, usarlo primero
-        if self.use_openai:
-            return self._evaluar_con_openai(titulo, texto_pdf)
+        proveedor = self._proveedor_activo()
+        self._estado.uso_reglas = False
         
-        # Si no hay OpenAI pero sí Groq, usarlo
-        if self.use_groq:
-            return self._evaluar_con_groq(titulo, texto_pdf)
+        # Si no hay IA disponible, usar reglas
+        if not proveedor:
+            return self._evaluar_con_reglas(titulo)
         
-        # Si no hay Groq pero sí DeepSeek, usarlo
-        if self.use_deepseek:
-            return self._evaluar_con_deepseek(titulo, texto_pdf)
+        if self.cache_veredictos:
+            en_cache = self.cache_veredictos.get(titulo, texto_pdf)
+            if en_cache:
+                return en_cache
         
+        # Si hay OpenAI configurado, usarlo primero
+        if proveedor == 'openai':
+            resultado = self._evaluar_con_openai(titulo, texto_pdf)
+        # Si no hay OpenAI pero sí Groq, usarlo
+        elif proveedor == 'groq':
+            resultado = self._evaluar_con_groq(titulo, texto_pdf)
+        # Si no hay Groq pero sí DeepSeek, usarlo
+        elif proveedor == 'deepseek':
+            resultado = self._evaluar_con_deepseek(titulo, texto_pdf)
         # Si no hay DeepSeek pero sí Gemini, usarlo
-        if hasattr(self, 'model') and self.model:
-            return self._evaluar_con_gemini(titulo, texto_pdf)
+        else:
+            resultado = self._evaluar_con_gemini(titulo, texto_pdf)
         
-        # Si no hay IA disponible, usar reglas
-        return self._evaluar_con_reglas(titulo)
-    
+        # Los veredictos por reglas son baratos y no se guardan
+        if self.cache_veredictos and not self._estado.uso_reglas:
+            self.cache_veredictos.set(titulo, texto_pdf, resultado[0], resultado[1], proveedor)
+        
+        return resultado
+
+    def evaluar_lote(self, titulos, tamano_lote=None):
+        """
+        Evalúa la relevancia de muchos títulos agrupándolos en pocos prompts.
+        Retorna una lista de (es_relevante: bool, justificacion: str) en el mismo orden.
+        Los títulos con veredicto guardado no se envían a la IA y los ítems sin
+        veredicto válido en la respuesta se evalúan con reglas.
+        """
+        titulos = list(titulos)
+        tamano_lote = tamano_lote or self.TAMANO_LOTE
+        proveedor = self._proveedor_activo()
+        self._estado.titulos_por_reglas = set()
+
+        if not proveedor:
+            self._estado.titulos_por_reglas = set(titulos)
+            return self._evaluar_lote_con_reglas(titulos)
+
+        veredictos_titulo = self.cache_veredictos.get_many(titulos) if self.cache_veredictos else {}
+        if veredictos_titulo:
+            print(f"[Lote] {len(veredictos_titulo)} títulos con veredicto en caché")
+
+        # Cada título distinto se envía una sola vez
+        pendientes = list(dict.fromkeys(t for t in titulos if t not in veredictos_titulo))
+
+        for inicio in range(0, len(pendientes), tamano_lote):
+            bloque = pendientes[inicio:inicio + tamano_lote]
+            try:
+                respuesta = self._consultar_lote(bloque)
+                veredictos = self._parsear_respuesta_lote(respuesta, len(bloque))
+            except Exception as e:
+                print(f"[Lote] Error evaluando {len(bloque)} títulos: {str(e)}")
+                veredictos = {}
+
+            faltantes = len(bloque) - len(veredictos)
+            if faltantes:
+                print(f"[Lote] {faltantes} de {len(bloque)} títulos sin veredicto válido, usando reglas")
+
+            sin_veredicto = []
+            for i, titulo in enumerate(bloque, start=1):
+                if i in veredictos:
+                    veredictos_titulo[titulo] = veredictos[i]
+                    if self.cache_veredictos:
+                        self.cache_veredictos.set(titulo, None, veredictos[i][0], veredictos[i][1], proveedor)
+                else:
+                    sin_veredicto.append(titulo)
+            if sin_veredicto:
+                self._estado.titulos_por_reglas.update(sin_veredicto)
+                veredictos_titulo.update(zip(sin_veredicto, self._evaluar_lote_con_reglas(sin_veredicto)))
+
+        return [veredictos_titulo[titulo] for titulo in titulos]
+
+    def veredicto_por_reglas(self):
+        """True si el último evaluar_relevancia() de este hilo terminó usando las reglas"""
+        return getattr(self._estado, 'uso_reglas', False)
+
+    def titulos_por_reglas(self):
+        """Títulos del último evaluar_lote() de este hilo que se evaluaron con reglas"""
+        return getattr(self._estado, 'titulos_por_reglas', set())
+
+    def _proveedor_activo(self):
+        """Retorna el nombre del proveedor de IA que se usará, o None si no hay ninguno"""
+        if self.use_openai:
+            return 'openai'
+        if self.use_groq:
+            return 'groq'
+        if self.use_deepseek:
+            return 'deepseek'
+        if getattr(self, 'model', None):
+            return 'gemini'
+        return None
+
+    def _consultar_lote(self, titulos):
+        """Envía un prompt con varios títulos al proveedor configurado y retorna la respuesta en texto"""
+        items = "\n".join(f"{i}. {' '.join(titulo.split())}" for i, titulo in enumerate(titulos, start=1))
+        prompt = PROMPT_LOTE.format(criterios=CRITERIOS_RELEVANCIA, items=items)
+        max_tokens = 60 * len(titulos) + 100
+
+        if self.use_openai:
+            return self._llamar_chat(
+                "https://api.openai.com/v1/chat/completions", self.openai_api_key,
+                "gpt-4o-mini", prompt, max_tokens, json_mode=True
+            )
+        if self.use_groq:
+            return self._llamar_chat(
+                "https://api.groq.com/openai/v1/chat/completions", self.groq_api_key,
+                "mixtral-8x7b-32768", prompt, max_tokens
+            )
+        if self.use_deepseek:
+            return self._llamar_chat(
+                "https://api.deepseek.com/v1/chat/completions", self.deepseek_api_key,
+                "deepseek-chat", prompt, max_tokens
+            )
+        response = self.model.generate_content(prompt)
+        return response.text
+
+    def _llamar_chat(self, url, api_key, modelo, prompt, max_tokens, json_mode=False):
+        """Llama a una API compatible con chat completions de OpenAI"""
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        data = {
+            "model": modelo,
+            "messages": [
+                {"role": "system", "content": "Eres un experto en análisis de normativas chilenas."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens
+        }
+        if json_mode:
+            data["response_format"] = {"type": "json_object"}
+
+        response = http_client.post(url, headers=headers, json=data, timeout=60)
+        if response.status_code != 200:
+            raise RuntimeError(f"Error {response.status_code}: {response.text[:200]}")
+        return response.json()['choices'][0]['message']['content']
+
+    @staticmethod
+    def _parsear_respuesta_lote(respuesta, total):
+        """
+        Parsea la respuesta JSON de un lote.
+        Retorna un dict {id: (es_relevante, razon)} solo con los ítems bien formados.
+        """
+        if not respuesta:
+            return {}
+
+        # Tolerar bloques de código o texto alrededor del JSON
+        match = re.search(r'[\[{].*[\]}]', respuesta, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            datos = json.loads(match.group(0))
+        except ValueError:
+            return {}
+
+        if isinstance(datos, dict):
+            datos = datos.get('resultados', [])
+        if not isinstance(datos, list):
+            return {}
+
+        veredictos = {}
+        for item in datos:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get('id'))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= item_id <= total or item_id in veredictos:
+                continue
+
+            relevante = item.get('relevante')
+            if isinstance(relevante, str):
+                relevante = relevante.strip().upper()
+                if relevante in ('SÍ', 'SI', 'TRUE'):
+                    relevante = True
+                elif relevante in ('NO', 'FALSE'):
+                    relevante = False
+            if not isinstance(relevante, bool):
+                continue
+
+            razon = item.get('razon')
+            razon = razon.strip() if isinstance(razon, str) and razon.strip() else "Evaluado por IA"
+            veredictos[item_id] = (relevante, razon)
+
+        return veredictos
+
     def _evaluar_con_openai(self, titulo, texto_pdf=None):
         """Evalúa relevancia usando OpenAI API"""
         try:
@@ -75,40 +323,7 @@ class EvaluadorRelevancia:
             if texto_pdf and len(texto_pdf) > 100:
                 contexto += f"\n\nPrimeras líneas del documento:\n{texto_pdf[:2000]}"
             
-            prompt = f"""Eres un experto en análisis de normativas chilenas. Evalúa si la siguiente publicación del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
-
-Una publicación es RELEVANTE si cumple TODOS estos criterios:
-- Tiene alcance nacional o afecta a múltiples regiones
-- Impacta a un sector económico completo o múltiples empresas
-- Y además cumple alguno de estos:
-  1. Crea o modifica leyes, decretos supremos o políticas públicas importantes
-  2. Establece nuevos procedimientos o requisitos de cumplimiento obligatorio
-  3. Modifica significativamente tarifas, precios o impuestos (no ajustes rutinarios)
-  4. Establece medidas de emergencia nacionales
-  5. Define estrategias nacionales de desarrollo
-  6. Abre procesos de consulta ciudadana nacional
-  7. Convoca a licitaciones públicas de gran envergadura (>1000 UF)
-  8. Actualiza o establece programas de regulación ambiental o normas de emisión
-  9. Define nuevos estándares ambientales o modifica los existentes
-  10. Es emitido por el SII (Servicio de Impuestos Internos) - SIEMPRE relevante
-  11. Es emitido por la CMF y afecta empresas IPSA o mercados regulados
-
-Una publicación NO es relevante si:
-1. Es un nombramiento o designación individual
-2. Es una rectificación o fe de erratas
-3. Afecta solo a una persona, empresa o localidad específica
-4. Es un permiso o concesión individual
-5. Es de alcance muy local o específico
-6. Son ajustes rutinarios de precios (combustibles, kerosene)
-7. Son medidas fitosanitarias locales o regionales
-8. Afecta solo a beneficiarios de programas específicos
-9. Es una resolución de alcance limitado a una región o comuna
-
-{contexto}
-
-Responde SOLO con:
-RELEVANTE: [SÍ/NO]
-RAZÓN: [Explicación en una línea]"""
+            prompt = PROMPT_INDIVIDUAL.format(criterios=CRITERIOS_RELEVANCIA, contexto=contexto)
 
             # Llamar a OpenAI API
             headers = {
@@ -126,7 +341,7 @@ RAZÓN: [Explicación en una línea]"""
                 "max_tokens": 150
             }
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers=headers,
                 json=data,
@@ -169,40 +384,7 @@ RAZÓN: [Explicación en una línea]"""
             if texto_pdf and len(texto_pdf) > 100:
                 contexto += f"\n\nPrimeras líneas del documento:\n{texto_pdf[:1500]}"
             
-            prompt = f"""Eres un experto en análisis de normativas chilenas. Evalúa si la siguiente publicación del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
-
-Una publicación es RELEVANTE si cumple TODOS estos criterios:
-- Tiene alcance nacional o afecta a múltiples regiones
-- Impacta a un sector económico completo o múltiples empresas
-- Y además cumple alguno de estos:
-  1. Crea o modifica leyes, decretos supremos o políticas públicas importantes
-  2. Establece nuevos procedimientos o requisitos de cumplimiento obligatorio
-  3. Modifica significativamente tarifas, precios o impuestos (no ajustes rutinarios)
-  4. Establece medidas de emergencia nacionales
-  5. Define estrategias nacionales de desarrollo
-  6. Abre procesos de consulta ciudadana nacional
-  7. Convoca a licitaciones públicas de gran envergadura (>1000 UF)
-  8. Actualiza o establece programas de regulación ambiental o normas de emisión
-  9. Define nuevos estándares ambientales o modifica los existentes
-  10. Es emitido por el SII (Servicio de Impuestos Internos) - SIEMPRE relevante
-  11. Es emitido por la CMF y afecta empresas IPSA o mercados regulados
-
-Una publicación NO es relevante si:
-1. Es un nombramiento o designación individual
-2. Es una rectificación o fe de erratas
-3. Afecta solo a una persona, empresa o localidad específica
-4. Es un permiso o concesión individual
-5. Es de alcance muy local o específico
-6. Son ajustes rutinarios de precios (combustibles, kerosene)
-7. Son medidas fitosanitarias locales o regionales
-8. Afecta solo a beneficiarios de programas específicos
-9. Es una resolución de alcance limitado a una región o comuna
-
-{contexto}
-
-Responde SOLO con:
-RELEVANTE: [SÍ/NO]
-RAZÓN: [Explicación en una línea]"""
+            prompt = PROMPT_INDIVIDUAL.format(criterios=CRITERIOS_RELEVANCIA, contexto=contexto)
 
             # Llamar a Groq API
             headers = {
@@ -220,7 +402,7 @@ RAZÓN: [Explicación en una línea]"""
                 "max_tokens": 150
             }
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.groq.com/openai/v1/chat/completions",
                 headers=headers,
                 json=data,
@@ -257,40 +439,7 @@ RAZÓN: [Explicación en una línea]"""
             if texto_pdf and len(texto_pdf) > 100:
                 contexto += f"\n\nPrimeras líneas del documento:\n{texto_pdf[:1500]}"
             
-            prompt = f"""Eres un experto en análisis de normativas chilenas. Evalúa si la siguiente publicación del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
-
-Una publicación es RELEVANTE si cumple TODOS estos criterios:
-- Tiene alcance nacional o afecta a múltiples regiones
-- Impacta a un sector económico completo o múltiples empresas
-- Y además cumple alguno de estos:
-  1. Crea o modifica leyes, decretos supremos o políticas públicas importantes
-  2. Establece nuevos procedimientos o requisitos de cumplimiento obligatorio
-  3. Modifica significativamente tarifas, precios o impuestos (no ajustes rutinarios)
-  4. Establece medidas de emergencia nacionales
-  5. Define estrategias nacionales de desarrollo
-  6. Abre procesos de consulta ciudadana nacional
-  7. Convoca a licitaciones públicas de gran envergadura (>1000 UF)
-  8. Actualiza o establece programas de regulación ambiental o normas de emisión
-  9. Define nuevos estándares ambientales o modifica los existentes
-  10. Es emitido por el SII (Servicio de Impuestos Internos) - SIEMPRE relevante
-  11. Es emitido por la CMF y afecta empresas IPSA o mercados regulados
-
-Una publicación NO es relevante si:
-1. Es un nombramiento o designación individual
-2. Es una rectificación o fe de erratas
-3. Afecta solo a una persona, empresa o localidad específica
-4. Es un permiso o concesión individual
-5. Es de alcance muy local o específico
-6. Son ajustes rutinarios de precios (combustibles, kerosene)
-7. Son medidas fitosanitarias locales o regionales
-8. Afecta solo a beneficiarios de programas específicos
-9. Es una resolución de alcance limitado a una región o comuna
-
-{contexto}
-
-Responde SOLO con:
-RELEVANTE: [SÍ/NO]
-RAZÓN: [Explicación en una línea]"""
+            prompt = PROMPT_INDIVIDUAL.format(criterios=CRITERIOS_RELEVANCIA, contexto=contexto)
 
             # Llamar a DeepSeek API
             headers = {
@@ -308,7 +457,7 @@ RAZÓN: [Explicación en una línea]"""
                 "max_tokens": 150
             }
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.deepseek.com/v1/chat/completions",
                 headers=headers,
                 json=data,
@@ -344,40 +493,7 @@ RAZÓN: [Explicación en una línea]"""
             if texto_pdf and len(texto_pdf) > 100:
                 contexto += f"\n\nPrimeras líneas del documento:\n{texto_pdf[:1500]}"
             
-            prompt = f"""Eres un experto en análisis de normativas chilenas. Evalúa si la siguiente publicación del Diario Oficial es relevante para incluir en un informe diario que será leído por empresas y ciudadanos.
-
-Una publicación es RELEVANTE si cumple TODOS estos criterios:
-- Tiene alcance nacional o afecta a múltiples regiones
-- Impacta a un sector económico completo o múltiples empresas
-- Y además cumple alguno de estos:
-  1. Crea o modifica leyes, decretos supremos o políticas públicas importantes
-  2. Establece nuevos procedimientos o requisitos de cumplimiento obligatorio
-  3. Modifica significativamente tarifas, precios o impuestos (no ajustes rutinarios)
-  4. Establece medidas de emergencia nacionales
-  5. Define estrategias nacionales de desarrollo
-  6. Abre procesos de consulta ciudadana nacional
-  7. Convoca a licitaciones públicas de gran envergadura (>1000 UF)
-  8. Actualiza o establece programas de regulación ambiental o normas de emisión
-  9. Define nuevos estándares ambientales o modifica los existentes
-  10. Es emitido por el SII (Servicio de Impuestos Internos) - SIEMPRE relevante
-  11. Es emitido por la CMF y afecta empresas IPSA o mercados regulados
-
-Una publicación NO es relevante si:
-1. Es un nombramiento o designación individual
-2. Es una rectificación o fe de erratas
-3. Afecta solo a una persona, empresa o localidad específica
-4. Es un permiso o concesión individual
-5. Es de alcance muy local o específico
-6. Son ajustes rutinarios de precios (combustibles, kerosene)
-7. Son medidas fitosanitarias locales o regionales
-8. Afecta solo a beneficiarios de programas específicos
-9. Es una resolución de alcance limitado a una región o comuna
-
-{contexto}
-
-Responde SOLO con:
-RELEVANTE: [SÍ/NO]
-RAZÓN: [Explicación en una línea]"""
+            prompt = PROMPT_INDIVIDUAL.format(criterios=CRITERIOS_RELEVANCIA, contexto=contexto)
 
             response = self.model.generate_content(prompt)
             respuesta = response.text.strip()
@@ -399,148 +515,11 @@ RAZÓN: [Explicación en una línea]"""
             return self._evaluar_con_reglas(titulo)
     
     def _evaluar_con_reglas(self, titulo):
-        """Evaluación mejorada por reglas basada en los ejemplos proporcionados"""
-        titulo_upper = titulo.upper()
-        
-        # Primero verificar exclusiones específicas
-        exclusiones = [
-            ("NOMBRA A DON", "Nombramiento individual"),
-            ("NOMBRA A DOÑA", "Nombramiento individual"),
-            ("DESIGNA A", "Designación individual"),
-            ("ACEPTA RENUNCIA", "Renuncia individual"),
-            ("RECTIFICA", "Rectificación menor"),
-            ("FE DE ERRATAS", "Corrección menor"),
-            ("OTORGA CONCESIÓN", "Concesión individual"),
-            ("OTORGA PERMISO", "Permiso individual"),
-            ("AUTORIZA A", "Autorización individual"),
-            ("FIJA PRECIOS DE REFERENCIA Y PARIDAD PARA KEROSENE", "Ajuste rutinario de precios"),
-            ("FIJA PRECIOS DE PARIDAD PARA COMBUSTIBLES", "Ajuste rutinario de precios"),
-            ("MOSCA DEL MEDITERRÁNEO", "Medida fitosanitaria local"),
-            ("REGULACIONES CUARENTENARIAS", "Medida fitosanitaria local"),
-            ("BONOS DE INCENTIVO AL RETIRO", "Beneficio para grupo específico"),
-            ("TRABAJADORES(AS) BENEFICIARIOS(AS)", "Afecta solo a beneficiarios específicos"),
-            ("CONCURSO PÚBLICO PARA PROVEER CARGO", "Concurso para cargo público"),
-            ("LLAMADO A CONCURSO PÚBLICO PARA PROVEER CARGO", "Concurso para cargo público"),
-            ("CARGO DE TERCER NIVEL JERÁRQUICO", "Concurso para cargo público"),
-            ("PROVEER CARGO", "Concurso para cargo público")
-        ]
-        
-        for exclusion, razon in exclusiones:
-            if exclusion in titulo_upper:
-                # Excepciones para cargos de alto nivel
-                if any(cargo in titulo_upper for cargo in ["MINISTRO", "SUBSECRETARIO", "DIRECTOR NACIONAL", "DEFENSOR NACIONAL"]):
-                    continue  # No excluir si es cargo importante
-                return False, razon
-        
-        # Criterios de alta relevancia - SOLO incluir si son de alcance nacional o muy importante
-        criterios_relevancia = [
-            # Licitaciones y concursos públicos para bienes, servicios y proyectos (NO cargos)
-            (["LICITACIÓN PÚBLICA", "BASES DE LICITACIÓN", 
-              "LLAMADO A LICITACIÓN", "LLAMA A LICITACIÓN",
-              "CONCURSO PÚBLICO PARA LA ASIGNACIÓN", "PROYECTO HABILITACIÓN"], 
-             "Proceso de contratación pública"),
-            
-            # Emergencias SOLO si son nacionales
-            (["EMERGENCIA NACIONAL", "ESTADO DE CATÁSTROFE", "ESTADO DE EXCEPCIÓN"], 
-             "Situación de emergencia nacional"),
-            
-            # Procedimientos SOLO si son de alcance general
-            (["MANUAL DE PROCEDIMIENTOS NACIONAL", "ESTABLECE PROCEDIMIENTO GENERAL"], 
-             "Establece nuevos procedimientos generales"),
-            
-            # Estrategias SOLO nacionales
-            (["ESTRATEGIA NACIONAL", "CONSULTA CIUDADANA NACIONAL", "PLAN NACIONAL"], 
-             "Proceso estratégico nacional"),
-            
-            # Tarifas SOLO si son de servicios básicos o impacto general
-            (["FIJA TARIFAS ELÉCTRICAS", "FÓRMULAS TARIFARIAS", "PRECIOS DE NUDO"], 
-             "Fijación de tarifas de servicios básicos"),
-            
-            # Leyes y decretos supremos importantes
-            (["LEY NÚM", "LEY N°", "DECRETO SUPREMO N°"], 
-             "Norma de alto nivel"),
-            
-            # Modificaciones de leyes importantes
-            (["MODIFICA LEY", "MODIFICA CÓDIGO"], 
-             "Modificación legal importante"),
-            
-            # Creación de entidades nacionales
-            (["CREACIÓN DE", "CREA NUEVO"], 
-             "Creación institucional"),
-            
-            # Políticas públicas nacionales
-            (["POLÍTICA NACIONAL", "PLAN NACIONAL", "PROGRAMA NACIONAL"], 
-             "Política pública nacional"),
-            
-            # Medidas económicas de impacto general
-            (["TIPO DE CAMBIO", "VALOR DE LA UF", "VALOR DEL DÓLAR", "MODIFICA IMPUESTO"], 
-             "Medida económica de impacto general"),
-            
-            # Subsidios habitacionales y vivienda
-            (["SUBSIDIO", "CRÉDITOS HIPOTECARIOS", "VIVIENDAS NUEVAS", "TASA DE INTERÉS"], 
-             "Subsidio habitacional o medida de vivienda"),
-            
-            # Estándares de construcción y programas habitacionales
-            (["ESTÁNDAR TÉCNICO", "PROGRAMA DE HABITABILIDAD", "CONSTRUCCIONES RURALES", "VIVIENDAS INDUSTRIALIZADAS"], 
-             "Normativa técnica de construcción"),
-            
-            # Proyectos de infraestructura y servicios públicos
-            (["SERVICIOS DE TELECOMUNICACIONES", "PROYECTO HABILITACIÓN", "FONDO DE DESARROLLO", 
-              "SERVICIOS PÚBLICOS", "INFRAESTRUCTURA"], 
-             "Proyecto de infraestructura o servicios públicos"),
-            
-            # Tipos de cambio (siempre relevante)
-            (["TIPOS DE CAMBIO", "PARIDADES DE MONEDAS"], 
-             "Información cambiaria"),
-            
-            # Regulaciones ambientales y programas de regulación
-            (["PROGRAMA DE REGULACIÓN AMBIENTAL", "NORMAS DE EMISIÓN", "NORMAS DE CALIDAD AMBIENTAL",
-              "PLANES DE DESCONTAMINACIÓN", "EVALUACIÓN AMBIENTAL", "IMPACTO AMBIENTAL",
-              "ESTÁNDARES AMBIENTALES", "REGULACIÓN AMBIENTAL"], 
-             "Regulación o programa ambiental"),
-            
-            # SII - Servicio de Impuestos Internos (SIEMPRE relevante)
-            (["SERVICIO DE IMPUESTOS INTERNOS", "SII", "DIRECTOR NACIONAL DEL SERVICIO DE IMPUESTOS",
-              "CIRCULAR SII", "RESOLUCIÓN SII", "OFICIO SII", "TRIBUTARIO", "TRIBUTARIA",
-              "CÓDIGO TRIBUTARIO", "IMPUESTO A LA RENTA", "IVA", "FACTURA ELECTRÓNICA",
-              "DOCUMENTOS TRIBUTARIOS", "FISCALIZACIÓN TRIBUTARIA", "CONTRIBUYENTES",
-              "DECLARACIÓN DE IMPUESTOS", "DEVOLUCIÓN DE IMPUESTOS", "CONDONACIÓN",
-              "NORMAS TRIBUTARIAS", "INTERPRETACIÓN TRIBUTARIA"], 
-             "Normativa tributaria del SII"),
-            
-            # CMF - Comisión para el Mercado Financiero (empresas importantes)
-            (["COMISIÓN PARA EL MERCADO FINANCIERO", "CMF", "SUPERINTENDENCIA DE VALORES",
-              "SUPERINTENDENCIA DE BANCOS", "SUPERINTENDENCIA DE PENSIONES", "AFP",
-              "BOLSA DE COMERCIO", "BOLSA DE VALORES", "OFERTA PÚBLICA", "EMISIÓN DE BONOS",
-              "VALORES DE OFERTA PÚBLICA", "SOCIEDADES ANÓNIMAS ABIERTAS", "IPSA",
-              "MERCADO DE VALORES", "MERCADO FINANCIERO", "INSTITUCIONES FINANCIERAS",
-              "COMPAÑÍAS DE SEGUROS", "ADMINISTRADORAS DE FONDOS"], 
-             "Regulación del mercado financiero (CMF)")
-        ]
-        
-        # Evaluar cada criterio
-        for palabras_clave, descripcion in criterios_relevancia:
-            if any(palabra in titulo_upper for palabra in palabras_clave):
-                # Verificaciones adicionales para ciertos casos
-                if "EXTRACTO" in titulo_upper and "LICITACIÓN" not in titulo_upper:
-                    continue  # Los extractos generalmente no son relevantes excepto licitaciones
-                
-                if "MUNICIPALIDAD DE" in titulo_upper or "COMUNA DE" in titulo_upper:
-                    # Solo relevante si es creación de comuna o algo de alcance general
-                    if "CREACIÓN" not in titulo_upper and "APRUEBA PLAN" not in titulo_upper:
-                        continue
-                
-                # Verificación adicional: debe ser de alcance nacional
-                if any(local in titulo_upper for local in ["REGIÓN", "REGIONAL", "COMUNA", "COMUNAL", "PROVINCIA", "PROVINCIAL"]):
-                    # A menos que sea una emergencia o creación
-                    if not any(excep in titulo_upper for excep in ["EMERGENCIA", "CREACIÓN", "ESTADO DE"]):
-                        continue
-                
-                return True, descripcion
-        
-        # Si contiene "LEY" y modifica algo importante
-        if " LEY " in titulo_upper and any(mod in titulo_upper for mod in ["MODIFICA", "ESTABLECE", "CREA"]):
-            return True, "Ley que establece cambios importantes"
-        
-        # Por defecto, no relevante
-        return False, "No cumple criterios de relevancia general"
\ No newline at end of file
+        """Evaluación por reglas (alerts/reglas_relevancia.json), sin IA"""
+        self._estado.uso_reglas = True
+        return motor_reglas.evaluar(titulo)
+
+    def _evaluar_lote_con_reglas(self, titulos):
+        """_evaluar_con_reglas de muchos títulos en una sola pasada"""
+        self._estado.uso_reglas = True
+        return motor_reglas.evaluar_lote(titulos)
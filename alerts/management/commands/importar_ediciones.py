@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from alerts import calendario_diario_oficial as calendario
+from alerts.services.edition_index import edition_index
+
+class Command(BaseCommand):
+    help = ('Carga masiva del índice de ediciones del Diario Oficial: importa edition_cache.json '
+            'y/o detecta por HTTP las ediciones de un rango de fechas que aún no están registradas.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archivo', type=str, help='JSON {dd-mm-aaaa: edición} a importar (p. ej. edition_cache.json)')
+        parser.add_argument('--desde', type=str, help='Fecha inicial del rango a detectar, dd-mm-aaaa')
+        parser.add_argument('--hasta', type=str, help='Fecha final del rango a detectar, dd-mm-aaaa (por defecto hoy)')
+
+    def handle(self, *args, **options):
+        if not options['archivo'] and not options['desde']:
+            options['archivo'] = str(settings.BASE_DIR / 'edition_cache.json')
+
+        if options['archivo']:
+            self._importar_archivo(options['archivo'])
+        if options['desde']:
+            self._detectar_rango(options['desde'], options['hasta'])
+
+    def _importar_archivo(self, archivo):
+        try:
+            with open(archivo, 'r') as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"No se pudo leer '{archivo}': {e}")
+
+        ediciones = {datetime.strptime(fecha, "%d-%m-%Y").date(): int(numero) for fecha, numero in datos.items()}
+        # Un tramo con números corridos respecto de sus vecinas no se importa: tomaría
+        # el número de una fecha correcta (registrar() lo reasigna a la última)
+        descartadas = calendario.fuera_de_calendario(ediciones)
+        if descartadas:
+            for dia in descartadas:
+                del ediciones[dia]
+            self.stdout.write(self.style.WARNING(
+                f"{len(descartadas)} ediciones no coinciden con el calendario y no se importan: "
+                + ", ".join(f"{dia:%d-%m-%Y}" for dia in descartadas)
+            ))
+        guardadas = edition_index.registrar_varios(ediciones, origen='archivo')
+        self.stdout.write(self.style.SUCCESS(f"{guardadas} de {len(ediciones)} ediciones importadas desde '{archivo}'"))
+        if guardadas < len(ediciones):
+            self.stdout.write(self.style.WARNING("Las omitidas repetían un número ya asignado a otra fecha (ver log)"))
+
+    def _detectar_rango(self, desde, hasta):
+        from alerts.scraper_diario_oficial import resolver_edicion_http
+
+        inicio = datetime.strptime(desde, "%d-%m-%Y").date()
+        fin = datetime.strptime(hasta, "%d-%m-%Y").date() if hasta else datetime.now().date()
+        if fin < inicio:
+            raise CommandError("--hasta es anterior a --desde")
+
+        ediciones = {}
+        dia = inicio
+        while dia <= fin:
+            if dia.weekday() != 6 and edition_index.get(dia) is None:
+                numero = resolver_edicion_http(dia.strftime("%d-%m-%Y"))
+                if numero:
+                    ediciones[dia] = int(numero)
+            dia += timedelta(days=1)
+
+        guardadas = edition_index.registrar_varios(ediciones, origen='sitio')
+        self.stdout.write(self.style.SUCCESS(f"{guardadas} ediciones detectadas entre {desde} y {fin:%d-%m-%Y}"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from alerts.models import DocumentoSII, HechoEsencial, Publicacion
+from alerts.services.search_index import search_index
+
+class Command(BaseCommand):
+    help = ('Carga en el índice de búsqueda las publicaciones del Diario Oficial, documentos del SII '
+            'y hechos esenciales ya guardados. Las nuevas se indexan solas al ingresarse.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Registros por upsert (por defecto 1000)')
+
+    def _indexar(self, nombre, queryset, documento, lote):
+        total = 0
+        pendientes = []
+        for objeto in queryset.iterator(chunk_size=lote):
+            pendientes.append(documento(objeto))
+            if len(pendientes) >= lote:
+                total += search_index.indexar(pendientes)
+                pendientes = []
+        total += search_index.indexar(pendientes)
+        self.stdout.write(self.style.SUCCESS(f'{nombre}: {total} documentos indexados'))
+
+    def handle(self, *args, **options):
+        lote = options['lote']
+        self._indexar('Diario Oficial', Publicacion.objects.select_related('edicion'),
+                      lambda p: search_index.documento_publicacion(p, p.edicion.fecha), lote)
+        self._indexar('SII', DocumentoSII.objects.all(), search_index.documento_sii, lote)
+        self._indexar('Hechos esenciales', HechoEsencial.objects.select_related('empresa'),
+                      search_index.documento_hecho, lote)
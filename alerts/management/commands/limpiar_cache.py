@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from alerts.services.cache_service import cache_service
+from alerts.evaluador_relevancia import EvaluadorRelevancia
+
+class Command(BaseCommand):
+    help = ('Elimina los veredictos de relevancia vencidos (las entradas del caché de Django '
+            'expiran solas).')
+
+    def handle(self, *args, **options):
+        cache_service.clear_old_cache()
+
+        if EvaluadorRelevancia.cache_veredictos:
+            veredictos = EvaluadorRelevancia.cache_veredictos.purgar_expirados()
+            self.stdout.write(self.style.SUCCESS(f'Veredictos de relevancia eliminados: {veredictos}'))
@@ -33,6 +33,9 @@ class Command(BaseCommand):
         # Programar el envío del informe diario a las 8:00 AM
         schedule.every().day.at("08:00").do(job, task_name="Envío Informe Diario Oficial", command_name='informe_diario_oficial')
 
+        # Limpiar el caché expirado durante la madrugada
+        schedule.every().day.at("03:00").do(job, task_name="Limpieza de caché", command_name='limpiar_cache')
+
         # Puedes mantener otras tareas si lo deseas
         # schedule.every(30).minutes.do(job, task_name="Scraping de Hechos Esenciales", command_name='scrape_hechos')
         # schedule.every(30).minutes.do(job, task_name="Envío de Notificaciones", command_name='send_notifications')
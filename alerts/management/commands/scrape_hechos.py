@@ -2,6 +2,7 @@
 Comando para scrapear hechos esenciales del sitio web de la CMF
 Incluye criterios profesionales de clasificación basados en Bloomberg/Refinitiv
 """
+import hashlib
 import os
 import re
 import time
@@ -9,31 +10,41 @@ import random
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db import transaction
-from alerts.models import Empresa, HechoEsencial
-from alerts.cmf_criterios_profesionales import calcular_relevancia_profesional, EMPRESAS_IPSA
+from alerts.cmf_criterios_profesionales import calcular_relevancia_profesional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
-import requests
 from bs4 import BeautifulSoup
-import PyPDF2
-from io import BytesIO
 import openai
 from dotenv import load_dotenv
 import json
 
 # Importar servicios robustos existentes
-from alerts.services.cache_service import cache_service
 from alerts.services.pdf_extractor import PDFExtractor
-from alerts.utils.rate_limiter import rate_limited
-from alerts.utils.retry_utils import retry
+from alerts.services.hecho_store import hecho_store
+from alerts.services.pdf_store import pdf_store
+from alerts.services.text_cache import text_cache
+from alerts.services.ocr_engine import ocr_engine
+from alerts.utils import http_client
+from alerts.utils.concurrency import LimitesConcurrencia, ejecutar_en_paralelo
 
 load_dotenv()
 
+# Hechos cuyo PDF se descarga, extrae y resume en paralelo
+HECHOS_WORKERS = int(os.environ.get('CMF_HECHOS_WORKERS', '6'))
+# Llamadas simultáneas como máximo a cada proveedor
+LIMITES_PROVEEDORES = {
+    'cmf': int(os.environ.get('CMF_DESCARGAS_CONCURRENTES', '3')),
+    'openai': int(os.environ.get('OPENAI_LLAMADAS_CONCURRENTES', '4')),
+    'gemini': int(os.environ.get('GEMINI_LLAMADAS_CONCURRENTES', '2')),
+}
+# Páginas y caracteres del PDF que se extraen (el resumen usa como máximo 4.000 caracteres)
+PAGINAS_PDF = 5
+CARACTERES_PDF = 4000
+
 class Command(BaseCommand):
     help = 'Scrapea los hechos esenciales del sitio web de la CMF con criterios profesionales'
 
@@ -56,7 +67,9 @@ class Command(BaseCommand):
         if self.openai_api_key:
             openai.api_key = self.openai_api_key
         self.debug_mode = False
+        # Sin caché de texto: los workers no acceden a la base de datos (ver procesar_hechos)
         self.pdf_extractor = PDFExtractor()
+        self.limites = LimitesConcurrencia(LIMITES_PROVEEDORES)
 
     def handle(self, *args, **options):
         self.debug_mode = options.get('debug', False)
@@ -66,6 +79,9 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'INICIANDO SCRAPING DE HECHOS ESENCIALES CMF'))
         self.stdout.write(self.style.SUCCESS(f'{"="*60}\n'))
         
+        # Presupuesto de CPU de OCR para esta ejecución
+        ocr_engine.reiniciar_presupuesto()
+        
         # Configurar el driver
         driver = self.setup_driver()
         
@@ -185,110 +201,165 @@ class Command(BaseCommand):
             
         return hechos
 
-    @rate_limited
-    @retry(max_retries=3, backoff_factor=2)
-    def descargar_pdf_con_cache(self, url_pdf):
-        """Descarga un PDF usando caché y rate limiting"""
-        # Intentar obtener del caché
-        content = cache_service.get_pdf_content(url_pdf)
-        if content:
-            return content
-        
-        response = requests.get(url_pdf, timeout=30)
+    def _descargar_pdf(self, url_pdf):
+        """
+        Descarga un PDF con el cliente HTTP compartido (conexiones reutilizadas, rate
+        limiting por dominio y reintentos)
+        """
+        with self.limites.limite('cmf'):
+            response = http_client.get(url_pdf, timeout=30)
         response.raise_for_status()
-        
-        # Guardar en caché
-        cache_service.set_pdf_content(url_pdf, response.content)
         return response.content
 
     def procesar_hechos(self, hechos):
-        """Procesa los hechos esenciales encontrados"""
+        """
+        Procesa los hechos esenciales encontrados. Empresas y hechos se leen y crean en
+        bloque. Este hilo lee del almacén los PDFs y textos ya guardados; los workers
+        solo descargan, extraen y resumen, sin tocar la base de datos. Los resultados
+        se aplican en el orden de los hechos en este hilo, que guarda los PDFs y textos
+        nuevos y, al final, resúmenes y relevancias con un solo bulk_update.
+        """
         nuevos = 0
         actualizados = 0
         errores = 0
         
-        for hecho in hechos:
+        try:
+            registro = hecho_store.registrar(hechos)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'Error guardando hechos: {str(e)}'))
+            return
+        
+        for nombre in registro.empresas_nuevas:
+            self.stdout.write(f'  Nueva empresa creada: {nombre}')
+        
+        # Hechos nuevos y existentes sin resumen o categoría
+        procesados = [
+            (hecho_obj, created) for hecho_obj, created in registro.hechos
+            if created or not hecho_obj.resumen or not hecho_obj.categoria or hecho_obj.categoria == 'MODERADO'
+        ]
+        
+        # Procesar en paralelo los PDFs de los hechos sin resumen
+        preparados = [self.preparar_pdf_hecho(hecho_obj) for hecho_obj, _ in procesados if not hecho_obj.resumen]
+        try:
+            resumenes = {
+                id(res['item']['hecho']): res
+                for res in ejecutar_en_paralelo(self.procesar_pdf_hecho, preparados, max_workers=HECHOS_WORKERS, nombre='Hecho')
+            }
+        finally:
+            for preparado in preparados:
+                if preparado['pdf'] is not None:
+                    preparado['pdf'].close()
+        
+        for hecho_obj, created in procesados:
+            if created:
+                self.stdout.write(self.style.SUCCESS(f'\nNuevo hecho: {hecho_obj.empresa.nombre}'))
+                self.stdout.write(f'  Título: {hecho_obj.titulo[:80]}...')
+                nuevos += 1
+            else:
+                self.stdout.write(f'\nActualizando hecho existente: {hecho_obj.empresa.nombre}')
+                actualizados += 1
+            
             try:
-                with transaction.atomic():
-                    # Obtener o crear empresa
-                    empresa, created = Empresa.objects.get_or_create(
-                        nombre=hecho['empresa'],
-                        defaults={
-                            'es_ipsa': hecho['empresa'].upper() in [e.upper() for e in EMPRESAS_IPSA]
-                        }
-                    )
-                    
-                    if created:
-                        self.stdout.write(f'  Nueva empresa creada: {empresa.nombre}')
-                    
-                    # Verificar si el hecho ya existe
-                    hecho_obj, created = HechoEsencial.objects.get_or_create(
-                        url=hecho['url'],
-                        defaults={
-                            'empresa': empresa,
-                            'titulo': hecho['titulo'],
-                            'fecha_publicacion': hecho['fecha'],
-                            'es_empresa_ipsa': empresa.es_ipsa
-                        }
-                    )
-                    
-                    if created:
-                        self.stdout.write(self.style.SUCCESS(f'\nNuevo hecho: {empresa.nombre}'))
-                        self.stdout.write(f'  Título: {hecho["titulo"][:80]}...')
-                        nuevos += 1
-                    else:
-                        # Si ya existe pero no tiene resumen o categoría, actualizar
-                        if not hecho_obj.resumen or not hecho_obj.categoria or hecho_obj.categoria == 'MODERADO':
-                            self.stdout.write(f'\nActualizando hecho existente: {empresa.nombre}')
-                            actualizados += 1
-                        else:
-                            continue
-                    
-                    # Procesar el PDF y generar resumen si no existe
-                    if not hecho_obj.resumen:
-                        self.procesar_pdf_hecho(hecho_obj)
-                        
-                    # Calcular relevancia profesional
-                    self.calcular_relevancia_hecho(hecho_obj)
+                res = resumenes.get(id(hecho_obj))
+                if res is not None:
+                    self.aplicar_resumen(hecho_obj, res)
                     
+                # Calcular relevancia profesional
+                self.calcular_relevancia_hecho(hecho_obj)
+                
             except Exception as e:
                 errores += 1
                 self.stdout.write(self.style.ERROR(f'Error procesando hecho: {str(e)}'))
                 if self.debug_mode:
                     import traceback
                     traceback.print_exc()
+        
+        hecho_store.guardar_calculados([hecho_obj for hecho_obj, _ in procesados])
                     
         self.stdout.write(self.style.SUCCESS(f'\nResumen:'))
         self.stdout.write(f'  - Nuevos: {nuevos}')
         self.stdout.write(f'  - Actualizados: {actualizados}')
         self.stdout.write(f'  - Errores: {errores}')
 
-    def procesar_pdf_hecho(self, hecho):
-        """Descarga y procesa el PDF del hecho esencial"""
+    def preparar_pdf_hecho(self, hecho):
+        """
+        Lee en este hilo lo ya guardado del PDF del hecho: el mmap del almacén (o None)
+        y, si está, su texto extraído. Retorna {'hecho', 'pdf', 'texto'} para procesar_pdf_hecho.
+        """
+        preparado = {'hecho': hecho, 'pdf': None, 'texto': None}
         try:
-            # Descargar PDF con caché
-            pdf_content = self.descargar_pdf_con_cache(hecho.url)
-            
-            # Extraer texto del PDF usando el servicio robusto
-            texto_completo, metodo = self.pdf_extractor.extract_text(pdf_content, max_pages=5)
-            
-            if self.debug_mode:
-                self.stdout.write(f'  PDF extraído con método: {metodo} ({len(texto_completo)} caracteres)')
-            
-            # Generar resumen con OpenAI
-            if self.openai_api_key and len(texto_completo) > 100:
-                resumen = self.generar_resumen_ia(hecho.titulo, texto_completo, hecho.empresa.es_ipsa)
-                if resumen:
-                    hecho.resumen = resumen
-                    hecho.save()
-                    self.stdout.write(self.style.SUCCESS(f'  ✓ Resumen generado'))
-                else:
-                    # Fallback: usar primeras líneas del texto
-                    hecho.resumen = texto_completo[:500] + "..."
-                    hecho.save()
-                    
+            preparado['pdf'] = pdf_store.get(hecho.url)
         except Exception as e:
-            self.stdout.write(self.style.WARNING(f'  ✗ Error procesando PDF: {str(e)}'))
+            self.stdout.write(self.style.WARNING(f'  Almacén de PDFs no disponible: {str(e)}'))
+        if preparado['pdf'] is not None:
+            sha256 = hashlib.sha256(preparado['pdf']).hexdigest()
+            preparado['texto'] = text_cache.get(sha256, PAGINAS_PDF, CARACTERES_PDF)
+        return preparado
+
+    def procesar_pdf_hecho(self, preparado):
+        """
+        Descarga (si no estaba en el almacén) y procesa el PDF del hecho esencial. Se
+        ejecuta en un hilo del pool: no modifica el hecho ni la base de datos, solo
+        retorna {'resumen', 'generado', 'metodo', 'caracteres'} (resumen None si no hay
+        API key o texto suficiente) y lo que guardar_pdf_hecho debe guardar:
+        'contenido' (PDF descargado o None), 'sha256', 'texto' y 'duracion_extraccion'.
+        """
+        hecho = preparado['hecho']
+        resultado = {'contenido': None, 'sha256': None, 'duracion_extraccion': 0.0}
+        if preparado['texto']:
+            texto_completo, metodo = preparado['texto']
+        else:
+            pdf_content = preparado['pdf']
+            if pdf_content is None:
+                pdf_content = resultado['contenido'] = self._descargar_pdf(hecho.url)
+            inicio = time.time()
+            # El resumen usa como máximo 4.000 caracteres: no seguir extrayendo páginas
+            texto_completo, metodo = self.pdf_extractor.extract_text(
+                pdf_content, max_pages=PAGINAS_PDF, max_chars=CARACTERES_PDF
+            )
+            resultado['duracion_extraccion'] = time.time() - inicio
+            resultado['sha256'] = hashlib.sha256(pdf_content).hexdigest()
+        
+        resultado.update(resumen=None, generado=False, metodo=metodo, texto=texto_completo,
+                         caracteres=len(texto_completo))
+        
+        # Generar resumen con OpenAI
+        if self.openai_api_key and len(texto_completo) > 100:
+            resumen = self.generar_resumen_ia(hecho.titulo, texto_completo, hecho.empresa.es_ipsa)
+            if resumen:
+                resultado.update(resumen=resumen, generado=True)
+            else:
+                # Fallback: usar primeras líneas del texto
+                resultado['resumen'] = texto_completo[:500] + "..."
+        return resultado
+
+    def guardar_pdf_hecho(self, hecho, resultado):
+        """Guarda en este hilo el PDF descargado y el texto extraído por procesar_pdf_hecho"""
+        if resultado['contenido'] is not None:
+            try:
+                pdf_store.put(hecho.url, resultado['contenido'])
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'  No se pudo guardar el PDF en el almacén: {str(e)}'))
+        # Los fallos no se guardan: pueden ser transitorios (p. ej. Tesseract no disponible)
+        if resultado['sha256'] and resultado['metodo'] != 'failed':
+            text_cache.set(resultado['sha256'], PAGINAS_PDF, CARACTERES_PDF, resultado['texto'],
+                           resultado['metodo'], resultado['duracion_extraccion'])
+
+    def aplicar_resumen(self, hecho, res):
+        """Deja en el hecho el resultado de procesar_pdf_hecho (lo guarda procesar_hechos)"""
+        if res['error'] is not None:
+            self.stdout.write(self.style.WARNING(f'  ✗ Error procesando PDF: {str(res["error"])}'))
+            return
+        
+        resultado = res['resultado']
+        self.guardar_pdf_hecho(hecho, resultado)
+        if self.debug_mode:
+            self.stdout.write(f'  PDF extraído con método: {resultado["metodo"]} ({resultado["caracteres"]} caracteres, '
+                              f'{res["duracion"]:.2f}s)')
+        if resultado['resumen']:
+            hecho.resumen = resultado['resumen']
+        if resultado['generado']:
+            self.stdout.write(self.style.SUCCESS(f'  ✓ Resumen generado'))
 
     def generar_resumen_ia(self, titulo, texto, es_ipsa=False):
         """Genera un resumen usando OpenAI con prompts especializados"""
@@ -323,15 +394,16 @@ Genera un resumen profesional en exactamente 3 frases:
 
 Usa lenguaje financiero profesional pero claro."""
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Eres un analista financiero senior con 20 años de experiencia en el mercado chileno."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=250,
-                temperature=0.3
-            )
+            with self.limites.limite('openai'):
+                response = openai.ChatCompletion.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "Eres un analista financiero senior con 20 años de experiencia en el mercado chileno."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=250,
+                    temperature=0.3
+                )
             
             return response.choices[0].message.content.strip()
             
@@ -344,14 +416,15 @@ Usa lenguaje financiero profesional pero claro."""
                 if api_key:
                     genai.configure(api_key=api_key)
                     model = genai.GenerativeModel('gemini-1.5-flash')
-                    response = model.generate_content(prompt)
+                    with self.limites.limite('gemini'):
+                        response = model.generate_content(prompt)
                     return response.text.strip()
             except:
                 pass
             return None
 
     def calcular_relevancia_hecho(self, hecho):
-        """Calcula y actualiza la relevancia profesional del hecho"""
+        """Calcula la relevancia profesional del hecho (la guarda procesar_hechos)"""
         try:
             # Usar la función de criterios profesionales
             relevancia, categoria, es_ipsa = calcular_relevancia_profesional(
@@ -373,8 +446,7 @@ Usa lenguaje financiero profesional pero claro."""
                 hecho.relevancia = 2  # Media
             else:
                 hecho.relevancia = 1  # Baja
-                
-            hecho.save()
+            
             
             # Emoji según categoría
             emoji_map = {
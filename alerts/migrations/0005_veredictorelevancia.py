@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0004_add_criterios_profesionales_y_sii'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VeredictoRelevancia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_titulo', models.CharField(max_length=64)),
+                ('hash_texto', models.CharField(blank=True, default='', help_text='Vacío si se evaluó solo el título', max_length=64)),
+                ('titulo', models.TextField()),
+                ('relevante', models.BooleanField()),
+                ('razon', models.TextField(blank=True)),
+                ('proveedor', models.CharField(max_length=20)),
+                ('version_prompt', models.CharField(max_length=16)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_expiracion', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'unique_together': {('hash_titulo', 'hash_texto')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0005_veredictorelevancia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenGenerado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(blank=True, default='', max_length=500)),
+                ('hash_texto', models.CharField(max_length=64)),
+                ('modelo', models.CharField(max_length=50)),
+                ('version_prompt', models.CharField(max_length=16)),
+                ('resumen', models.TextField()),
+                ('usos', models.PositiveIntegerField(default=0, help_text='Veces que se reutilizó sin llamar a la IA')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_ultimo_uso', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('url', 'hash_texto', 'modelo', 'version_prompt')},
+            },
+        ),
+    ]
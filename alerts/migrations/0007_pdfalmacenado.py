@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_resumengenerado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFAlmacenado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('tamano', models.PositiveIntegerField(help_text='Tamaño en bytes')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_ultimo_acceso', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0007_pdfalmacenado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextoExtraido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('max_paginas', models.PositiveIntegerField()),
+                ('texto', models.TextField()),
+                ('metodo', models.CharField(max_length=20)),
+                ('duracion', models.FloatField(help_text='Segundos que tomó la extracción original')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('sha256', 'max_paginas')},
+            },
+        ),
+    ]
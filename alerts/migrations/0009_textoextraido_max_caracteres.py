@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0008_textoextraido'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='textoextraido',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='textoextraido',
+            name='max_caracteres',
+            field=models.PositiveIntegerField(default=0, help_text='0 = sin límite'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='textoextraido',
+            unique_together={('sha256', 'max_paginas', 'max_caracteres')},
+        ),
+    ]
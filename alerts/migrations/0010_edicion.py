@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0009_textoextraido_max_caracteres'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Edicion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(unique=True)),
+                ('numero', models.PositiveIntegerField(unique=True)),
+                ('origen', models.CharField(choices=[('sitio', 'Sitio (HTTP)'), ('selenium', 'Sitio (Selenium)'), ('archivo', 'Importada de archivo')], default='sitio', max_length=20)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Edición del Diario Oficial',
+                'verbose_name_plural': 'Ediciones del Diario Oficial',
+                'ordering': ['-fecha'],
+            },
+        ),
+    ]
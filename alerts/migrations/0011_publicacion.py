@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0010_edicion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='edicion',
+            name='fecha_scraping',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='edicion',
+            name='total_documentos',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='edicion',
+            name='valores_monedas',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='Publicacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orden', models.PositiveIntegerField(default=0, help_text='Posición en el índice de la edición')),
+                ('seccion', models.CharField(db_index=True, max_length=50)),
+                ('titulo', models.TextField()),
+                ('url_pdf', models.CharField(max_length=500)),
+                ('relevante', models.BooleanField(default=False)),
+                ('razon_relevancia', models.TextField(blank=True, default='')),
+                ('resumen', models.TextField(blank=True, default='')),
+                ('es_sii', models.BooleanField(db_index=True, default=False)),
+                ('es_licitacion', models.BooleanField(default=False)),
+                ('en_informe', models.BooleanField(default=False)),
+                ('edicion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='publicaciones', to='alerts.edicion')),
+            ],
+            options={
+                'ordering': ['edicion', 'orden'],
+                'unique_together': {('edicion', 'url_pdf')},
+            },
+        ),
+    ]
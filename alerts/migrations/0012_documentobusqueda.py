@@ -0,0 +1,69 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+SQL_SQLITE = [
+    """CREATE VIRTUAL TABLE alerts_documentobusqueda_fts USING fts5(
+        titulo, texto, content='alerts_documentobusqueda', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER alerts_documentobusqueda_ai AFTER INSERT ON alerts_documentobusqueda BEGIN
+        INSERT INTO alerts_documentobusqueda_fts(rowid, titulo, texto) VALUES (new.id, new.titulo, new.texto);
+    END""",
+    """CREATE TRIGGER alerts_documentobusqueda_ad AFTER DELETE ON alerts_documentobusqueda BEGIN
+        INSERT INTO alerts_documentobusqueda_fts(alerts_documentobusqueda_fts, rowid, titulo, texto)
+        VALUES ('delete', old.id, old.titulo, old.texto);
+    END""",
+    """CREATE TRIGGER alerts_documentobusqueda_au AFTER UPDATE ON alerts_documentobusqueda BEGIN
+        INSERT INTO alerts_documentobusqueda_fts(alerts_documentobusqueda_fts, rowid, titulo, texto)
+        VALUES ('delete', old.id, old.titulo, old.texto);
+        INSERT INTO alerts_documentobusqueda_fts(rowid, titulo, texto) VALUES (new.id, new.titulo, new.texto);
+    END""",
+]
+
+SQL_POSTGRESQL = [
+    """ALTER TABLE alerts_documentobusqueda ADD COLUMN vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(texto, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX alerts_documentobusqueda_vector ON alerts_documentobusqueda USING GIN (vector)",
+]
+
+
+def crear_indice_texto(apps, schema_editor):
+    """Índice de texto completo según el motor de la base de datos"""
+    sentencias = {'sqlite': SQL_SQLITE, 'postgresql': SQL_POSTGRESQL}.get(schema_editor.connection.vendor, [])
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def borrar_indice_texto(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS alerts_documentobusqueda_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0011_publicacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('publicacion', 'Diario Oficial'), ('sii', 'SII'), ('hecho', 'Hecho esencial')], max_length=20)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('fecha', models.DateField(db_index=True)),
+                ('titulo', models.TextField()),
+                ('texto', models.TextField(blank=True, default='')),
+                ('url', models.CharField(blank=True, default='', max_length=500)),
+            ],
+            options={
+                'ordering': ['-fecha'],
+                'unique_together': {('tipo', 'objeto_id')},
+            },
+        ),
+        migrations.RunPython(crear_indice_texto, borrar_indice_texto),
+    ]
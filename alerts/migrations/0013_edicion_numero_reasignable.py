@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0012_documentobusqueda'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='edicion',
+            name='numero',
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='publicacion',
+            name='edicion',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='publicaciones', to='alerts.edicion'),
+        ),
+    ]
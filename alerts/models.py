@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -82,6 +82,19 @@ class HechoEsencial(models.Model):
     def __str__(self):
         return f"{self.empresa.nombre} - {self.fecha_publicacion}"
 
+@receiver(post_save, sender=HechoEsencial)
+def indexar_hecho_esencial(sender, instance, **kwargs):
+    """
+    Mantiene el hecho en el índice de búsqueda.
+    """
+    from alerts.services.search_index import search_index
+    search_index.indexar([search_index.documento_hecho(instance)])
+
+@receiver(post_delete, sender=HechoEsencial)
+def desindexar_hecho_esencial(sender, instance, **kwargs):
+    from alerts.services.search_index import search_index
+    search_index.eliminar('hecho', [instance.pk])
+
 class Alerta(models.Model):
     """
     Representa un Hecho Esencial publicado por una empresa.
@@ -207,3 +220,169 @@ class DocumentoSII(models.Model):
         
     def __str__(self):
         return f"{self.get_tipo_documento_display()} {self.numero} - {self.titulo}"
+
+@receiver(post_save, sender=DocumentoSII)
+def indexar_documento_sii(sender, instance, **kwargs):
+    """
+    Mantiene el documento en el índice de búsqueda.
+    """
+    from alerts.services.search_index import search_index
+    search_index.indexar([search_index.documento_sii(instance)])
+
+@receiver(post_delete, sender=DocumentoSII)
+def desindexar_documento_sii(sender, instance, **kwargs):
+    from alerts.services.search_index import search_index
+    search_index.eliminar('sii', [instance.pk])
+
+class VeredictoRelevancia(models.Model):
+    """
+    Veredicto de relevancia de una publicación del Diario Oficial generado por IA.
+    Se identifica por el título normalizado y un hash de los primeros caracteres del texto.
+    """
+    hash_titulo = models.CharField(max_length=64)
+    hash_texto = models.CharField(max_length=64, blank=True, default='', help_text="Vacío si se evaluó solo el título")
+    titulo = models.TextField()
+    relevante = models.BooleanField()
+    razon = models.TextField(blank=True)
+    proveedor = models.CharField(max_length=20)
+    version_prompt = models.CharField(max_length=16)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_expiracion = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = ('hash_titulo', 'hash_texto')
+
+    def __str__(self):
+        return f"{'Relevante' if self.relevante else 'No relevante'} - {self.titulo[:80]}"
+
+class ResumenGenerado(models.Model):
+    """
+    Resumen generado por IA para un documento (Diario Oficial o hecho esencial CMF).
+    Se identifica por la URL del documento, el hash del texto resumido, el modelo y la versión del prompt.
+    """
+    url = models.CharField(max_length=500, blank=True, default='')
+    hash_texto = models.CharField(max_length=64)
+    modelo = models.CharField(max_length=50)
+    version_prompt = models.CharField(max_length=16)
+    resumen = models.TextField()
+    usos = models.PositiveIntegerField(default=0, help_text="Veces que se reutilizó sin llamar a la IA")
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_ultimo_uso = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('url', 'hash_texto', 'modelo', 'version_prompt')
+
+    def __str__(self):
+        return f"{self.modelo} - {self.url or self.hash_texto[:12]}"
+
+class PDFAlmacenado(models.Model):
+    """
+    Índice URL -> SHA-256 de los PDFs guardados en el almacén en disco.
+    Varias URLs pueden apuntar al mismo contenido.
+    """
+    url = models.CharField(max_length=500, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    tamano = models.PositiveIntegerField(help_text="Tamaño en bytes")
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_ultimo_acceso = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.sha256[:12]})"
+
+class TextoExtraido(models.Model):
+    """
+    Texto extraído de un PDF, identificado por el SHA-256 del contenido, las páginas procesadas
+    y el límite de caracteres con que se detuvo la extracción. Evita repetir PyPDF2, pdfminer u OCR sobre un PDF ya extraído.
+    """
+    sha256 = models.CharField(max_length=64)
+    max_paginas = models.PositiveIntegerField()
+    max_caracteres = models.PositiveIntegerField(default=0, help_text="0 = sin límite")
+    texto = models.TextField()
+    metodo = models.CharField(max_length=20)
+    duracion = models.FloatField(help_text="Segundos que tomó la extracción original")
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('sha256', 'max_paginas', 'max_caracteres')
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.metodo}, {self.max_paginas} páginas)"
+
+class Edicion(models.Model):
+    """
+    Número de edición del Diario Oficial publicada en cada fecha.
+    Reemplaza a edition_cache.json: una fecha y un número no pueden repetirse. El
+    número queda vacío si el sitio lo reasigna a otra fecha (ver EditionIndex.registrar).
+    """
+    ORIGEN_CHOICES = [
+        ('sitio', 'Sitio (HTTP)'),
+        ('selenium', 'Sitio (Selenium)'),
+        ('archivo', 'Importada de archivo'),
+    ]
+
+    fecha = models.DateField(unique=True)
+    numero = models.PositiveIntegerField(unique=True, blank=True, null=True)
+    origen = models.CharField(max_length=20, choices=ORIGEN_CHOICES, default='sitio')
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+    # Datos del último scraping de la edición (ver Publicacion)
+    total_documentos = models.PositiveIntegerField(blank=True, null=True)
+    valores_monedas = models.JSONField(blank=True, null=True)
+    fecha_scraping = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Edición del Diario Oficial"
+        verbose_name_plural = "Ediciones del Diario Oficial"
+        ordering = ['-fecha']
+
+    def __str__(self):
+        return f"{self.fecha:%d-%m-%Y}: {self.numero or 'sin número'}"
+
+class Publicacion(models.Model):
+    """
+    Publicación de una edición del Diario Oficial tal como quedó después del scraping:
+    relevancia, resumen y si se incluyó en el informe.
+    """
+    edicion = models.ForeignKey(Edicion, on_delete=models.PROTECT, related_name='publicaciones')
+    orden = models.PositiveIntegerField(default=0, help_text="Posición en el índice de la edición")
+    seccion = models.CharField(max_length=50, db_index=True)
+    titulo = models.TextField()
+    url_pdf = models.CharField(max_length=500)
+    relevante = models.BooleanField(default=False)
+    razon_relevancia = models.TextField(blank=True, default='')
+    resumen = models.TextField(blank=True, default='')
+    es_sii = models.BooleanField(default=False, db_index=True)
+    es_licitacion = models.BooleanField(default=False)
+    en_informe = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('edicion', 'url_pdf')
+        ordering = ['edicion', 'orden']
+
+    def __str__(self):
+        return f"{self.edicion.numero} - {self.titulo[:80]}"
+
+class DocumentoBusqueda(models.Model):
+    """
+    Texto buscable de una publicación del Diario Oficial, un documento del SII o un hecho
+    esencial. El índice de texto completo (FTS5 en SQLite, tsvector con índice GIN en
+    PostgreSQL) se crea en la migración y la base de datos lo mantiene al día con esta tabla.
+    """
+    TIPO_CHOICES = [
+        ('publicacion', 'Diario Oficial'),
+        ('sii', 'SII'),
+        ('hecho', 'Hecho esencial'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    objeto_id = models.PositiveBigIntegerField()
+    fecha = models.DateField(db_index=True)
+    titulo = models.TextField()
+    texto = models.TextField(blank=True, default='')
+    url = models.CharField(max_length=500, blank=True, default='')
+
+    class Meta:
+        unique_together = ('tipo', 'objeto_id')
+        ordering = ['-fecha']
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} - {self.titulo[:80]}"
@@ -0,0 +1,126 @@
+"""
+Parser de las páginas índice de una edición del Diario Oficial (sumario, normas
+particulares y avisos destacados) y del número de edición de una fecha.
+
+Recorre cada documento una sola vez con lxml, llevando la sección y el organismo
+vigentes a medida que avanza, en vez de buscar hacia atrás desde cada fila.
+"""
+import re
+from typing import List, NamedTuple, Optional, Union
+
+import lxml.html
+
+# Secciones reconocidas en las filas de título (td.title2), en mayúsculas
+SECCIONES = frozenset({"NORMAS GENERALES", "NORMAS PARTICULARES", "AVISOS DESTACADOS"})
+
+_RE_VER_PDF = re.compile(r"Ver PDF.*")
+_RE_CVE = re.compile(r"\(CVE-\d+\).*")
+
+
+class FilaEdicion(NamedTuple):
+    """Una publicación del índice de la edición"""
+    seccion: str
+    titulo: str
+    url_pdf: str
+    organismo: str = ""
+
+
+def _texto(elemento) -> str:
+    """Texto del elemento con los espacios normalizados"""
+    return " ".join(elemento.text_content().split())
+
+
+def _documento(html: Union[str, bytes]):
+    return lxml.html.fromstring(html)
+
+
+def parsear_sumario(html: Union[str, bytes], seccion_por_defecto: str = "NORMAS GENERALES") -> List[FilaEdicion]:
+    """
+    Extrae las publicaciones (filas tr.content con enlace a PDF) del sumario o de la
+    página de normas particulares. La sección sale de la última fila td.title2
+    reconocida (o seccion_por_defecto) y el organismo de la última td.title4.
+    """
+    filas = []
+    seccion = seccion_por_defecto
+    organismo = ""
+
+    for tr in _documento(html).iter('tr'):
+        tds = tr.findall('td')
+        if not tds:
+            continue
+
+        if 'content' in (tr.get('class') or '').split():
+            if len(tds) < 2:
+                continue
+            enlace = next((a for a in tds[1].iter('a') if a.get('href')), None)
+            if enlace is None or not enlace.get('href').endswith('.pdf'):
+                continue
+            titulo = _RE_VER_PDF.sub("", _texto(tds[0])).strip()
+            filas.append(FilaEdicion(seccion, titulo, enlace.get('href'), organismo))
+            continue
+
+        clase = tds[0].get('class') or ''
+        if clase == 'title2':
+            texto = _texto(tds[0]).upper()
+            if texto in SECCIONES:
+                seccion = texto
+        elif clase == 'title4':
+            organismo = _texto(tds[0])
+
+    return filas
+
+
+def parsear_avisos_destacados(html: Union[str, bytes]) -> List[FilaEdicion]:
+    """
+    Extrae los avisos de la página de avisos destacados: cada enlace a PDF cuyo
+    título es el texto de su fila, sin el "Ver PDF" ni el CVE.
+    """
+    filas = []
+    for enlace in _documento(html).iter('a'):
+        href = enlace.get('href')
+        if not href or not href.endswith('.pdf'):
+            continue
+        tr = next(enlace.iterancestors('tr'), None)
+        if tr is None:
+            continue
+        titulo = _texto(tr).replace('Ver PDF', '').replace(_texto(enlace), '').strip()
+        titulo = _RE_CVE.sub('', titulo).strip()
+        if titulo:
+            filas.append(FilaEdicion("AVISOS DESTACADOS", titulo, href))
+    return filas
+
+
+def numero_edicion_de_url(url: str, fecha: str) -> Optional[str]:
+    """
+    Número de edición de una URL de publicaciones (/publicaciones/aaaa/mm/dd/edicion-N/),
+    solo si su fecha es la pedida (dd-mm-aaaa).
+    """
+    dia, mes, anio = fecha.split('-')
+    match = re.search(rf"/publicaciones/{anio}/{mes}/{dia}/edicion-(\d+)/?", url or '')
+    return match.group(1) if match else None
+
+
+def extraer_numero_edicion(html: Union[str, bytes], fecha: str) -> Optional[str]:
+    """
+    Número de edición de la fecha (dd-mm-aaaa) a partir de la página de publicaciones
+    o del índice de la edición electrónica. Se buscan, en orden: la opción seleccionada
+    del selector #ediciones, los enlaces de secciones (date=...&edition=N) y el enlace
+    al sumario en PDF. Todos solo cuentan si corresponden a la fecha pedida, porque el
+    sitio muestra la última edición cuando la fecha no tiene una.
+    """
+    documento = _documento(html)
+
+    for opcion in documento.xpath('//select[@id="ediciones"]/option[@selected]'):
+        numero = numero_edicion_de_url(opcion.get('value'), fecha)
+        if numero:
+            return numero
+
+    dia, mes, anio = fecha.split('-')
+    re_seccion = re.compile(rf"[?&]date={re.escape(fecha)}&edition=(\d+)")
+    re_sumario = re.compile(rf"/publicaciones/{anio}/{mes}/{dia}/sumarios/(\d+)\.pdf$")
+    for enlace in documento.iter('a'):
+        href = enlace.get('href') or ''
+        match = re_seccion.search(href) or re_sumario.search(href)
+        if match:
+            return match.group(1)
+    return None
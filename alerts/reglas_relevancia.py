@@ -0,0 +1,101 @@
+"""
+Reglas de relevancia de publicaciones del Diario Oficial, usadas cuando no hay IA
+disponible o su respuesta falla.
+
+Las reglas se cargan de un archivo JSON (reglas_relevancia.json) y se compilan una
+vez en una tabla de decisión ordenada, donde gana el primer resultado:
+
+1. exclusiones: la primera de la lista contenida en el título la descarta, salvo
+   que el título mencione alguno de excepciones_cargo.
+2. criterios: el primero con alguna palabra en el título la incluye, salvo que
+   aplique un bloqueo (alguna palabra de "si" y ninguna de "salvo").
+3. reglas_finales: alguna palabra de "si" y alguna de "y" la incluyen.
+4. por_defecto: no relevante.
+
+Todas las palabras se buscan como subcadenas del título en mayúsculas, en una sola
+pasada; como la decisión depende solo de qué palabras aparecen, se memoriza por
+conjunto de palabras encontradas.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+from alerts.utils.keyword_matcher import BuscadorPalabras
+
+RUTA_REGLAS = os.path.join(os.path.dirname(__file__), 'reglas_relevancia.json')
+
+
+class MotorReglas:
+    """Reglas de relevancia compiladas: evalúa un título o una edición completa"""
+
+    def __init__(self, reglas: Dict[str, Any]):
+        palabras = list(reglas['excepciones_cargo'])
+        palabras += [palabra for palabra, _ in reglas['exclusiones']]
+        for criterio in reglas['criterios']:
+            palabras += criterio['palabras']
+        for regla in reglas['bloqueos'] + reglas['reglas_finales']:
+            palabras += regla['si'] + regla.get('salvo', []) + regla.get('y', [])
+        self._buscador = BuscadorPalabras(palabras)
+
+        self._cargos = self._mascara(reglas['excepciones_cargo'])
+        self._exclusiones = [(self._mascara([palabra]), razon) for palabra, razon in reglas['exclusiones']]
+        self._criterios = [(self._mascara(c['palabras']), c['razon']) for c in reglas['criterios']]
+        self._bloqueos = [(self._mascara(b['si']), self._mascara(b['salvo'])) for b in reglas['bloqueos']]
+        self._finales = [(self._mascara(r['si']), self._mascara(r['y']), r['razon']) for r in reglas['reglas_finales']]
+        self._alguna_exclusion = self._union(m for m, _ in self._exclusiones)
+        self._algun_criterio = self._union(m for m, _ in self._criterios)
+        self._por_defecto = (False, reglas['por_defecto'])
+        self._decidir = lru_cache(maxsize=4096)(self._decidir_sin_cache)
+
+    @classmethod
+    def desde_archivo(cls, ruta: str = RUTA_REGLAS) -> 'MotorReglas':
+        with open(ruta, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _mascara(self, palabras: Iterable[str]) -> int:
+        return self._union(self._buscador.bits[p] for p in palabras if p)
+
+    @staticmethod
+    def _union(mascaras: Iterable[int]) -> int:
+        total = 0
+        for mascara in mascaras:
+            total |= mascara
+        return total
+
+    def _decidir_sin_cache(self, encontradas: int) -> Tuple[bool, str]:
+        """Veredicto para la máscara de palabras encontradas en el título"""
+        if encontradas & self._alguna_exclusion and not encontradas & self._cargos:
+            for mascara, razon in self._exclusiones:
+                if encontradas & mascara:
+                    return False, razon
+
+        if encontradas & self._algun_criterio and not any(
+            encontradas & si and not encontradas & salvo for si, salvo in self._bloqueos
+        ):
+            for mascara, razon in self._criterios:
+                if encontradas & mascara:
+                    return True, razon
+
+        for si, y, razon in self._finales:
+            if encontradas & si and encontradas & y:
+                return True, razon
+
+        return self._por_defecto
+
+    def evaluar(self, titulo: str) -> Tuple[bool, str]:
+        """(es_relevante, justificación) del título"""
+        return self._decidir(self._buscador.mascara(titulo.upper()))
+
+    def evaluar_lote(self, titulos: Iterable[str]) -> List[Tuple[bool, str]]:
+        """
+        evaluar() de cada título, en el mismo orden. Cada título distinto se recorre
+        una sola vez; los repetidos reutilizan su veredicto.
+        """
+        titulos = list(titulos)
+        veredictos = {titulo: self.evaluar(titulo) for titulo in dict.fromkeys(titulos)}
+        return [veredictos[titulo] for titulo in titulos]
+
+
+# Reglas vigentes, compiladas al importar
+motor_reglas = MotorReglas.desde_archivo()
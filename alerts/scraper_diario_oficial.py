@@ -1,5 +1,3 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
 from io import BytesIO
@@ -8,22 +6,24 @@ from pdf2image import convert_from_bytes
 import pytesseract
 import PyPDF2
 import os
-import json
 import google.generativeai as genai
 from dotenv import load_dotenv
 import time
-import undetected_chromedriver as uc
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from alerts.services.cache_service import cache_service
+from alerts.services.summary_store import summary_store, version_prompt
 from alerts.services.pdf_extractor import PDFExtractor
-from alerts.utils.rate_limiter import rate_limited
-from alerts.utils.retry_utils import retry
+from alerts import calendario_diario_oficial
+from alerts.parser_diario_oficial import (
+    extraer_numero_edicion, numero_edicion_de_url, parsear_avisos_destacados, parsear_sumario
+)
+from alerts.services.pdf_store import pdf_store
+from alerts.services.text_cache import text_cache
+from alerts.services.ocr_engine import ocr_engine
+from alerts.services.publication_store import publication_store
+from alerts.services.edition_index import edition_index
+from alerts.services.publication_archive import publication_archive
+from alerts.utils import http_client
+from alerts.utils.concurrency import ejecutar_en_paralelo
 from django.core.mail import send_mail
 from alerts.evaluador_relevancia import EvaluadorRelevancia
 from alerts.utils.sii_utils import es_contenido_sii
@@ -51,43 +51,71 @@ def es_licitacion_publica(titulo):
     ]
     return any(palabra in titulo_lower for palabra in palabras_licitacion)
 
-pdf_extractor = PDFExtractor()
+pdf_extractor = PDFExtractor(text_cache=text_cache)
+
+# Número de publicaciones que se descargan, extraen y resumen en paralelo
+PDF_WORKERS = int(os.environ.get('DIARIO_OFICIAL_PDF_WORKERS', '4'))
+
+# Confianza mínima de la estimación por calendario para no consultar el sitio por la edición
+EDICION_CONFIANZA_MINIMA = float(os.environ.get('EDICION_CONFIANZA_MINIMA', '0.95'))
+# Detectar la edición con Chrome cuando falla la detección por HTTP (último recurso)
+EDICION_USAR_SELENIUM = os.environ.get('EDICION_USAR_SELENIUM', '').lower() in ('1', 'true', 'si')
+
+def _descargar_pdf(url_completa):
+    """Descarga un PDF con el cliente compartido (rate limiting por dominio y reintentos)"""
+    resp = http_client.get(url_completa, timeout=20)
+    resp.raise_for_status()
+    return resp.content
 
-@rate_limited
-@retry(max_retries=3, backoff_factor=2)
 def descargar_pdf_con_cache(url_pdf):
-    """Descarga un PDF usando caché y rate limiting"""
+    """
+    Entrega un PDF desde el almacén en disco, descargándolo si no está (solo las
+    descargas reales consumen cupo del rate limiter). Debe usarse con `with`:
+    el contenido es un mmap que se cierra al salir del bloque.
+    """
     if url_pdf.startswith('http'):
         url_completa = url_pdf
     else:
         url_completa = f"https://www.diariooficial.interior.gob.cl{url_pdf}"
-    # Intentar obtener del caché
-    content = cache_service.get_pdf_content(url_completa)
-    if content:
-        return content
-    # Descargar y guardar en caché
-    resp = requests.get(url_completa, timeout=20)
-    resp.raise_for_status()
-    cache_service.set_pdf_content(url_completa, resp.content)
-    return resp.content
+    return pdf_store.abrir(url_completa, lambda: _descargar_pdf(url_completa))
 
-def extraer_texto_pdf_mixto(url_pdf):
+# Caracteres del PDF que realmente se usan: los resúmenes y el evaluador de relevancia
+# leen como máximo los primeros 3.000, así que no se procesan más páginas de las necesarias
+MAX_CARACTERES_PDF = 3000
+
+def extraer_texto_pdf_mixto(url_pdf, max_chars=MAX_CARACTERES_PDF):
     """
-    Extrae texto de un PDF usando caché y extractor robusto.
+    Extrae texto de un PDF usando el almacén de PDFs y extractor robusto.
+    La extracción se detiene al reunir max_chars caracteres (None = hasta 8 páginas).
     """
     try:
-        pdf_content = descargar_pdf_con_cache(url_pdf)
-        if not pdf_content:
-            print(f"[WARNING] No se pudo descargar el PDF: {url_pdf}")
-            return ""
-        
-        texto, metodo = pdf_extractor.extract_text(pdf_content, max_pages=8)
+        with descargar_pdf_con_cache(url_pdf) as pdf_content:
+            if not pdf_content:
+                print(f"[WARNING] No se pudo descargar el PDF: {url_pdf}")
+                return ""
+            
+            texto, metodo = pdf_extractor.extract_text(pdf_content, max_pages=8, max_chars=max_chars)
         # print(f"[ExtractorRobusto] Método: {metodo}, Texto extraído: {texto[:500]}")
         return texto
     except Exception as e:
         print(f"[WARNING] Error extrayendo texto del PDF {url_pdf}: {str(e)}")
         return ""
 
+# Prompt compartido por los resúmenes de OpenAI y Gemini
+PROMPT_RESUMEN = (
+    "Resume este documento oficial chileno de forma muy concisa.\n\n"
+    "INSTRUCCIONES:\n"
+    "1. MÁXIMO 2 ORACIONES (60-80 palabras total).\n"
+    "2. Incluye SOLO lo esencial:\n"
+    "   - De qué trata el documento\n"
+    "   - Quién lo emite y a quién afecta\n"
+    "   - Fecha/plazo clave si existe\n"
+    "3. Sé extremadamente conciso y directo.\n\n"
+    "Título: {titulo}\n"
+    "Texto: {texto}"
+)
+VERSION_PROMPT_RESUMEN = version_prompt(PROMPT_RESUMEN)
+
 def resumen_con_gemini(texto, titulo=None):
     from dotenv import load_dotenv
     load_dotenv()
@@ -102,18 +130,7 @@ def resumen_con_gemini(texto, titulo=None):
             primer_parrafo = texto[:1200]
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = (
-            "Resume este documento oficial chileno de forma muy concisa.\n\n"
-            "INSTRUCCIONES:\n"
-            "1. MÁXIMO 2 ORACIONES (60-80 palabras total).\n"
-            "2. Incluye SOLO lo esencial:\n"
-            "   - De qué trata el documento\n"
-            "   - Quién lo emite y a quién afecta\n"
-            "   - Fecha/plazo clave si existe\n"
-            "3. Sé extremadamente conciso y directo.\n\n"
-            f"Título: {titulo}\n"
-            f"Texto: {primer_parrafo}"
-        )
+        prompt = PROMPT_RESUMEN.format(titulo=titulo, texto=primer_parrafo)
         # print('\n[Gemini] Texto enviado a Gemini:\n', primer_parrafo[:1000], '\n---')
         response = model.generate_content(prompt)
         # print('[Gemini] Respuesta cruda:', response.text)
@@ -147,24 +164,12 @@ def resumen_con_openai(texto, titulo=None):
             primer_parrafo = texto[:1500]
         
         # Preparar la solicitud a OpenAI
-        import requests
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
         
-        prompt = (
-            "Resume este documento oficial chileno de forma muy concisa.\n\n"
-            "INSTRUCCIONES:\n"
-            "1. MÁXIMO 2 ORACIONES (60-80 palabras total).\n"
-            "2. Incluye SOLO lo esencial:\n"
-            "   - De qué trata el documento\n"
-            "   - Quién lo emite y a quién afecta\n"
-            "   - Fecha/plazo clave si existe\n"
-            "3. Sé extremadamente conciso y directo.\n\n"
-            f"Título: {titulo}\n"
-            f"Texto: {primer_parrafo}"
-        )
+        prompt = PROMPT_RESUMEN.format(titulo=titulo, texto=primer_parrafo)
         
         data = {
             "model": "gpt-4o-mini",  # Modelo más económico y rápido
@@ -176,7 +181,7 @@ def resumen_con_openai(texto, titulo=None):
             "max_tokens": 150
         }
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=data,
@@ -216,7 +221,7 @@ def resumen_con_huggingface(texto, titulo=None):
     )
     payload = {"inputs": prompt, "parameters": {"max_new_tokens": 80}}
     try:
-        response = requests.post(endpoint, headers=headers, json=payload, timeout=60)
+        response = http_client.post(endpoint, headers=headers, json=payload, timeout=60)
         response.raise_for_status()
         data = response.json()
         resumen = None
@@ -246,20 +251,72 @@ def resumen_con_huggingface(texto, titulo=None):
         pass
     return None
 
-def generar_resumen_desde_texto(texto, titulo=None):
-    # Intentar primero con OpenAI
-    resumen_ia = resumen_con_openai(texto, titulo)
-    if resumen_ia:
-        return resumen_ia
-    
-    # Si falla OpenAI, intentar con Gemini
-    resumen_ia = resumen_con_gemini(texto, titulo)
+# Textos que se muestran cuando no hay resumen; no son un resultado definitivo
+RESUMEN_SIN_TEXTO = "No se pudo extraer el contenido del documento."
+RESUMEN_FALLIDO = "No se pudo generar un resumen relevante."
+RESUMENES_FALLIDOS = (RESUMEN_SIN_TEXTO, RESUMEN_FALLIDO, "No se pudo generar un resumen del documento.")
+
+def generar_resumen_desde_texto(texto, titulo=None, url=None):
+    """
+    Genera el resumen de un documento, reutilizando el guardado si el texto,
+    el modelo y el prompt no cambiaron.
+    """
+    # Intentar primero con OpenAI y, si falla, con Gemini
+    resumen_ia = summary_store.obtener_o_generar(
+        url,
+        f"{titulo}\n{texto}",
+        VERSION_PROMPT_RESUMEN,
+        [
+            ('gpt-4o-mini', lambda: resumen_con_openai(texto, titulo)),
+            ('gemini-1.5-flash', lambda: resumen_con_gemini(texto, titulo)),
+        ]
+    )
     if resumen_ia:
         return resumen_ia
     
     if not texto:
-        return "No se pudo extraer el contenido del documento."
-    return "No se pudo generar un resumen relevante."
+        return RESUMEN_SIN_TEXTO
+    return RESUMEN_FALLIDO
+
+def procesar_publicacion_relevante(pub):
+    """
+    Descarga y extrae el PDF de una publicación, re-evalúa su relevancia con el
+    contenido y genera el resumen. Pensada para ejecutarse en un worker: no
+    modifica la publicación, retorna un dict con el resultado y los tiempos.
+    'definitivo' es False si faltó el texto, el resumen o el veredicto de la IA
+    (se usaron las reglas): ese resultado no se guarda y se reintenta en la próxima corrida.
+    """
+    inicio = time.time()
+    texto_pdf = extraer_texto_pdf_mixto(pub['url_pdf'])
+    tiempo_extraccion = time.time() - inicio
+    veredicto_ia = True
+
+    # Re-evaluar relevancia con el contenido del PDF para mayor precisión
+    if texto_pdf and len(texto_pdf) > 100:
+        es_relevante_final, razon_final = evaluador_relevancia.evaluar_relevancia(pub['titulo'], texto_pdf)
+        veredicto_ia = not evaluador_relevancia.veredicto_por_reglas()
+        if not es_relevante_final:
+            return {
+                "incluir": False,
+                "razon": razon_final,
+                "resumen": "",
+                "definitivo": veredicto_ia,
+                "tiempos": {"extraccion": tiempo_extraccion, "total": time.time() - inicio}
+            }
+
+    inicio_resumen = time.time()
+    resumen = generar_resumen_desde_texto(texto_pdf, pub['titulo'], url=pub['url_pdf'])
+    return {
+        "incluir": True,
+        "razon": None,
+        "resumen": resumen,
+        "definitivo": bool(texto_pdf) and veredicto_ia and resumen not in RESUMENES_FALLIDOS,
+        "tiempos": {
+            "extraccion": tiempo_extraccion,
+            "resumen": time.time() - inicio_resumen,
+            "total": time.time() - inicio
+        }
+    }
 
 def extraer_valores_dolar_euro(texto):
     """
@@ -285,28 +342,74 @@ def extraer_valores_dolar_euro(texto):
     # print("[DEBUG] Resultado extracción monedas:", resultado)
     return resultado
 
-def obtener_numero_edicion(fecha, driver=None):
+def resolver_edicion_http(fecha):
+    """
+    Detecta el número de edición de una fecha (dd-mm-aaaa) solo con peticiones HTTP:
+    primero la página de publicaciones de la fecha y, si no trae la edición, el índice
+    de la edición electrónica. Retorna None si ninguna de las dos la informa.
+    """
+    dia, mes, anio = fecha.split('-')
+    urls = [
+        f"https://www.diariooficial.interior.gob.cl/publicaciones/{anio}/{mes}/{dia}/",
+        f"{BASE_URL}?date={fecha}",
+    ]
+    for url in urls:
+        try:
+            resp = http_client.get(url, rate_limit=False, timeout=15)
+        except Exception as e:
+            print(f"[EDITION] Error consultando {url}: {e}")
+            continue
+        if resp.status_code != 200:
+            print(f"[EDITION] {url} respondió {resp.status_code}")
+            continue
+        edition_number = extraer_numero_edicion(resp.content, fecha)
+        if edition_number:
+            print(f"[EDITION] Número de edición detectado en {url}: {edition_number}")
+            return edition_number
+    return None
+
+def obtener_numero_edicion(fecha, driver=None, usar_selenium=None):
     """
     Obtiene el número de edición para una fecha específica del Diario Oficial.
-    Versión mejorada que detecta automáticamente la edición correcta.
+    Busca en el índice de ediciones, luego usa la estimación por calendario si su
+    confianza alcanza EDICION_CONFIANZA_MINIMA y, si no, consulta el sitio con peticiones
+    HTTP. Selenium solo se usa como último recurso explícito: si se entrega un driver,
+    con usar_selenium=True o con EDICION_USAR_SELENIUM=1. Si nada funciona, retorna la
+    estimación aunque sea poco confiable.
     """
     print(f"[EDITION] Buscando número de edición para fecha: {fecha}")
     
-    # Primero intentar con caché local
-    try:
-        import json
-        cache_file = os.path.join(os.path.dirname(__file__), '..', 'edition_cache.json')
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                cache = json.load(f)
-                if fecha in cache:
-                    edition = cache[fecha]
-                    print(f"[EDITION] Número de edición encontrado en caché: {edition}")
-                    return edition
-    except Exception as e:
-        print(f"[EDITION] Error leyendo caché: {e}")
+    # Primero intentar con el índice de ediciones
+    edition = edition_index.get(datetime.strptime(fecha, "%d-%m-%Y").date())
+    if edition:
+        print(f"[EDITION] Número de edición encontrado en el índice: {edition}")
+        return edition
+    
+    # Si la estimación es confiable no hace falta consultar el sitio: la página del
+    # sumario confirma la edición después (ver obtener_sumario_diario_oficial)
+    estimacion = estimar_edicion(fecha)
+    if estimacion and estimacion.confianza >= EDICION_CONFIANZA_MINIMA:
+        return str(estimacion.numero)
     
-    # Si no está en caché, usar Selenium para detectar automáticamente
+    # Luego con peticiones HTTP, sin levantar un navegador
+    edition_number = resolver_edicion_http(fecha)
+    if edition_number:
+        edition_index.registrar(datetime.strptime(fecha, "%d-%m-%Y").date(), edition_number, origen='sitio')
+        return edition_number
+
+    if usar_selenium is None:
+        usar_selenium = driver is not None or EDICION_USAR_SELENIUM
+    if not usar_selenium:
+        print("[EDITION] No se pudo detectar el número de edición por HTTP")
+        return str(estimacion.numero) if estimacion else None
+
+    return _detectar_edicion_selenium(fecha, driver)
+
+def _detectar_edicion_selenium(fecha, driver=None):
+    """Detecta la edición abriendo la página de la fecha en Chrome (lento y pesado)"""
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
     driver_temporal = False
     driver_creado = driver
     
@@ -357,29 +460,13 @@ def obtener_numero_edicion(fecha, driver=None):
             selected_value = selected_option.get_attribute("value")
             print(f"[EDITION] Valor seleccionado: {selected_value}")
             
-            # Extraer el número de edición de la URL
-            import re
-            match = re.search(r'/edicion-(\d+)/?', selected_value)
-            if match:
-                edition_number = match.group(1)
+            # Extraer el número de edición de la URL, si es de la fecha pedida
+            edition_number = numero_edicion_de_url(selected_value, fecha)
+            if edition_number:
                 print(f"[EDITION] Número de edición detectado: {edition_number}")
                 
-                # Actualizar el caché
-                try:
-                    cache_file = os.path.join(os.path.dirname(__file__), '..', 'edition_cache.json')
-                    cache = {}
-                    if os.path.exists(cache_file):
-                        with open(cache_file, 'r') as f:
-                            cache = json.load(f)
-                    
-                    cache[fecha] = edition_number
-                    
-                    with open(cache_file, 'w') as f:
-                        json.dump(cache, f, indent=2)
-                    
-                    print(f"[EDITION] Caché actualizado con {fecha}: {edition_number}")
-                except Exception as e:
-                    print(f"[EDITION] Error actualizando caché: {e}")
+                edition_index.registrar(datetime.strptime(fecha, "%d-%m-%Y").date(), edition_number,
+                                        origen='selenium')
                 
                 if driver_temporal:
                     driver_creado.quit()
@@ -389,11 +476,8 @@ def obtener_numero_edicion(fecha, driver=None):
             print(f"[EDITION] No se encontró selector de ediciones: {e}")
         
         # Estrategia 2: Buscar en el HTML actual si ya estamos en una página con edición
-        current_url = driver_creado.current_url
-        import re
-        match = re.search(r'/edicion-(\d+)/?', current_url)
-        if match:
-            edition_number = match.group(1)
+        edition_number = numero_edicion_de_url(driver_creado.current_url, fecha)
+        if edition_number:
             print(f"[EDITION] Edición detectada en URL actual: {edition_number}")
             if driver_temporal:
                 driver_creado.quit()
@@ -421,84 +505,30 @@ def obtener_numero_edicion(fecha, driver=None):
                 pass
         return estimar_edicion_por_dias_habiles(fecha)
 
-def estimar_edicion_por_dias_habiles(fecha):
+def estimar_edicion(fecha):
     """
-    Estima el número de edición basándose en días hábiles con validaciones mejoradas.
+    Estima la edición de una fecha (dd-mm-aaaa) con el calendario de publicación
+    (lunes a sábado, sin feriados) desde la edición registrada más cercana anterior.
+    Retorna una EstimacionEdicion con su confianza, o None si no hay referencia.
     """
+    dia = datetime.strptime(fecha, "%d-%m-%Y").date()
+    referencia = edition_index.referencia_anterior(dia)
+    if not referencia:
+        return None
+    estimacion = calendario_diario_oficial.estimar(dia, referencia)
+    print(f"[EDITION] Estimación para {fecha}: {estimacion.numero} "
+          f"({estimacion.dias_publicacion} días de publicación desde {referencia[0]:%d-%m-%Y}, "
+          f"edición {referencia[1]}; confianza {estimacion.confianza:.2f})")
+    return estimacion
+
+def estimar_edicion_por_dias_habiles(fecha):
+    """Número de edición estimado como texto, o None si no se puede estimar"""
     try:
-        # Cargar el caché
-        cache_file = os.path.join(os.path.dirname(__file__), '..', 'edition_cache.json')
-        cache = {}
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                cache = json.load(f)
-        
-        fecha_obj = datetime.strptime(fecha, "%d-%m-%Y")
-        
-        # Buscar la referencia más cercana ANTERIOR a la fecha solicitada
-        mejor_ref = None
-        fecha_ref_mas_cercana = None
-        
-        for fecha_cache, edicion_cache in cache.items():
-            fecha_cache_obj = datetime.strptime(fecha_cache, "%d-%m-%Y")
-            
-            # Solo considerar fechas anteriores o iguales
-            if fecha_cache_obj <= fecha_obj:
-                if mejor_ref is None or fecha_cache_obj > fecha_ref_mas_cercana:
-                    fecha_ref_mas_cercana = fecha_cache_obj
-                    mejor_ref = (fecha_cache, int(edicion_cache))
-        
-        if mejor_ref:
-            fecha_ref, edicion_ref = mejor_ref
-            fecha_ref_obj = datetime.strptime(fecha_ref, "%d-%m-%Y")
-            
-            # Contar días hábiles entre las dos fechas
-            dias_habiles = 0
-            fecha_actual = fecha_ref_obj + timedelta(days=1)
-            
-            while fecha_actual <= fecha_obj:
-                # Si es lunes a viernes (0-4), es día hábil
-                if fecha_actual.weekday() < 5:
-                    dias_habiles += 1
-                fecha_actual += timedelta(days=1)
-            
-            # Calcular la edición estimada
-            edicion_estimada = edicion_ref + dias_habiles
-            
-            print(f"[EDITION] Estimación:")
-            print(f"  - Referencia: {fecha_ref} (edición {edicion_ref})")
-            print(f"  - Objetivo: {fecha}")
-            print(f"  - Días hábiles: {dias_habiles}")
-            print(f"  - Edición estimada: {edicion_estimada}")
-            
-            # Validar que no exista ya esa edición en otra fecha
-            for f, e in cache.items():
-                if int(e) == edicion_estimada and f != fecha:
-                    print(f"[ALERTA] Edición {edicion_estimada} duplicada con {f}")
-                    # Incrementar hasta encontrar una edición libre
-                    ediciones_usadas = set(int(e) for e in cache.values())
-                    while edicion_estimada in ediciones_usadas:
-                        edicion_estimada += 1
-                    print(f"[ALERTA] Nueva edición asignada: {edicion_estimada}")
-                    break
-            
-            # Actualizar el caché con la nueva estimación
-            cache[fecha] = str(edicion_estimada)
-            cache_ordenado = dict(sorted(cache.items(), 
-                                       key=lambda x: datetime.strptime(x[0], "%d-%m-%Y")))
-            
-            with open(cache_file, 'w') as f:
-                json.dump(cache_ordenado, f, indent=2)
-            
-            print(f"[EDITION] Caché actualizado: {fecha} -> {edicion_estimada}")
-            return str(edicion_estimada)
-            
+        estimacion = estimar_edicion(fecha)
     except Exception as e:
         print(f"[EDITION] Error en estimación: {e}")
-    
-    # Valor por defecto basado en fecha más reciente conocida
-    print("[EDITION] Usando estimación por defecto")
-    return None
+        return None
+    return str(estimacion.numero) if estimacion else None
 
 def extraer_avisos_destacados(soup):
     """Extrae avisos destacados del HTML del Diario Oficial."""
@@ -554,12 +584,15 @@ def extraer_avisos_destacados_tabla(soup):
                     })
     return avisos
 
-def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
+def obtener_sumario_diario_oficial(fecha=None, force_refresh=False, max_workers=None, condicional=True):
     """
     Scrapea el sumario del Diario Oficial para la fecha dada (formato dd-mm-aaaa).
     Retorna una lista de dicts con título, enlace al PDF, relevancia y resumen.
     SIEMPRE incluye llamados a licitación pública.
     Además, retorna los valores del dólar y euro si están disponibles.
+    max_workers controla cuántos PDFs se procesan en paralelo (por defecto PDF_WORKERS).
+    Con force_refresh y condicional, las páginas de la edición se piden con ETag /
+    Last-Modified: si ninguna cambió se retorna el resultado anterior sin reprocesar.
     """
     from datetime import datetime as dt
     
@@ -572,11 +605,21 @@ def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
             fecha = datetime.now().strftime("%d-%m-%Y")
         fecha_cache = dt.strptime(fecha, "%d-%m-%Y")
         # --- CACHÉ RESULTADO FINAL ---
-        if not force_refresh:
-            resultado_cache = cache_service.get_scraping_result(fecha_cache)
-            if resultado_cache and isinstance(resultado_cache, dict) and 'publicaciones' in resultado_cache:
-                # print(f"[CACHE] Usando resultado final del scraping desde caché para {fecha}")
-                return resultado_cache
+        resultado_cache = cache_service.get_scraping_result(fecha_cache)
+        if not (resultado_cache and isinstance(resultado_cache, dict) and 'publicaciones' in resultado_cache):
+            resultado_cache = None
+        if resultado_cache and not force_refresh:
+            # print(f"[CACHE] Usando resultado final del scraping desde caché para {fecha}")
+            return resultado_cache
+        if not resultado_cache and not force_refresh:
+            # Una edición ya scrapeada por completo cuyo caché venció se reconstruye desde la base de datos
+            archivado = publication_archive.resultado(fecha_cache.date())
+            if archivado:
+                print(f"[INFO] Edición del {fecha} reconstruida desde el archivo de publicaciones")
+                cache_service.set_scraping_result(fecha_cache, archivado)
+                return archivado
+        # Cada edición parte con el presupuesto de CPU de OCR completo
+        ocr_engine.reiniciar_presupuesto()
         # --- CACHÉ HTML POR FECHA ---
         # Primero intentar obtener el número de edición
         edition = obtener_numero_edicion(fecha)
@@ -587,67 +630,93 @@ def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
             print(f"[INFO] Número de edición obtenido: {edition}")
         
         url = f"{BASE_URL}?date={fecha}&edition={edition}&v=1"
+        url_normas_part = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/normas_particulares.php?date={fecha}&edition={edition}"
+        # La URL correcta incluye /edicionelectronica/
+        url_avisos = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/avisos_destacados.php?date={fecha}&edition={edition}"
+        
+        # Descargar en paralelo el sumario, normas particulares y avisos destacados.
+        # Las páginas del sumario no consumen cupo del rate limiter (reservado para los PDFs).
+        urls_paginas = [url, url_normas_part, url_avisos] if edition else [url]
+        # Si hay un resultado anterior, pedir las páginas de forma condicional
+        validadores_previos = [
+            cache_service.get_validadores(u) if (condicional and resultado_cache) else None
+            for u in urls_paginas
+        ]
+        respuestas_paginas = http_client.obtener_varios(
+            urls_paginas,
+            headers_por_url=[http_client.cabeceras_condicionales(v) for v in validadores_previos],
+            rate_limit=False
+        )
+        if resultado_cache and all(
+            http_client.sin_cambios(r, v) for r, v in zip(respuestas_paginas, validadores_previos)
+        ):
+            print(f"[INFO] Las páginas de la edición {edition} no cambiaron, se reutiliza el resultado anterior")
+            return resultado_cache
+        # Las páginas que respondieron 304 se necesitan completas porque otra sí cambió
+        no_modificadas = [i for i, r in enumerate(respuestas_paginas)
+                          if not isinstance(r, Exception) and r.status_code == 304]
+        if no_modificadas:
+            completas = http_client.obtener_varios([urls_paginas[i] for i in no_modificadas], rate_limit=False)
+            for i, r in zip(no_modificadas, completas):
+                respuestas_paginas[i] = r
+        
         # Descargar HTML principal
-        response = requests.get(url, timeout=30)
+        response = respuestas_paginas[0]
+        if isinstance(response, Exception):
+            raise response
         response.raise_for_status()
         html = response.text
-        soup = BeautifulSoup(html, "html.parser")
+        # El sumario confirma la edición. Si se usó una estimación errada (o ninguna),
+        # normas particulares y avisos destacados se piden de nuevo con la correcta.
+        edicion_sitio = extraer_numero_edicion(html, fecha)
+        if edicion_sitio:
+            edition_index.registrar(fecha_cache.date(), edicion_sitio)
+            if edicion_sitio != edition:
+                print(f"[EDITION] El sitio informa la edición {edicion_sitio} (se usó '{edition}')")
+                edition = edicion_sitio
+                url_normas_part = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/normas_particulares.php?date={fecha}&edition={edition}"
+                url_avisos = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/avisos_destacados.php?date={fecha}&edition={edition}"
+                urls_paginas = [url, url_normas_part, url_avisos]
+                respuestas_paginas = [response] + http_client.obtener_varios(urls_paginas[1:], rate_limit=False)
         sumario = []
         vistos = set()
-        seccion_actual = None
         valores_monedas = None
         total_documentos = 0
+        # Solo una edición sin páginas, PDFs ni resúmenes fallidos se archiva
+        completa = bool(edition)
         no_relevantes = []
-        # Primero, procesar TODAS las publicaciones en tr.content
+        # Primero, procesar TODAS las publicaciones del sumario
         todas_las_publicaciones = []
-        for tr in soup.find_all('tr', class_='content'):
-            tds = tr.find_all('td')
-            if len(tds) >= 2:
-                titulo = tds[0].get_text(strip=True)
-                titulo = re.sub(r"Ver PDF.*", "", titulo).strip()
-                titulo = titulo.replace(' <span class="border dotted"></span>', '').strip()
-                
-                link_tag = tds[1].find('a', href=True)
-                if link_tag and link_tag['href'].endswith('.pdf'):
-                    href = link_tag['href']
-                    clave = (titulo, href)
-                    if clave not in vistos:
-                        vistos.add(clave)
-                        total_documentos += 1
-                        
-                        # Evaluar relevancia con IA
-                        es_relevante, razon = evaluador_relevancia.evaluar_relevancia(titulo)
-                        es_lic = es_licitacion_publica(titulo)
-                        
-                        # Buscar sección actual
-                        seccion_encontrada = None
-                        tr_parent = tr.find_parent('table')
-                        if tr_parent:
-                            # Buscar hacia atrás en la tabla para encontrar la sección
-                            for prev in tr_parent.find_all_previous(['td', 'th']):
-                                texto_prev = prev.get_text(strip=True).upper()
-                                if texto_prev in [s.upper() for s in SECCIONES_VALIDAS]:
-                                    seccion_encontrada = texto_prev
-                                    break
-                        
-                        if not seccion_encontrada:
-                            seccion_encontrada = "NORMAS GENERALES"  # Default
-                        
-                        todas_las_publicaciones.append({
-                            "seccion": seccion_encontrada,
-                            "titulo": titulo,
-                            "url_pdf": href,
-                            "relevante": es_relevante,
-                            "es_licitacion": es_lic,
-                            "razon_relevancia": razon,
-                            "resumen": "",
-                            "es_sii": es_contenido_sii(titulo)
-                        })
+        
+        def agregar_filas(filas):
+            """Agrega las filas no vistas a todas_las_publicaciones y retorna cuántas eran nuevas"""
+            nonlocal total_documentos
+            nuevas = 0
+            for fila in filas:
+                clave = (fila.titulo, fila.url_pdf)
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+                nuevas += 1
+                total_documentos += 1
+                todas_las_publicaciones.append({
+                    "seccion": fila.seccion,
+                    "titulo": fila.titulo,
+                    "url_pdf": fila.url_pdf,
+                    "relevante": None,  # Se evalúa en lote más abajo
+                    "es_licitacion": es_licitacion_publica(fila.titulo),
+                    "razon_relevancia": None,
+                    "resumen": "",
+                    "es_sii": es_contenido_sii(fila.titulo)
+                })
+            return nuevas
+        
+        agregar_filas(parsear_sumario(html))
         
         # Procesar certificado de monedas
         for pub in todas_las_publicaciones:
             if "TIPOS DE CAMBIO" in pub['titulo'].upper() and "PARIDADES DE MONEDAS EXTRANJERAS" in pub['titulo'].upper():
-                texto_pdf = extraer_texto_pdf_mixto(pub['url_pdf'])
+                texto_pdf = extraer_texto_pdf_mixto(pub['url_pdf'], max_chars=None)
                 valores_monedas = extraer_valores_dolar_euro(texto_pdf)
                 break
         
@@ -657,138 +726,127 @@ def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
         licitaciones = []
         # --- EXTRAER NORMAS PARTICULARES ---
         if edition:
-            url_normas_part = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/normas_particulares.php?date={fecha}&edition={edition}"
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                resp_normas = requests.get(url_normas_part, headers=headers, timeout=30)
+                resp_normas = respuestas_paginas[1]
+                if isinstance(resp_normas, Exception):
+                    raise resp_normas
                 resp_normas.raise_for_status()
-                soup_normas = BeautifulSoup(resp_normas.text, "html.parser")
-                
                 print(f"[INFO] Procesando página de normas particulares")
-                
-                # Buscar todas las filas con contenido
-                normas_part_encontradas = 0
-                
-                for tr in soup_normas.find_all('tr', class_='content'):
-                    tds = tr.find_all('td')
-                    if len(tds) >= 2:
-                        titulo = tds[0].get_text(strip=True)
-                        titulo = re.sub(r"Ver PDF.*", "", titulo).strip()
-                        titulo = titulo.replace(' <span class="border dotted"></span>', '').strip()
-                        
-                        link_tag = tds[1].find('a', href=True)
-                        if link_tag and link_tag['href'].endswith('.pdf'):
-                            href = link_tag['href']
-                            clave = (titulo, href)
-                            if clave not in vistos:
-                                vistos.add(clave)
-                                normas_part_encontradas += 1
-                                total_documentos += 1  # Contar en el total
-                                
-                                # Evaluar relevancia con IA
-                                es_relevante, razon = evaluador_relevancia.evaluar_relevancia(titulo)
-                                es_lic = es_licitacion_publica(titulo)
-                                
-                                todas_las_publicaciones.append({
-                                    "seccion": "NORMAS PARTICULARES",
-                                    "titulo": titulo,
-                                    "url_pdf": href,
-                                    "relevante": es_relevante,
-                                    "es_licitacion": es_lic,
-                                    "razon_relevancia": razon,
-                                    "resumen": "",
-                                    "es_sii": es_contenido_sii(titulo)
-                                })
+                normas_part_encontradas = agregar_filas(
+                    parsear_sumario(resp_normas.text, seccion_por_defecto="NORMAS PARTICULARES")
+                )
                 
                 print(f"[INFO] Se encontraron {normas_part_encontradas} normas particulares")
                 
             except Exception as e:
+                completa = False
                 print(f"[WARNING] No se pudo extraer normas particulares: {e}")
         
         # Extraer avisos destacados de otras fuentes
         # --- EXTRAER AVISOS DESTACADOS DE LA PÁGINA DEDICADA ---
         if edition:
-            # La URL correcta incluye /edicionelectronica/
-            url_avisos = f"https://www.diariooficial.interior.gob.cl/edicionelectronica/avisos_destacados.php?date={fecha}&edition={edition}"
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                resp_avisos = requests.get(url_avisos, headers=headers, timeout=30)
+                resp_avisos = respuestas_paginas[2]
+                if isinstance(resp_avisos, Exception):
+                    raise resp_avisos
                 resp_avisos.raise_for_status()
-                soup_avisos = BeautifulSoup(resp_avisos.text, "html.parser")
-                
                 print(f"[INFO] Procesando página de avisos destacados")
-                
-                # Buscar todas las filas con contenido
-                filas_avisos = soup_avisos.find_all('tr')
-                avisos_encontrados = 0
-                
-                for fila in filas_avisos:
-                    texto_fila = fila.get_text(strip=True)
-                    enlaces = fila.find_all('a', href=True)
-                    
-                    for enlace in enlaces:
-                        if enlace['href'].endswith('.pdf'):
-                            # Extraer título (texto antes del enlace)
-                            titulo = texto_fila.replace('Ver PDF', '').replace(enlace.get_text(), '').strip()
-                            titulo = re.sub(r'\(CVE-\d+\).*', '', titulo).strip()
-                            
-                            if titulo:
-                                url_pdf = enlace['href']
-                                clave = (titulo, url_pdf)
-                                
-                                if clave not in vistos:
-                                    vistos.add(clave)
-                                    avisos_encontrados += 1
-                                    total_documentos += 1  # Contar avisos destacados en el total
-                                    
-                                    # Evaluar relevancia
-                                    es_relevante, razon = evaluador_relevancia.evaluar_relevancia(titulo)
-                                    es_lic = es_licitacion_publica(titulo)
-                                    
-                                    if es_relevante:
-                                        todas_las_publicaciones.append({
-                                            "seccion": "AVISOS DESTACADOS",
-                                            "titulo": titulo,
-                                            "url_pdf": url_pdf,
-                                            "relevante": es_relevante,
-                                            "es_licitacion": es_lic,
-                                            "razon_relevancia": razon,
-                                            "resumen": "",
-                                            "es_sii": es_contenido_sii(titulo)
-                                        })
-                                        
-                                        if es_lic:
-                                            print(f"[LICITACIÓN EN AVISOS] {titulo}")
-                                        else:
-                                            print(f"[AVISO RELEVANTE] {titulo}")
+                # Solo los avisos relevantes se conservan tras la evaluación en lote
+                avisos_encontrados = agregar_filas(parsear_avisos_destacados(resp_avisos.text))
                 
                 print(f"[INFO] Se encontraron {avisos_encontrados} avisos destacados")
                 
             except Exception as e:
+                completa = False
                 print(f"[WARNING] No se pudo extraer avisos destacados: {e}")
         
+        # Publicaciones de esta edición ya procesadas en una corrida anterior (con el mismo título)
+        ya_procesadas = publication_store.get_vigentes(edition, todas_las_publicaciones) if edition else {}
+        nuevas = []
+        for pub in todas_las_publicaciones:
+            estado = ya_procesadas.get(publication_store.clave(pub['url_pdf']))
+            if estado:
+                pub['relevante'] = estado['relevante']
+                pub['razon_relevancia'] = estado['razon_relevancia']
+            else:
+                nuevas.append(pub)
+        if ya_procesadas:
+            print(f"[INFO] {len(ya_procesadas)} publicaciones ya procesadas, {len(nuevas)} nuevas o modificadas")
+        
+        # Evaluar la relevancia de las publicaciones nuevas en lote (pocas llamadas a la IA en vez de una por título)
+        inicio_evaluacion = time.time()
+        veredictos = evaluador_relevancia.evaluar_lote([p['titulo'] for p in nuevas])
+        # Los veredictos por reglas (IA caída o sin respuesta) no se guardan: se reintentan
+        por_reglas = evaluador_relevancia.titulos_por_reglas()
+        for pub, (es_relevante, razon) in zip(nuevas, veredictos):
+            pub['relevante'] = es_relevante
+            pub['razon_relevancia'] = razon
+            # Las relevantes se guardan al terminar su PDF; las demás ya están completas
+            if edition and not es_relevante and pub['titulo'] not in por_reglas:
+                publication_store.set(edition, pub)
+        print(f"[INFO] Relevancia de {len(nuevas)} títulos evaluada en {time.time() - inicio_evaluacion:.2f}s")
+        
+        # Los avisos destacados no relevantes se descartan, igual que antes
+        publicaciones_evaluadas = []
+        for pub in todas_las_publicaciones:
+            if pub['seccion'] == "AVISOS DESTACADOS":
+                if not pub['relevante']:
+                    continue
+                if pub['es_licitacion']:
+                    print(f"[LICITACIÓN EN AVISOS] {pub['titulo']}")
+                else:
+                    print(f"[AVISO RELEVANTE] {pub['titulo']}")
+            publicaciones_evaluadas.append(pub)
+        todas_las_publicaciones = publicaciones_evaluadas
+        
         # Ahora separar todas las publicaciones (incluyendo avisos destacados)
         publicaciones_relevantes = [p for p in todas_las_publicaciones if p['relevante']]
         no_relevantes = [p for p in todas_las_publicaciones if not p['relevante']]
         licitaciones = [p for p in publicaciones_relevantes if p.get('es_licitacion', False)]
         
-        # Procesar todas las publicaciones relevantes
+        # Procesar las publicaciones relevantes pendientes en paralelo (descarga, extracción y resumen).
+        # El rate limiter por dominio es compartido entre workers y los resultados mantienen el orden original.
+        # Cada resultado definitivo se guarda apenas termina: si la corrida falla, la siguiente
+        # retoma desde ahí. Los fallidos (sin texto, sin resumen o sin IA) se reintentan.
+        def procesar_y_guardar(pub):
+            procesado = procesar_publicacion_relevante(pub)
+            if edition and procesado.get('definitivo') and pub['titulo'] not in por_reglas:
+                publication_store.set(edition, pub, procesado)
+            return procesado
+        
         sumario = []
+        pendientes = []
+        resultados_pdf = {}
         for pub in publicaciones_relevantes:
-            texto_pdf = extraer_texto_pdf_mixto(pub['url_pdf'])
-            
-            # Re-evaluar relevancia con el contenido del PDF para mayor precisión
-            if texto_pdf and len(texto_pdf) > 100:
-                es_relevante_final, razon_final = evaluador_relevancia.evaluar_relevancia(pub['titulo'], texto_pdf)
-                if not es_relevante_final:
-                    print(f"[DESCARTADA] {pub['titulo']} - {razon_final}")
-                    continue
-            
-            pub['resumen'] = generar_resumen_desde_texto(texto_pdf, pub['titulo'])
+            estado = ya_procesadas.get(publication_store.clave(pub['url_pdf']))
+            if estado and estado.get('procesado'):
+                resultados_pdf[id(pub)] = {'item': pub, 'resultado': estado['procesado'], 'error': None, 'reutilizado': True}
+            else:
+                pendientes.append(pub)
+        for res in ejecutar_en_paralelo(procesar_y_guardar, pendientes, max_workers=max_workers or PDF_WORKERS, nombre='PDF'):
+            resultados_pdf[id(res['item'])] = res
+        
+        for pub in publicaciones_relevantes:
+            res = resultados_pdf[id(pub)]
+            if res['error'] is not None:
+                completa = False
+                print(f"[WARNING] Error procesando {pub['titulo']}: {res['error']}")
+                continue
+
+            procesado = res['resultado']
+            if not res.get('reutilizado') and not procesado.get('definitivo'):
+                completa = False
+            if res.get('reutilizado'):
+                print(f"[PDF] {pub['titulo'][:80]} - ya procesada en una corrida anterior")
+            else:
+                tiempos = procesado['tiempos']
+                print(f"[PDF] {pub['titulo'][:80]} - extracción {tiempos['extraccion']:.2f}s, total {tiempos['total']:.2f}s")
+
+            if not procesado['incluir']:
+                print(f"[DESCARTADA] {pub['titulo']} - {procesado['razon']}")
+                continue
+
+            pub['resumen'] = procesado['resumen']
             sumario.append(pub)
             
             # Log de publicaciones incluidas
@@ -817,7 +875,9 @@ def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
             # Si encontramos alguna candidata razonable, incluirla
             if mejor_candidata:
                 texto_pdf = extraer_texto_pdf_mixto(mejor_candidata['url_pdf'])
-                mejor_candidata['resumen'] = generar_resumen_desde_texto(texto_pdf, mejor_candidata['titulo'])
+                mejor_candidata['resumen'] = generar_resumen_desde_texto(texto_pdf, mejor_candidata['titulo'], url=mejor_candidata['url_pdf'])
+                if mejor_candidata['resumen'] in RESUMENES_FALLIDOS:
+                    completa = False
                 sumario.append(mejor_candidata)
                 print(f"[ÚNICA PUBLICACIÓN] {mejor_candidata['titulo']}")
         
@@ -827,6 +887,13 @@ def obtener_sumario_diario_oficial(fecha=None, force_refresh=False):
         
         resultado = {"publicaciones": sumario, "valores_monedas": valores_monedas, "total_documentos": total_documentos}
         cache_service.set_scraping_result(fecha_cache, resultado)
+        if completa:
+            publication_archive.guardar_edicion(fecha_cache.date(), edition, todas_las_publicaciones, sumario,
+                                                total_documentos, valores_monedas)
+        # Los validadores se guardan después del resultado que corresponde a estas páginas
+        for url_pagina, r in zip(urls_paginas, respuestas_paginas):
+            if not isinstance(r, Exception) and r.status_code == 200:
+                cache_service.set_validadores(url_pagina, http_client.validadores(r))
         return resultado
     except Exception as e:
         pass  # Enviar alerta solo a soporte interno, nunca a clientes
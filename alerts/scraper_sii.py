@@ -9,7 +9,6 @@ Este módulo contiene las funciones para extraer:
 """
 
 # ==================== IMPORTACIONES ====================
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
@@ -27,7 +26,6 @@ try:
         django.setup()
     from alerts.services.cache_service import cache_service
     from alerts.utils.rate_limiter import rate_limited
-    from alerts.utils.retry_utils import retry
 except ImportError:
     # Fallback si Django no está disponible
     def rate_limited(func):
@@ -35,20 +33,8 @@ except ImportError:
             time.sleep(1)  # Simple rate limiting
             return func(*args, **kwargs)
         return wrapper
-    
-    def retry(max_retries=3, backoff_factor=2):
-        def decorator(func):
-            def wrapper(*args, **kwargs):
-                for i in range(max_retries):
-                    try:
-                        return func(*args, **kwargs)
-                    except Exception as e:
-                        if i == max_retries - 1:
-                            raise
-                        time.sleep(backoff_factor ** i)
-                return func(*args, **kwargs)
-            return wrapper
-        return decorator
+
+from alerts.utils import http_client
 
 # ==================== CONSTANTES ====================
 BASE_URL_SII = "https://www.sii.cl"
@@ -171,7 +157,6 @@ def mejorar_descripcion_tributaria(descripcion, tipo_documento):
 # ==================== FUNCIONES DE SCRAPING ====================
 
 @rate_limited
-@retry(max_retries=3, backoff_factor=2)
 def obtener_circulares_sii(year=None):
     """
     Obtiene las circulares del SII para un año específico
@@ -188,7 +173,7 @@ def obtener_circulares_sii(year=None):
     url = f"{BASE_URL_SII}/normativa_legislacion/circulares/{year}/indcir{year}.htm"
     
     try:
-        response = requests.get(url, timeout=30)
+        response = http_client.get(url, timeout=30)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -283,7 +268,6 @@ def obtener_circulares_sii(year=None):
         return []
 
 @rate_limited
-@retry(max_retries=3, backoff_factor=2)
 def obtener_resoluciones_exentas_sii(year=None):
     """
     Obtiene las resoluciones exentas del SII para un año específico
@@ -300,7 +284,7 @@ def obtener_resoluciones_exentas_sii(year=None):
     url = f"{BASE_URL_SII}/normativa_legislacion/resoluciones/{year}/res_ind{year}.htm"
     
     try:
-        response = requests.get(url, timeout=30)
+        response = http_client.get(url, timeout=30)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
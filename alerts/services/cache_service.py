@@ -3,6 +3,7 @@ Servicio de caché para optimizar el scraping del Diario Oficial
 """
 import hashlib
 import json
+import zlib
 from datetime import datetime, timedelta
 from typing import Optional, Any, Dict
 from django.core.cache import cache
@@ -20,6 +21,10 @@ class CacheService:
     SCRAPING_RESULT_CACHE_TIME = 86400  # 24 horas para resultados de scraping
     API_RESPONSE_CACHE_TIME = 3600  # 1 hora para respuestas de API
     
+    # Los PDFs se guardan comprimidos con este prefijo para distinguirlos de entradas antiguas
+    PREFIJO_COMPRIMIDO = b'zlib:'
+    NIVEL_COMPRESION = 6
+    
     @staticmethod
     def _generate_key(prefix: str, identifier: str) -> str:
         """Genera una clave única para el caché"""
@@ -36,13 +41,20 @@ class CacheService:
         content = cache.get(key)
         if content:
             logger.info(f"PDF encontrado en caché: {url}")
+            if content.startswith(self.PREFIJO_COMPRIMIDO):
+                content = zlib.decompress(content[len(self.PREFIJO_COMPRIMIDO):])
         return content
     
     def set_pdf_content(self, url: str, content: bytes) -> None:
-        """Guarda el contenido de un PDF en el caché"""
+        """Guarda el contenido de un PDF en el caché, comprimido si eso reduce su tamaño"""
         key = self._generate_key("pdf", self._hash_url(url))
+        comprimido = self.PREFIJO_COMPRIMIDO + zlib.compress(content, self.NIVEL_COMPRESION)
+        if len(comprimido) < len(content):
+            logger.info(f"PDF guardado en caché: {url} ({len(content)} -> {len(comprimido)} bytes)")
+            content = comprimido
+        else:
+            logger.info(f"PDF guardado en caché: {url}")
         cache.set(key, content, self.PDF_CACHE_TIME)
-        logger.info(f"PDF guardado en caché: {url}")
     
     def get_scraping_result(self, date: datetime) -> Optional[Dict[str, Any]]:
         """Obtiene los resultados del scraping para una fecha específica"""
@@ -78,6 +90,14 @@ class CacheService:
         cache.set(key, response, self.API_RESPONSE_CACHE_TIME)
         logger.info(f"Respuesta API guardada en caché: {endpoint}")
     
+    def get_validadores(self, url: str) -> Optional[Dict[str, Any]]:
+        """Obtiene los validadores HTTP (ETag, Last-Modified, SHA-256) guardados para una URL"""
+        return cache.get(self._generate_key("validadores", self._hash_url(url)))
+    
+    def set_validadores(self, url: str, validadores: Dict[str, Any]) -> None:
+        """Guarda los validadores HTTP de una URL, con la misma duración que los resultados de scraping"""
+        cache.set(self._generate_key("validadores", self._hash_url(url)), validadores, self.SCRAPING_RESULT_CACHE_TIME)
+    
     def invalidate_scraping_cache(self, date: datetime) -> None:
         """Invalida el caché de scraping para una fecha específica"""
         date_str = date.strftime("%Y-%m-%d")
@@ -94,9 +114,11 @@ class CacheService:
         return value
     
     def clear_old_cache(self) -> None:
-        """Limpia entradas antiguas del caché (se puede llamar desde una tarea periódica)"""
-        # Django Redis maneja la expiración automáticamente,
-        # pero podemos implementar lógica adicional si es necesario
+        """
+        Limpieza periódica del caché. No hay nada que recorrer: Redis expira las claves
+        por sí solo y el caché en disco borra los archivos vencidos al leerlos y descarta
+        entradas al guardar cuando supera MAX_ENTRIES.
+        """
         logger.info("Limpieza de caché ejecutada")
 
 
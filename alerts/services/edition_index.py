@@ -0,0 +1,97 @@
+"""
+Índice fecha -> número de edición del Diario Oficial en la base de datos
+"""
+import logging
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class EditionIndex:
+    """
+    Guarda las ediciones detectadas en el modelo Edicion. Las escrituras son upserts
+    atómicos (INSERT ... ON CONFLICT) sobre la fecha, y la referencia anterior más
+    cercana para estimar una edición se obtiene con una consulta por rango sobre el
+    índice de la fecha en vez de recorrer todas las entradas.
+    """
+
+    def get(self, fecha: date) -> Optional[str]:
+        """Número de edición de la fecha, o None si no está registrada"""
+        from alerts.models import Edicion
+        try:
+            numero = Edicion.objects.filter(fecha=fecha).values_list('numero', flat=True).first()
+        except Exception as e:
+            logger.warning(f"No se pudo leer el índice de ediciones: {str(e)}")
+            return None
+        return str(numero) if numero is not None else None
+
+    def referencia_anterior(self, fecha: date) -> Optional[Tuple[date, int]]:
+        """(fecha, número) de la edición registrada más cercana en o antes de la fecha"""
+        from alerts.models import Edicion
+        try:
+            return (Edicion.objects.filter(fecha__lte=fecha, numero__isnull=False).order_by('-fecha')
+                    .values_list('fecha', 'numero').first())
+        except Exception as e:
+            logger.warning(f"No se pudo leer el índice de ediciones: {str(e)}")
+            return None
+
+    def registrar(self, fecha: date, numero, origen: str = 'sitio') -> bool:
+        """
+        Registra la edición leída del sitio para la fecha. El sitio manda: si el número
+        estaba asignado a otra fecha, esa entrada queda sin número (se vuelve a detectar
+        cuando se pida). No se elimina, para conservar sus publicaciones archivadas.
+        """
+        from alerts.models import Edicion
+        try:
+            with transaction.atomic():
+                anteriores = Edicion.objects.filter(numero=int(numero)).exclude(fecha=fecha)
+                for fecha_anterior in anteriores.values_list('fecha', flat=True):
+                    logger.warning(f"Edición {numero} estaba asignada a {fecha_anterior:%d-%m-%Y}; "
+                                   f"se reasigna a {fecha:%d-%m-%Y}")
+                anteriores.update(numero=None)
+                self._upsert([Edicion(fecha=fecha, numero=int(numero), origen=origen)])
+            return True
+        except Exception as e:
+            logger.warning(f"No se pudo registrar la edición {numero}: {str(e)}")
+            return False
+
+    def registrar_varios(self, ediciones: Dict[date, int], origen: str = 'archivo') -> int:
+        """
+        Carga masiva de ediciones en una transacción. Las fechas ya registradas se
+        actualizan; un número repetido (en la carga o asignado a otra fecha) se omite
+        y se conserva la primera fecha. Retorna cuántas ediciones se guardaron.
+        """
+        from alerts.models import Edicion
+        try:
+            with transaction.atomic():
+                usados = dict(Edicion.objects.filter(numero__in=[int(n) for n in ediciones.values()])
+                              .values_list('numero', 'fecha'))
+                registros = []
+                for fecha, numero in sorted(ediciones.items()):
+                    numero = int(numero)
+                    if usados.setdefault(numero, fecha) != fecha:
+                        logger.warning(f"Edición {numero} de {fecha:%d-%m-%Y} omitida: ya está asignada "
+                                       f"a {usados[numero]:%d-%m-%Y}")
+                        continue
+                    registros.append(Edicion(fecha=fecha, numero=numero, origen=origen))
+                self._upsert(registros)
+            return len(registros)
+        except Exception as e:
+            logger.warning(f"No se pudo hacer la carga masiva de ediciones: {str(e)}")
+            return 0
+
+    def _upsert(self, registros) -> None:
+        from alerts.models import Edicion
+        Edicion.objects.bulk_create(
+            registros,
+            update_conflicts=True,
+            unique_fields=['fecha'],
+            update_fields=['numero', 'origen', 'fecha_actualizacion'],
+        )
+
+
+# Instancia global del servicio
+edition_index = EditionIndex()
@@ -0,0 +1,106 @@
+"""
+Ingreso masivo de hechos esenciales de la CMF
+"""
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from django.db import transaction
+from django.db.models import Max
+
+from alerts.cmf_criterios_profesionales import EMPRESAS_IPSA
+from alerts.services.search_index import search_index
+
+logger = logging.getLogger(__name__)
+
+_EMPRESAS_IPSA = frozenset(e.upper() for e in EMPRESAS_IPSA)
+
+
+class RegistroHechos(NamedTuple):
+    """Hechos del scraping como filas de HechoEsencial, con si se acaban de crear"""
+    hechos: List[Tuple[Any, bool]]
+    empresas_nuevas: List[str]
+
+
+class HechoStore:
+    """
+    Guarda los hechos de una ejecución del scraper con un número constante de
+    consultas: las empresas y hechos existentes se cargan con una consulta cada uno,
+    los que faltan se crean con bulk_create (omitiendo los que creó otra ejecución) y los campos calculados (resumen y
+    relevancia) se escriben al final con un solo bulk_update.
+    """
+
+    CAMPOS_CALCULADOS = ['resumen', 'relevancia', 'relevancia_profesional', 'categoria', 'es_empresa_ipsa']
+    TAMANO_LOTE = 500
+
+    def registrar(self, hechos: Iterable[Dict[str, Any]]) -> RegistroHechos:
+        """
+        Crea las empresas y hechos ({fecha, empresa, titulo, url}) que no existen.
+        Retorna los hechos en el orden recibido, sin URLs repetidas.
+        """
+        from alerts.models import Empresa, HechoEsencial
+
+        por_url = {}
+        for hecho in hechos:
+            por_url.setdefault(hecho['url'], hecho)
+        nombres = {hecho['empresa'] for hecho in por_url.values()}
+
+        with transaction.atomic():
+            empresas = Empresa.objects.in_bulk(nombres, field_name='nombre')
+            empresas_nuevas = sorted(nombres - set(empresas))
+            if empresas_nuevas:
+                Empresa.objects.bulk_create(
+                    [Empresa(nombre=nombre, es_ipsa=nombre.upper() in _EMPRESAS_IPSA) for nombre in empresas_nuevas],
+                    batch_size=self.TAMANO_LOTE,
+                    ignore_conflicts=True,
+                )
+                # ignore_conflicts no retorna ids: se vuelven a leer (incluye las que creó otra ejecución)
+                empresas = Empresa.objects.in_bulk(nombres, field_name='nombre')
+
+            existentes = HechoEsencial.objects.select_related('empresa').in_bulk(list(por_url), field_name='url')
+            nuevos = {
+                url: HechoEsencial(
+                    empresa=empresas[hecho['empresa']],
+                    titulo=hecho['titulo'],
+                    url=url,
+                    fecha_publicacion=hecho['fecha'],
+                    es_empresa_ipsa=empresas[hecho['empresa']].es_ipsa,
+                )
+                for url, hecho in por_url.items() if url not in existentes
+            }
+            creados = set()
+            if nuevos:
+                # Otra ejecución puede insertar alguna de estas URLs después de la lectura:
+                # se omite en vez de abortar el lote y, como ignore_conflicts no retorna ids,
+                # se vuelven a leer. Son de esta ejecución solo las filas con id posterior
+                # al último que había antes de insertar.
+                ultimo = HechoEsencial.objects.aggregate(ultimo=Max('pk'))['ultimo'] or 0
+                HechoEsencial.objects.bulk_create(list(nuevos.values()), batch_size=self.TAMANO_LOTE,
+                                                  ignore_conflicts=True)
+                recargados = HechoEsencial.objects.select_related('empresa').in_bulk(list(nuevos), field_name='url')
+                creados = {url for url, h in recargados.items() if h.pk > ultimo}
+                existentes.update(recargados)
+
+        logger.info(f"Hechos esenciales: {len(creados)} nuevos de {len(por_url)}, "
+                    f"{len(empresas_nuevas)} empresas nuevas")
+        return RegistroHechos([(existentes[url], url in creados) for url in por_url], empresas_nuevas)
+
+    def guardar_calculados(self, hechos: List[Any]) -> int:
+        """
+        Escribe el resumen y la relevancia de los hechos procesados y los indexa para
+        la búsqueda (bulk_update no envía post_save). Retorna cuántos se guardaron.
+        """
+        from alerts.models import HechoEsencial
+        if not hechos:
+            return 0
+        try:
+            with transaction.atomic():
+                HechoEsencial.objects.bulk_update(hechos, self.CAMPOS_CALCULADOS, batch_size=self.TAMANO_LOTE)
+        except Exception as e:
+            logger.warning(f"No se pudieron guardar los hechos procesados: {str(e)}")
+            return 0
+        search_index.indexar(search_index.documento_hecho(h) for h in hechos)
+        return len(hechos)
+
+
+# Instancia global del servicio
+hecho_store = HechoStore()
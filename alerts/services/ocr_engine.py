@@ -0,0 +1,207 @@
+"""
+Motor de OCR que reparte las páginas de los PDFs escaneados entre varios procesos
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import pytesseract
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Procesos de OCR en paralelo (por defecto, uno por núcleo)
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', str(os.cpu_count() or 1)))
+# Segundos de CPU que puede consumir el OCR en una edición; al agotarse se deja de hacer OCR
+OCR_PRESUPUESTO_CPU = float(os.environ.get('OCR_PRESUPUESTO_CPU', '900'))
+# Resolución única de rasterizado, compartida por el OCR básico y el mejorado
+OCR_DPI = 300
+
+CONFIG_OCR_MEJORADO = r'--oem 3 --psm 6'
+
+
+class PresupuestoOCRAgotado(Exception):
+    """Se consumió el presupuesto de CPU de OCR de la edición en curso"""
+    pass
+
+
+def preprocesar_imagen(image: Image) -> Image:
+    """Preprocesa una imagen para mejorar la calidad del OCR"""
+    import cv2
+    import numpy as np
+
+    # Convertir PIL Image a numpy array
+    img_array = np.array(image)
+
+    # Convertir a escala de grises si es necesario
+    if len(img_array.shape) == 3:
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = img_array
+
+    # Aplicar threshold para mejorar contraste
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # Eliminar ruido
+    denoised = cv2.medianBlur(thresh, 3)
+
+    # Convertir de vuelta a PIL Image
+    return Image.fromarray(denoised)
+
+
+def _tiempo_cpu_proceso() -> float:
+    """CPU consumida por este proceso y sus hijos terminados (Tesseract corre como subproceso)"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _contexto_procesos():
+    """
+    Contexto de multiprocessing del pool. Los trabajadores no se crean con fork: el
+    proceso principal tiene otros hilos (PDFs, hechos) y un fork copiaría sus locks
+    tomados. Se usa forkserver donde existe y si no spawn.
+    """
+    metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(metodo)
+
+
+def _inicializar_trabajador():
+    # Con varias páginas en paralelo, los hilos internos de Tesseract solo compiten entre sí
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _tesseract(image: Image, mejorado: bool) -> str:
+    if mejorado:
+        return pytesseract.image_to_string(preprocesar_imagen(image), lang='spa', config=CONFIG_OCR_MEJORADO)
+    return pytesseract.image_to_string(image, lang='spa')
+
+
+def reconocer_pagina(image: Image, mejorado: bool = False) -> Tuple[str, float]:
+    """
+    Aplica OCR a una página en el proceso actual. Retorna (texto, segundos de OCR).
+
+    Los contadores de CPU del proceso también suman los demás hilos y subprocesos
+    (descargas, pdftoppm) y la CPU del hilo no incluye a Tesseract, que corre como
+    subproceso. Por eso se cuenta el tiempo de reloj de la página: no depende de
+    otras tareas y, con Tesseract en un solo hilo, es una cota superior de su CPU.
+    """
+    inicio = time.perf_counter()
+    texto = _tesseract(image, mejorado)
+    return texto, time.perf_counter() - inicio
+
+
+def _reconocer_pagina_en_trabajador(image: Image, mejorado: bool) -> Tuple[str, float]:
+    """
+    OCR de una página dentro del pool. Cada trabajador es un proceso de un solo hilo
+    que atiende una página a la vez, así que su CPU y la de sus hijos es exactamente
+    la de esta página. Algunas excepciones de pytesseract no se pueden serializar y
+    dejarían el pool inutilizable, por eso se re-lanzan como RuntimeError.
+    """
+    try:
+        inicio = _tiempo_cpu_proceso()
+        texto = _tesseract(image, mejorado)
+        return texto, _tiempo_cpu_proceso() - inicio
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+class OCREngine:
+    """
+    Ejecuta el OCR de las páginas en un pool de procesos compartido y lleva la cuenta
+    de la CPU consumida contra un presupuesto por edición (reiniciar_presupuesto()).
+    Con un solo trabajador el OCR se hace en el mismo proceso.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, presupuesto_cpu: Optional[float] = None):
+        self.max_workers = max(1, max_workers or OCR_WORKERS)
+        self.presupuesto_cpu = presupuesto_cpu if presupuesto_cpu is not None else OCR_PRESUPUESTO_CPU
+        self.cpu_usado = 0.0
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_contexto_procesos(),
+                                                 initializer=_inicializar_trabajador)
+            return self._pool
+
+    def reiniciar_presupuesto(self, presupuesto_cpu: Optional[float] = None) -> None:
+        """Comienza una edición nueva: pone en cero la CPU consumida"""
+        with self._lock:
+            if presupuesto_cpu is not None:
+                self.presupuesto_cpu = presupuesto_cpu
+            self.cpu_usado = 0.0
+
+    def _registrar(self, segundos: float) -> bool:
+        """Suma CPU consumida. Retorna False si con ello se agotó el presupuesto."""
+        with self._lock:
+            self.cpu_usado += segundos
+            return self.cpu_usado < self.presupuesto_cpu
+
+    def _verificar_presupuesto(self) -> None:
+        if self.cpu_usado >= self.presupuesto_cpu:
+            raise PresupuestoOCRAgotado(
+                f"Presupuesto de OCR agotado ({self.cpu_usado:.1f}s de {self.presupuesto_cpu:.0f}s de CPU)"
+            )
+
+    def reconocer(self, images: List[Image.Image], mejorado: bool = False) -> List[str]:
+        """
+        Aplica OCR a las páginas y retorna sus textos en orden.
+        Lanza PresupuestoOCRAgotado si la edición ya no tiene CPU disponible;
+        las páginas pendientes se cancelan.
+        """
+        self._verificar_presupuesto()
+        if self.max_workers == 1 or len(images) == 1:
+            return self._reconocer_en_proceso(images, mejorado)
+
+        inicio = time.time()
+        textos = [''] * len(images)
+        futuros = {
+            self._obtener_pool().submit(_reconocer_pagina_en_trabajador, image, mejorado): i
+            for i, image in enumerate(images)
+        }
+        try:
+            for futuro in as_completed(futuros):
+                texto, cpu = futuro.result()
+                textos[futuros[futuro]] = texto
+                if not self._registrar(cpu):
+                    self._verificar_presupuesto()
+        except BrokenProcessPool:
+            # Un trabajador murió (p. ej. por falta de memoria): el próximo OCR crea un pool nuevo
+            self.cerrar()
+            raise
+        except BaseException:
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+
+        logger.info(f"OCR de {len(images)} páginas en {time.time() - inicio:.1f}s "
+                    f"({self.cpu_usado:.1f}s de CPU usados en la edición)")
+        return textos
+
+    def _reconocer_en_proceso(self, images: List[Image.Image], mejorado: bool) -> List[str]:
+        textos = []
+        for i, image in enumerate(images):
+            logger.info(f"Procesando página {i+1} con OCR{' mejorado' if mejorado else ''}")
+            texto, cpu = reconocer_pagina(image, mejorado)
+            textos.append(texto)
+            if not self._registrar(cpu) and i + 1 < len(images):
+                self._verificar_presupuesto()
+        return textos
+
+    def cerrar(self) -> None:
+        """Termina los procesos del pool"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# Instancia global del motor
+ocr_engine = OCREngine()
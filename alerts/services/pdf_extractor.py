@@ -1,62 +1,285 @@
 """
 Servicio mejorado para extracción de texto de PDFs con múltiples métodos de fallback
 """
+import hashlib
+import io
 import logging
+import mmap
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from io import BytesIO
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional, Union
 import PyPDF2
+from pdfminer.converter import TextConverter
 from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfparser import PDFParser
 from pdfminer.pdfdocument import PDFDocument
 from pdf2image import convert_from_bytes
-import pytesseract
 from PIL import Image
 import requests
 
+from alerts.services.ocr_engine import OCR_DPI, PresupuestoOCRAgotado, ocr_engine as ocr_engine_global, preprocesar_imagen
+
 logger = logging.getLogger(__name__)
 
+# Contenido de un PDF: bytes o un mmap de solo lectura (ver alerts.services.pdf_store)
+PDFBuffer = Union[bytes, mmap.mmap]
+
+
+class _LectorMmap(io.RawIOBase):
+    """
+    Archivo de solo lectura sobre un mmap. Solo se copian los fragmentos que pide
+    cada lectura, nunca el PDF completo; cerrar el lector no cierra el mmap.
+    """
+
+    def __init__(self, buffer: mmap.mmap):
+        self._buffer = buffer
+        self._posicion = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, destino) -> int:
+        n = max(0, min(len(destino), len(self._buffer) - self._posicion))
+        destino[:n] = self._buffer[self._posicion:self._posicion + n]
+        self._posicion += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._posicion
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._posicion = max(0, offset)
+        return self._posicion
+
+    def tell(self) -> int:
+        return self._posicion
+
+
+@contextmanager
+def _como_stream(pdf_content: PDFBuffer):
+    """Entrega el PDF como archivo legible; un mmap se lee en su lugar, sin copiarlo entero"""
+    if isinstance(pdf_content, mmap.mmap):
+        with _LectorMmap(pdf_content) as pdf_file:
+            yield pdf_file
+    else:
+        with BytesIO(pdf_content) as pdf_file:
+            yield pdf_file
+
+
+# Caracteres que no son letras, dígitos ni espacios (equivale a "not (isalnum() or isspace())")
+_RE_NO_ALFANUMERICO = re.compile(r'[^\w\s]|_')
+# Operadores que muestran texto en un content stream
+_RE_OPERADOR_TEXTO = re.compile(rb'(?<![A-Za-z])(?:Tj|TJ)(?![A-Za-z])')
+
+# Métodos que leen la capa de texto del PDF y métodos de OCR
+METODOS_TEXTO = ('pypdf2', 'pdfminer')
+METODOS_OCR = ('ocr', 'ocr_enhanced')
+
+
+def _como_bytes(pdf_content: PDFBuffer) -> bytes:
+    """Retorna el PDF como bytes (necesario para pdf2image)"""
+    return pdf_content if isinstance(pdf_content, bytes) else pdf_content[:]
+
 
 class PDFExtractor:
     """Extractor robusto de texto de PDFs con múltiples métodos de fallback"""
     
-    def __init__(self):
+    def __init__(self, text_cache=None, ocr_engine=None):
+        """
+        Args:
+            text_cache: Caché opcional con get(sha256, max_pages, max_chars) y
+                set(sha256, max_pages, max_chars, texto, metodo, duracion), p. ej.
+                alerts.services.text_cache.ExtractedTextCache
+            ocr_engine: Motor de OCR (por defecto el pool compartido de alerts.services.ocr_engine)
+        """
+        self.text_cache = text_cache
+        self.ocr_engine = ocr_engine or ocr_engine_global
+        # Imágenes rasterizadas de la extracción en curso (una por hilo)
+        self._paginas = threading.local()
+        # Cuántos documentos se enviaron por cada ruta (ver _clasificar_pdf)
+        self.rutas = Counter()
+        self._lock_rutas = threading.Lock()
         self.methods_priority = [
             ('pypdf2', self._extract_with_pypdf2),
             ('pdfminer', self._extract_with_pdfminer),
             ('ocr', self._extract_with_ocr),
             ('ocr_enhanced', self._extract_with_enhanced_ocr)
         ]
+        # Generadores página a página de cada método (ver iter_pages)
+        self.paginadores = {
+            'pypdf2': self._paginas_pypdf2,
+            'pdfminer': self._paginas_pdfminer,
+            'ocr': self._paginas_ocr,
+            'ocr_enhanced': lambda pdf_content, max_pages: self._paginas_ocr(pdf_content, max_pages, mejorado=True),
+        }
     
-    def extract_text(self, pdf_content: bytes, max_pages: int = 2) -> Tuple[str, str]:
+    def extract_text(self, pdf_content: PDFBuffer, max_pages: int = 2,
+                     max_chars: Optional[int] = None) -> Tuple[str, str]:
         """
         Extrae texto de un PDF usando múltiples métodos con fallback automático.
         
         Args:
-            pdf_content: Contenido del PDF en bytes
+            pdf_content: Contenido del PDF en bytes o como mmap
             max_pages: Número máximo de páginas a procesar
+            max_chars: Si se indica, se deja de procesar páginas apenas se reúne esa
+                cantidad de caracteres (el texto puede excederla hasta en una página)
             
         Returns:
             Tupla (texto_extraido, metodo_usado)
         """
-        for method_name, method_func in self.methods_priority:
-            try:
-                logger.info(f"Intentando extracción con método: {method_name}")
-                text = method_func(pdf_content, max_pages)
-                
-                # Validar que el texto extraído sea útil
-                if self._is_valid_text(text):
-                    logger.info(f"Extracción exitosa con método: {method_name}")
-                    return text, method_name
-                else:
-                    logger.warning(f"Texto extraído con {method_name} no es válido, intentando siguiente método")
+        if self.text_cache is None:
+            return self._extract_text(pdf_content, max_pages, max_chars)
+        
+        sha256 = hashlib.sha256(pdf_content).hexdigest()
+        en_cache = self.text_cache.get(sha256, max_pages, max_chars)
+        if en_cache:
+            return en_cache
+        
+        inicio = time.time()
+        text, method_name = self._extract_text(pdf_content, max_pages, max_chars)
+        # Los fallos no se guardan: pueden ser transitorios (p. ej. Tesseract no disponible)
+        if method_name != "failed":
+            self.text_cache.set(sha256, max_pages, max_chars, text, method_name, time.time() - inicio)
+        return text, method_name
+    
+    def iter_pages(self, pdf_content: PDFBuffer, max_pages: int = 2,
+                   method: Optional[str] = None) -> Iterator[str]:
+        """
+        Genera el texto de cada página a medida que se extrae. Si quien consume el
+        generador se detiene, las páginas restantes no se procesan.
+        
+        Args:
+            pdf_content: Contenido del PDF en bytes o como mmap
+            max_pages: Número máximo de páginas a procesar
+            method: 'pypdf2', 'pdfminer', 'ocr' u 'ocr_enhanced'. Por defecto OCR
+                para PDFs escaneados y PyPDF2 para el resto.
+        """
+        if method is None:
+            method = 'ocr' if self._clasificar_pdf(pdf_content, max_pages) == 'escaneado' else 'pypdf2'
+        return self.paginadores[method](pdf_content, max_pages)
+    
+    def _leer_paginas(self, paginas: Iterator[str], max_chars: Optional[int] = None) -> str:
+        """Une las páginas de un generador, deteniéndolo al alcanzar max_chars"""
+        textos = []
+        total = 0
+        try:
+            for page_text in paginas:
+                if page_text:
+                    textos.append(page_text)
+                    total += len(page_text)
+                if max_chars and total >= max_chars:
+                    break
+        finally:
+            paginas.close()
+        return "\n".join(textos).strip()
+    
+    def _extract_text(self, pdf_content: PDFBuffer, max_pages: int,
+                      max_chars: Optional[int] = None) -> Tuple[str, str]:
+        """Prueba los métodos de extracción que corresponden a la estructura del PDF"""
+        ruta = self._clasificar_pdf(pdf_content, max_pages)
+        with self._lock_rutas:
+            self.rutas[ruta] += 1
+        if ruta == 'texto':
+            metodos = [m for m in self.methods_priority if m[0] in METODOS_TEXTO]
+        elif ruta == 'escaneado':
+            metodos = [m for m in self.methods_priority if m[0] in METODOS_OCR]
+        else:
+            metodos = self.methods_priority
+        logger.info(f"Ruta de extracción: {ruta} ({', '.join(m[0] for m in metodos)})")
+        
+        try:
+            for method_name, method_func in metodos:
+                try:
+                    logger.info(f"Intentando extracción con método: {method_name}")
+                    if max_chars:
+                        text = method_func(pdf_content, max_pages, max_chars=max_chars)
+                    else:
+                        text = method_func(pdf_content, max_pages)
                     
-            except Exception as e:
-                logger.warning(f"Error con método {method_name}: {str(e)}")
-                continue
+                    # Validar que el texto extraído sea útil
+                    if self._is_valid_text(text):
+                        logger.info(f"Extracción exitosa con método: {method_name}")
+                        return text, method_name
+                    else:
+                        logger.warning(f"Texto extraído con {method_name} no es válido, intentando siguiente método")
+                        
+                except PresupuestoOCRAgotado as e:
+                    # Los métodos restantes también son OCR: no tiene sentido seguir
+                    logger.warning(str(e))
+                    break
+                except Exception as e:
+                    logger.warning(f"Error con método {method_name}: {str(e)}")
+                    continue
+        finally:
+            self._paginas.imagenes = {}
         
         logger.error("Todos los métodos de extracción fallaron")
         return "", "failed"
     
+    def _clasificar_pdf(self, pdf_content: PDFBuffer, max_pages: int) -> str:
+        """
+        Decide qué extractores usar mirando solo la estructura de las páginas (fuentes,
+        operadores de texto e imágenes), sin extraer texto:
+        - 'texto': todas las páginas tienen capa de texto; nunca se hace OCR
+        - 'escaneado': las páginas solo tienen imágenes; se va directo al OCR
+        - 'mixto' o 'desconocido': se prueban todos los métodos en orden
+        """
+        try:
+            with _como_stream(pdf_content) as pdf_file:
+                reader = PyPDF2.PdfReader(pdf_file)
+                if reader.is_encrypted:
+                    return 'desconocido'
+                num_pages = min(len(reader.pages), max_pages)
+                tipos = {self._clasificar_pagina(reader.pages[i]) for i in range(num_pages)}
+        except Exception as e:
+            logger.debug(f"No se pudo inspeccionar la estructura del PDF: {str(e)}")
+            return 'desconocido'
+        
+        tipos.discard('vacia')
+        if tipos == {'texto'}:
+            return 'texto'
+        if tipos == {'imagen'}:
+            return 'escaneado'
+        return 'mixto' if tipos else 'desconocido'
+    
+    def _clasificar_pagina(self, page) -> str:
+        """Retorna 'texto', 'imagen', 'formulario' o 'vacia' según los recursos y el contenido de la página"""
+        recursos = page.get('/Resources')
+        recursos = recursos.get_object() if recursos is not None else {}
+        tiene_fuentes = bool(recursos.get('/Font'))
+        tiene_imagenes = False
+        
+        xobjects = recursos.get('/XObject')
+        for xobject in (xobjects.get_object().values() if xobjects else []):
+            xobject = xobject.get_object()
+            if xobject.get('/Subtype') == '/Image':
+                tiene_imagenes = True
+            elif xobject.get('/Subtype') == '/Form':
+                # Un formulario puede traer sus propias fuentes y texto: no arriesgar
+                return 'formulario'
+        
+        contenido = page.get('/Contents')
+        contenido = contenido.get_object() if contenido is not None else []
+        # /Contents puede ser un stream o un arreglo de streams
+        streams = contenido if isinstance(contenido, list) else [contenido]
+        datos = b'\n'.join(stream.get_object().get_data() for stream in streams)
+        if tiene_fuentes and _RE_OPERADOR_TEXTO.search(datos):
+            return 'texto'
+        if tiene_imagenes:
+            return 'imagen'
+        return 'vacia'
+    
     def _is_valid_text(self, text: str, min_length: int = 50, min_word_count: int = 10) -> bool:
         """Valida si el texto extraído es útil"""
         if not text or len(text.strip()) < min_length:
@@ -68,90 +291,88 @@ class PDFExtractor:
             return False
         
         # Verificar que no sea solo basura (caracteres especiales)
-        alphanumeric_ratio = sum(c.isalnum() or c.isspace() for c in text) / len(text)
+        alphanumeric_ratio = 1 - len(_RE_NO_ALFANUMERICO.findall(text)) / len(text)
         if alphanumeric_ratio < 0.7:
             return False
         
         return True
     
-    def _extract_with_pypdf2(self, pdf_content: bytes, max_pages: int) -> str:
+    def _extract_with_pypdf2(self, pdf_content: PDFBuffer, max_pages: int, max_chars: Optional[int] = None) -> str:
         """Extrae texto usando PyPDF2"""
-        text = ""
-        with BytesIO(pdf_content) as pdf_file:
+        return self._leer_paginas(self._paginas_pypdf2(pdf_content, max_pages), max_chars)
+    
+    def _paginas_pypdf2(self, pdf_content: PDFBuffer, max_pages: int) -> Iterator[str]:
+        with _como_stream(pdf_content) as pdf_file:
             reader = PyPDF2.PdfReader(pdf_file)
             num_pages = min(len(reader.pages), max_pages)
             
             for i in range(num_pages):
-                page = reader.pages[i]
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        return text.strip()
+                yield reader.pages[i].extract_text() or ""
     
-    def _extract_with_pdfminer(self, pdf_content: bytes, max_pages: int) -> str:
+    def _extract_with_pdfminer(self, pdf_content: PDFBuffer, max_pages: int, max_chars: Optional[int] = None) -> str:
         """Extrae texto usando PDFMiner"""
-        with BytesIO(pdf_content) as pdf_file:
+        if max_chars:
+            return self._leer_paginas(self._paginas_pdfminer(pdf_content, max_pages), max_chars)
+        with _como_stream(pdf_content) as pdf_file:
             text = extract_text(pdf_file, maxpages=max_pages)
         return text.strip()
     
-    def _extract_with_ocr(self, pdf_content: bytes, max_pages: int) -> str:
+    def _paginas_pdfminer(self, pdf_content: PDFBuffer, max_pages: int) -> Iterator[str]:
+        # Igual que pdfminer.high_level.extract_text, pero entregando cada página al procesarla
+        with _como_stream(pdf_content) as pdf_file, io.StringIO() as salida:
+            recursos = PDFResourceManager(caching=True)
+            conversor = TextConverter(recursos, salida, codec='utf-8', laparams=LAParams())
+            interprete = PDFPageInterpreter(recursos, conversor)
+            for page in PDFPage.get_pages(pdf_file, maxpages=max_pages, caching=True):
+                interprete.process_page(page)
+                yield salida.getvalue()
+                salida.seek(0)
+                salida.truncate()
+    
+    def _rasterizar(self, pdf_content: PDFBuffer, primera: int, ultima: int) -> list:
+        """
+        Convierte un rango de páginas a imágenes una sola vez por extracción: el OCR
+        básico y el mejorado usan las mismas imágenes.
+        """
+        previas = getattr(self._paginas, 'imagenes', None) or {}
+        clave = (id(pdf_content), primera, ultima)
+        if clave in previas and previas[clave][0] is pdf_content:
+            return previas[clave][1]
+        images = convert_from_bytes(_como_bytes(pdf_content), first_page=primera, last_page=ultima, dpi=OCR_DPI)
+        previas[clave] = (pdf_content, images)
+        self._paginas.imagenes = previas
+        return images
+    
+    def _paginas_ocr(self, pdf_content: PDFBuffer, max_pages: int, mejorado: bool = False) -> Iterator[str]:
+        """
+        Rasteriza y reconoce las páginas en lotes del tamaño del pool de OCR, de modo
+        que se aprovechan todos los procesos y se puede parar entre un lote y otro.
+        """
+        num_pages = min(self._contar_paginas(pdf_content) or max_pages, max_pages)
+        lote = max(1, min(self.ocr_engine.max_workers, num_pages))
+        for primera in range(1, num_pages + 1, lote):
+            ultima = min(primera + lote - 1, num_pages)
+            images = self._rasterizar(pdf_content, primera, ultima)
+            yield from self.ocr_engine.reconocer(images, mejorado=mejorado)
+    
+    def _contar_paginas(self, pdf_content: PDFBuffer) -> Optional[int]:
+        try:
+            with _como_stream(pdf_content) as pdf_file:
+                return len(PyPDF2.PdfReader(pdf_file).pages)
+        except Exception:
+            return None
+    
+    def _extract_with_ocr(self, pdf_content: PDFBuffer, max_pages: int, max_chars: Optional[int] = None) -> str:
         """Extrae texto usando OCR básico"""
-        text = ""
-        images = convert_from_bytes(pdf_content, first_page=1, last_page=max_pages, dpi=200)
-        
-        for i, image in enumerate(images):
-            logger.info(f"Procesando página {i+1} con OCR")
-            page_text = pytesseract.image_to_string(image, lang='spa')
-            text += page_text + "\n"
-        
-        return text.strip()
+        return self._leer_paginas(self._paginas_ocr(pdf_content, max_pages), max_chars)
     
-    def _extract_with_enhanced_ocr(self, pdf_content: bytes, max_pages: int) -> str:
+    def _extract_with_enhanced_ocr(self, pdf_content: PDFBuffer, max_pages: int, max_chars: Optional[int] = None) -> str:
         """Extrae texto usando OCR mejorado con preprocesamiento de imagen"""
-        text = ""
-        images = convert_from_bytes(pdf_content, first_page=1, last_page=max_pages, dpi=300)
-        
-        for i, image in enumerate(images):
-            logger.info(f"Procesando página {i+1} con OCR mejorado")
-            
-            # Preprocesar imagen para mejorar OCR
-            processed_image = self._preprocess_image_for_ocr(image)
-            
-            # Configuración mejorada de Tesseract
-            custom_config = r'--oem 3 --psm 6'
-            page_text = pytesseract.image_to_string(
-                processed_image, 
-                lang='spa', 
-                config=custom_config
-            )
-            
-            text += page_text + "\n"
-        
-        return text.strip()
+        return self._leer_paginas(self._paginas_ocr(pdf_content, max_pages, mejorado=True), max_chars)
     
     def _preprocess_image_for_ocr(self, image: Image) -> Image:
         """Preprocesa una imagen para mejorar la calidad del OCR"""
-        import cv2
-        import numpy as np
-        
-        # Convertir PIL Image a numpy array
-        img_array = np.array(image)
-        
-        # Convertir a escala de grises si es necesario
-        if len(img_array.shape) == 3:
-            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img_array
-        
-        # Aplicar threshold para mejorar contraste
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Eliminar ruido
-        denoised = cv2.medianBlur(thresh, 3)
-        
-        # Convertir de vuelta a PIL Image
-        return Image.fromarray(denoised)
+        return preprocesar_imagen(image)
     
     def extract_text_from_url(self, url: str, max_pages: int = 2) -> Tuple[str, str]:
         """
@@ -180,7 +401,7 @@ class PDFExtractor:
             logger.error(f"Error descargando PDF desde {url}: {str(e)}")
             return "", "failed"
     
-    def get_pdf_info(self, pdf_content: bytes) -> dict:
+    def get_pdf_info(self, pdf_content: PDFBuffer) -> dict:
         """Obtiene información básica del PDF"""
         info = {
             'num_pages': 0,
@@ -190,7 +411,7 @@ class PDFExtractor:
         }
         
         try:
-            with BytesIO(pdf_content) as pdf_file:
+            with _como_stream(pdf_content) as pdf_file:
                 reader = PyPDF2.PdfReader(pdf_file)
                 info['num_pages'] = len(reader.pages)
                 info['encrypted'] = reader.is_encrypted
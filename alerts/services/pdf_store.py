@@ -0,0 +1,171 @@
+"""
+Almacén de PDFs en disco direccionado por contenido (SHA-256)
+"""
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+from django.conf import settings
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class PDFStore:
+    """
+    Guarda cada PDF una sola vez en disco, con nombre igual a su SHA-256, y mantiene
+    en la base de datos el índice URL -> hash. Las lecturas se entregan como mmap de
+    solo lectura, que PDFExtractor consume sin copiar el contenido.
+
+    Cuando el almacén supera su tamaño máximo se eliminan los PDFs usados hace más tiempo.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._root = root
+        self._max_bytes = max_bytes
+
+    @property
+    def root(self) -> str:
+        if self._root is None:
+            self._root = str(settings.PDF_STORE_DIR)
+        return self._root
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            self._max_bytes = settings.PDF_STORE_MAX_BYTES
+        return self._max_bytes
+
+    def _ruta(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}.pdf")
+
+    def _mapear(self, sha256: str) -> Optional[mmap.mmap]:
+        """Abre el archivo de un hash como mmap de solo lectura, o None si no existe"""
+        try:
+            with open(self._ruta(sha256), 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: archivo vacío, no se puede mapear
+            return None
+
+    def get(self, url: str) -> Optional[mmap.mmap]:
+        """
+        Obtiene el PDF de una URL como mmap de solo lectura (el llamador debe cerrarlo),
+        o None si no está almacenado.
+        """
+        from alerts.models import PDFAlmacenado
+        registro = PDFAlmacenado.objects.filter(url=url).only('sha256').first()
+        if registro is None:
+            return None
+
+        buffer = self._mapear(registro.sha256)
+        if buffer is None:
+            # El archivo fue eliminado (evicción u otra limpieza), descartar el índice
+            PDFAlmacenado.objects.filter(url=url).delete()
+            return None
+
+        PDFAlmacenado.objects.filter(sha256=registro.sha256).update(fecha_ultimo_acceso=timezone.now())
+        logger.info(f"PDF encontrado en almacén: {url}")
+        return buffer
+
+    def put(self, url: str, content: bytes) -> str:
+        """Guarda un PDF y lo asocia a la URL. Retorna su SHA-256."""
+        from alerts.models import PDFAlmacenado
+        sha256 = hashlib.sha256(content).hexdigest()
+        ruta = self._ruta(sha256)
+
+        if not os.path.exists(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            # Escribir en un temporal y renombrar, para que otro proceso nunca lea un archivo a medias
+            fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(temporal, ruta)
+            except BaseException:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+
+        PDFAlmacenado.objects.update_or_create(
+            url=url,
+            defaults={'sha256': sha256, 'tamano': len(content), 'fecha_ultimo_acceso': timezone.now()}
+        )
+        logger.info(f"PDF guardado en almacén: {url} ({sha256[:12]}, {len(content)} bytes)")
+        self.evict()
+        return sha256
+
+    @contextmanager
+    def abrir(self, url: str, descargar: Callable[[], bytes]) -> Iterator[Union[mmap.mmap, bytes]]:
+        """
+        Entrega el PDF de una URL desde el almacén, descargándolo con descargar() si no está.
+        El mmap se cierra al salir del bloque. Si el almacén no está disponible se
+        entregan directamente los bytes descargados.
+        """
+        disponible = True
+        try:
+            buffer = self.get(url)
+        except Exception as e:
+            logger.warning(f"Almacén de PDFs no disponible ({str(e)}), usando descarga directa")
+            disponible = False
+            buffer = None
+
+        if buffer is None:
+            content = descargar()
+            if disponible:
+                try:
+                    self.put(url, content)
+                    buffer = self.get(url)
+                except Exception as e:
+                    logger.warning(f"No se pudo guardar el PDF en el almacén: {str(e)}")
+            if buffer is None:
+                yield content
+                return
+
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+    def evict(self) -> int:
+        """
+        Elimina los PDFs usados hace más tiempo hasta que el almacén quede bajo su
+        tamaño máximo. Retorna el número de archivos eliminados.
+        """
+        from alerts.models import PDFAlmacenado
+        # Cota superior barata (un PDF con varias URLs suma una vez por URL): si ya cabe,
+        # no hace falta agrupar por hash ni ordenar toda la tabla
+        if (PDFAlmacenado.objects.aggregate(total=Sum('tamano'))['total'] or 0) <= self.max_bytes:
+            return 0
+
+        por_hash = list(
+            PDFAlmacenado.objects.values('sha256')
+            .annotate(ultimo_acceso=Max('fecha_ultimo_acceso'), tamano=Max('tamano'))
+            .order_by('ultimo_acceso')
+        )
+        total = sum(item['tamano'] for item in por_hash)
+        eliminados = 0
+
+        for item in por_hash:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._ruta(item['sha256']))
+            except FileNotFoundError:
+                pass
+            PDFAlmacenado.objects.filter(sha256=item['sha256']).delete()
+            total -= item['tamano']
+            eliminados += 1
+
+        if eliminados:
+            logger.info(f"Almacén de PDFs: {eliminados} archivos eliminados, {total} bytes en uso")
+        return eliminados
+
+
+# Instancia global del servicio
+pdf_store = PDFStore()
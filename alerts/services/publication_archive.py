@@ -0,0 +1,133 @@
+"""
+Archivo en la base de datos de las ediciones scrapeadas del Diario Oficial
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from alerts.services.search_index import search_index
+
+logger = logging.getLogger(__name__)
+
+
+class PublicationArchive:
+    """
+    Guarda cada edición scrapeada como filas de Publicacion, para consultar el
+    historial o volver a generar un informe sin scrapear de nuevo. Cada edición se
+    escribe en una transacción con bulk_create/bulk_update: solo se insertan las
+    publicaciones nuevas, se actualizan las que cambiaron y se borran las que ya no
+    aparecen en el índice.
+    """
+
+    CAMPOS = ['orden', 'seccion', 'titulo', 'relevante', 'razon_relevancia', 'resumen',
+              'es_sii', 'es_licitacion', 'en_informe']
+    TAMANO_LOTE = 500
+
+    def _valores(self, orden: int, pub: Dict[str, Any], en_informe: bool) -> Dict[str, Any]:
+        return {
+            'orden': orden,
+            'seccion': pub['seccion'],
+            'titulo': pub['titulo'],
+            'relevante': bool(pub.get('relevante')),
+            'razon_relevancia': pub.get('razon_relevancia') or '',
+            'resumen': (pub.get('resumen') or '') if en_informe else '',
+            'es_sii': bool(pub.get('es_sii')),
+            'es_licitacion': bool(pub.get('es_licitacion')),
+            'en_informe': en_informe,
+        }
+
+    def guardar_edicion(
+        self,
+        fecha: date,
+        numero,
+        publicaciones: List[Dict[str, Any]],
+        incluidas: Iterable[Dict[str, Any]] = (),
+        total_documentos: Optional[int] = None,
+        valores_monedas: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Guarda las publicaciones evaluadas de la edición; las de incluidas son las que
+        salieron en el informe (con su resumen). Retorna cuántas filas se escribieron.
+        """
+        from alerts.models import Edicion, Publicacion
+
+        urls_informe = {p['url_pdf'] for p in incluidas}
+        actuales = {}
+        for pub in publicaciones:
+            actuales.setdefault(pub['url_pdf'], pub)
+
+        try:
+            with transaction.atomic():
+                edicion, _ = Edicion.objects.get_or_create(fecha=fecha, defaults={'numero': int(numero)})
+                edicion.total_documentos = total_documentos
+                edicion.valores_monedas = valores_monedas
+                edicion.fecha_scraping = timezone.now()
+                edicion.save(update_fields=['total_documentos', 'valores_monedas', 'fecha_scraping'])
+
+                existentes = {p.url_pdf: p for p in Publicacion.objects.filter(edicion=edicion)}
+                nuevas, modificadas = [], []
+                for orden, (url_pdf, pub) in enumerate(actuales.items()):
+                    valores = self._valores(orden, pub, url_pdf in urls_informe)
+                    registro = existentes.get(url_pdf)
+                    if registro is None:
+                        nuevas.append(Publicacion(edicion=edicion, url_pdf=url_pdf, **valores))
+                    elif any(getattr(registro, campo) != valor for campo, valor in valores.items()):
+                        for campo, valor in valores.items():
+                            setattr(registro, campo, valor)
+                        modificadas.append(registro)
+
+                Publicacion.objects.bulk_create(nuevas, batch_size=self.TAMANO_LOTE)
+                Publicacion.objects.bulk_update(modificadas, self.CAMPOS, batch_size=self.TAMANO_LOTE)
+                retiradas = [p.pk for url, p in existentes.items() if url not in actuales]
+                if retiradas:
+                    Publicacion.objects.filter(pk__in=retiradas).delete()
+                    search_index.eliminar('publicacion', retiradas)
+                search_index.indexar(search_index.documento_publicacion(p, fecha) for p in nuevas + modificadas)
+        except Exception as e:
+            logger.warning(f"No se pudo archivar la edición {numero}: {str(e)}")
+            return 0
+
+        logger.info(f"Edición {numero} archivada: {len(nuevas)} nuevas, {len(modificadas)} actualizadas, "
+                    f"{len(retiradas)} retiradas")
+        return len(nuevas) + len(modificadas)
+
+    def resultado(self, fecha: date) -> Optional[Dict[str, Any]]:
+        """
+        Reconstruye el resultado de obtener_sumario_diario_oficial para la fecha desde
+        las tablas, o None si la edición no está archivada. Una edición scrapeada el
+        mismo día de su publicación puede no estar completa todavía, así que solo se
+        usa si se archivó en un día posterior.
+        """
+        from alerts.models import Edicion
+        try:
+            edicion = Edicion.objects.filter(fecha=fecha, fecha_scraping__date__gt=fecha).first()
+            if edicion is None:
+                return None
+            publicaciones = [
+                {
+                    'seccion': p.seccion,
+                    'titulo': p.titulo,
+                    'url_pdf': p.url_pdf,
+                    'relevante': p.relevante,
+                    'es_licitacion': p.es_licitacion,
+                    'razon_relevancia': p.razon_relevancia,
+                    'resumen': p.resumen,
+                    'es_sii': p.es_sii,
+                }
+                for p in edicion.publicaciones.filter(en_informe=True).order_by('orden')
+            ]
+        except Exception as e:
+            logger.warning(f"No se pudo leer la edición archivada: {str(e)}")
+            return None
+        return {
+            'publicaciones': publicaciones,
+            'valores_monedas': edicion.valores_monedas,
+            'total_documentos': edicion.total_documentos or 0,
+        }
+
+
+# Instancia global del servicio
+publication_archive = PublicationArchive()
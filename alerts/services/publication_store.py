@@ -0,0 +1,77 @@
+"""
+Estado de cada publicación del Diario Oficial ya procesada, por edición
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_RE_CVE = re.compile(r'(\d+)\.pdf$')
+
+
+class PublicationStore:
+    """
+    Guarda por (edición, CVE) la relevancia y el resultado del procesamiento del PDF
+    (inclusión y resumen) de cada publicación. Al volver a scrapear una edición solo
+    las publicaciones nuevas o cuyo título cambió pasan por evaluación, extracción y resumen.
+    """
+
+    TTL = 86400 * 7  # 7 días
+
+    @staticmethod
+    def clave(url_pdf: str) -> str:
+        """CVE de la publicación (nombre del PDF) o, si no lo tiene, su URL"""
+        match = _RE_CVE.search(url_pdf)
+        return f"cve:{match.group(1)}" if match else f"url:{url_pdf}"
+
+    @staticmethod
+    def firma(pub: Dict[str, Any]) -> str:
+        """Huella de los datos del índice; si cambia, la publicación se vuelve a procesar"""
+        datos = f"{pub['seccion']}\n{pub['titulo']}\n{pub['url_pdf']}"
+        return hashlib.sha256(datos.encode('utf-8')).hexdigest()[:16]
+
+    def _cache_key(self, edicion: str, clave: str) -> str:
+        return f"publicacion:{edicion}:{hashlib.md5(clave.encode()).hexdigest()}"
+
+    def get_vigentes(self, edicion: str, pubs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna {clave: estado} de las publicaciones guardadas cuya firma coincide con
+        la actual. El estado tiene 'relevante', 'razon_relevancia' y 'procesado'
+        (el resultado de procesar el PDF, o None si no se procesó).
+        """
+        pubs = list(pubs)
+        claves = {self._cache_key(edicion, self.clave(p['url_pdf'])): p for p in pubs}
+        try:
+            guardados = cache.get_many(list(claves))
+        except Exception as e:
+            logger.warning(f"No se pudo leer el estado de las publicaciones: {str(e)}")
+            return {}
+
+        vigentes = {}
+        for cache_key, estado in guardados.items():
+            pub = claves[cache_key]
+            if estado.get('firma') == self.firma(pub):
+                vigentes[self.clave(pub['url_pdf'])] = estado
+        logger.info(f"Edición {edicion}: {len(vigentes)} de {len(pubs)} publicaciones ya procesadas")
+        return vigentes
+
+    def set(self, edicion: str, pub: Dict[str, Any], procesado: Optional[Dict[str, Any]] = None) -> None:
+        """Guarda la relevancia de una publicación y, si se procesó su PDF, el resultado"""
+        estado = {
+            'firma': self.firma(pub),
+            'relevante': pub['relevante'],
+            'razon_relevancia': pub['razon_relevancia'],
+            'procesado': procesado,
+        }
+        try:
+            cache.set(self._cache_key(edicion, self.clave(pub['url_pdf'])), estado, self.TTL)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el estado de la publicación: {str(e)}")
+
+
+# Instancia global del servicio
+publication_store = PublicationStore()
@@ -0,0 +1,201 @@
+"""
+Búsqueda de texto completo sobre publicaciones del Diario Oficial, documentos del SII
+y hechos esenciales
+"""
+import logging
+import re
+import unicodedata
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Sufijos que se quitan a cada término en SQLite, donde FTS5 no tiene stemming en español:
+# la raíz se busca como prefijo ("licitaciones" -> "licit*" encuentra "licitación")
+_SUFIJOS = ('aciones', 'iciones', 'amientos', 'imientos', 'amiento', 'imiento', 'mente',
+            'ciones', 'cion', 'idades', 'idad', 'ales', 'es', 'os', 'as', 's', 'o', 'a', 'e')
+_RE_TERMINO = re.compile(r'\w+')
+
+
+def _sin_tildes(texto: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _raiz(termino: str) -> str:
+    termino = _sin_tildes(termino.lower())
+    for sufijo in _SUFIJOS:
+        if termino.endswith(sufijo) and len(termino) - len(sufijo) >= 4:
+            return termino[:-len(sufijo)]
+    return termino
+
+
+def consulta_fts5(consulta: str) -> str:
+    """Expresión MATCH de FTS5: todos los términos, cada uno como prefijo de su raíz"""
+    return ' '.join(f'"{_raiz(t)}"*' for t in _RE_TERMINO.findall(consulta))
+
+
+class ResultadosBusqueda:
+    """
+    Resultados de una búsqueda, ordenados por relevancia. Se comportan como una secuencia
+    perezosa (count() y cortes) para usarse con django.core.paginator.Paginator: cada
+    página es una consulta con LIMIT/OFFSET sobre el índice.
+    """
+
+    def __init__(self, indice: 'SearchIndex', consulta: str, tipo: Optional[str] = None):
+        self.indice = indice
+        self.consulta = consulta
+        self.tipo = tipo
+        self._total = None
+
+    def count(self) -> int:
+        if self._total is None:
+            self._total = self.indice._contar(self.consulta, self.tipo)
+        return self._total
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            inicio = item.start or 0
+            fin = item.stop if item.stop is not None else self.count()
+            if fin <= inicio:
+                return []
+            return self.indice._pagina(self.consulta, self.tipo, fin - inicio, inicio)
+        resultados = self.indice._pagina(self.consulta, self.tipo, 1, item)
+        if not resultados:
+            raise IndexError(item)
+        return resultados[0]
+
+
+class SearchIndex:
+    """
+    Mantiene la tabla DocumentoBusqueda y consulta su índice de texto completo:
+    tsvector en español con índice GIN en PostgreSQL y FTS5 en SQLite (sin tildes y
+    con raíces buscadas como prefijo). Otros motores usan icontains.
+    """
+
+    TAMANO_LOTE = 500
+
+    def indexar(self, documentos: Iterable[Dict[str, Any]]) -> int:
+        """
+        Inserta o actualiza documentos ({tipo, objeto_id, fecha, titulo, texto, url})
+        con un upsert masivo. Retorna cuántos se indexaron.
+        """
+        from alerts.models import DocumentoBusqueda
+        registros = [DocumentoBusqueda(**doc) for doc in documentos]
+        if not registros:
+            return 0
+        try:
+            # En un savepoint: un error del índice no invalida la transacción de quien indexa
+            with transaction.atomic():
+                DocumentoBusqueda.objects.bulk_create(
+                    registros,
+                    batch_size=self.TAMANO_LOTE,
+                    update_conflicts=True,
+                    unique_fields=['tipo', 'objeto_id'],
+                    update_fields=['fecha', 'titulo', 'texto', 'url'],
+                )
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el índice de búsqueda: {str(e)}")
+            return 0
+        return len(registros)
+
+    def eliminar(self, tipo: str, objeto_ids: Iterable[int]) -> None:
+        from alerts.models import DocumentoBusqueda
+        try:
+            with transaction.atomic():
+                DocumentoBusqueda.objects.filter(tipo=tipo, objeto_id__in=list(objeto_ids)).delete()
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el índice de búsqueda: {str(e)}")
+
+    @staticmethod
+    def documento_publicacion(publicacion, fecha: date) -> Dict[str, Any]:
+        return {
+            'tipo': 'publicacion',
+            'objeto_id': publicacion.pk,
+            'fecha': fecha,
+            'titulo': publicacion.titulo,
+            'texto': '\n'.join(t for t in (publicacion.seccion, publicacion.resumen) if t),
+            'url': publicacion.url_pdf,
+        }
+
+    @staticmethod
+    def documento_sii(documento) -> Dict[str, Any]:
+        return {
+            'tipo': 'sii',
+            'objeto_id': documento.pk,
+            'fecha': documento.fecha_publicacion,
+            'titulo': f"{documento.get_tipo_documento_display()} {documento.numero} - {documento.titulo}",
+            'texto': '\n'.join(t for t in (documento.resumen, documento.contenido) if t),
+            'url': documento.url,
+        }
+
+    @staticmethod
+    def documento_hecho(hecho) -> Dict[str, Any]:
+        fecha = hecho.fecha_publicacion
+        return {
+            'tipo': 'hecho',
+            'objeto_id': hecho.pk,
+            'fecha': fecha.date() if isinstance(fecha, datetime) else fecha,
+            'titulo': f"{hecho.empresa.nombre}: {hecho.titulo}",
+            'texto': '\n'.join(t for t in (hecho.materia, hecho.resumen) if t),
+            'url': hecho.url,
+        }
+
+    def buscar(self, consulta: str, tipo: Optional[str] = None) -> ResultadosBusqueda:
+        """Documentos que contienen todos los términos de la consulta, los más relevantes primero"""
+        return ResultadosBusqueda(self, consulta, tipo)
+
+    def _sql(self, consulta: str, tipo: Optional[str]):
+        """(FROM ... WHERE ..., ORDER BY ..., parámetros) según el motor"""
+        filtro_tipo = " AND d.tipo = %s" if tipo else ""
+        if connection.vendor == 'postgresql':
+            return (
+                "FROM alerts_documentobusqueda d, websearch_to_tsquery('spanish', %s) q "
+                "WHERE d.vector @@ q" + filtro_tipo,
+                "ts_rank(d.vector, q) DESC, d.fecha DESC",
+                [consulta] + ([tipo] if tipo else []),
+            )
+        return (
+            "FROM alerts_documentobusqueda_fts f JOIN alerts_documentobusqueda d ON d.id = f.rowid "
+            "WHERE alerts_documentobusqueda_fts MATCH %s" + filtro_tipo,
+            "bm25(alerts_documentobusqueda_fts, 10.0, 1.0), d.fecha DESC",
+            [consulta_fts5(consulta)] + ([tipo] if tipo else []),
+        )
+
+    def _sin_indice(self, consulta: str, tipo: Optional[str]):
+        from alerts.models import DocumentoBusqueda
+        from django.db.models import Q
+        queryset = DocumentoBusqueda.objects.all()
+        for termino in _RE_TERMINO.findall(consulta):
+            queryset = queryset.filter(Q(titulo__icontains=termino) | Q(texto__icontains=termino))
+        return queryset.filter(tipo=tipo) if tipo else queryset
+
+    def _contar(self, consulta: str, tipo: Optional[str]) -> int:
+        if not _RE_TERMINO.search(consulta):
+            return 0
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            return self._sin_indice(consulta, tipo).count()
+        desde, _, parametros = self._sql(consulta, tipo)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) " + desde, parametros)
+            return cursor.fetchone()[0]
+
+    def _pagina(self, consulta: str, tipo: Optional[str], limite: int, desplazamiento: int) -> List[Any]:
+        from alerts.models import DocumentoBusqueda
+        if not _RE_TERMINO.search(consulta):
+            return []
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            return list(self._sin_indice(consulta, tipo)[desplazamiento:desplazamiento + limite])
+        desde, orden, parametros = self._sql(consulta, tipo)
+        return list(DocumentoBusqueda.objects.raw(
+            f"SELECT d.* {desde} ORDER BY {orden} LIMIT %s OFFSET %s",
+            parametros + [limite, desplazamiento],
+        ))
+
+
+# Instancia global del servicio
+search_index = SearchIndex()
@@ -0,0 +1,114 @@
+"""
+Almacén persistente de resúmenes generados por IA
+"""
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def version_prompt(*plantillas: str) -> str:
+    """Hash corto de las plantillas de un prompt; cambia cuando cambia el texto del prompt"""
+    return hashlib.sha256(''.join(plantillas).encode('utf-8')).hexdigest()[:16]
+
+
+class SummaryStore:
+    """
+    Guarda los resúmenes en la base de datos para que re-generar o reenviar
+    informes de fechas pasadas no vuelva a llamar a la IA.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_texto(texto: str) -> str:
+        return hashlib.sha256((texto or '').encode('utf-8')).hexdigest()
+
+    def get(self, url: Optional[str], texto: str, modelos: List[str], version: str) -> Optional[str]:
+        """Obtiene un resumen guardado, prefiriendo los modelos en el orden dado"""
+        from alerts.models import ResumenGenerado
+        try:
+            guardados = {
+                r.modelo: r for r in ResumenGenerado.objects.filter(
+                    url=url or '',
+                    hash_texto=self.hash_texto(texto),
+                    version_prompt=version,
+                    modelo__in=modelos
+                )
+            }
+            for modelo in modelos:
+                if modelo in guardados:
+                    ResumenGenerado.objects.filter(pk=guardados[modelo].pk).update(
+                        usos=F('usos') + 1, fecha_ultimo_uso=timezone.now()
+                    )
+                    return guardados[modelo].resumen
+        except Exception as e:
+            logger.warning(f"No se pudo leer el almacén de resúmenes: {str(e)}")
+        return None
+
+    def set(self, url: Optional[str], texto: str, modelo: str, version: str, resumen: str) -> None:
+        """Guarda o reemplaza un resumen"""
+        from alerts.models import ResumenGenerado
+        try:
+            ResumenGenerado.objects.update_or_create(
+                url=url or '',
+                hash_texto=self.hash_texto(texto),
+                modelo=modelo,
+                version_prompt=version,
+                defaults={'resumen': resumen}
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el resumen: {str(e)}")
+
+    def obtener_o_generar(
+        self,
+        url: Optional[str],
+        texto: str,
+        version: str,
+        generadores: List[Tuple[str, Callable[[], Optional[str]]]]
+    ) -> Optional[str]:
+        """
+        Retorna el resumen guardado o lo genera probando los generadores en orden.
+
+        Args:
+            url: URL del documento (puede ser None)
+            texto: Todo lo que se envía al prompt, para detectar cambios de contenido
+            version: Versión del prompt
+            generadores: Lista de (modelo, función sin argumentos que retorna el resumen o None)
+
+        Returns:
+            El resumen, o None si ningún generador tuvo éxito
+        """
+        modelos = [modelo for modelo, _ in generadores]
+        resumen = self.get(url, texto, modelos, version)
+        with self.lock:
+            if resumen is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if resumen is not None:
+            logger.info(f"Resumen reutilizado: {url or 'sin URL'}")
+            return resumen
+
+        for modelo, generar in generadores:
+            resumen = generar()
+            if resumen:
+                self.set(url, texto, modelo, version, resumen)
+                return resumen
+        return None
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Aciertos y fallos del proceso actual"""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+# Instancia global del servicio
+summary_store = SummaryStore()
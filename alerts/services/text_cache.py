@@ -0,0 +1,48 @@
+"""
+Caché persistente del texto extraído de PDFs
+"""
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractedTextCache:
+    """
+    Guarda en la base de datos el resultado de PDFExtractor por (SHA-256 del PDF, max_pages, max_chars),
+    con el método que tuvo éxito y cuánto tardó. Un PDF que necesitó OCR no vuelve a pasar por OCR.
+    """
+
+    def get(self, sha256: str, max_pages: int, max_chars: Optional[int] = None) -> Optional[Tuple[str, str]]:
+        """Retorna (texto, metodo) o None si no hay extracción guardada"""
+        from alerts.models import TextoExtraido
+        try:
+            registro = TextoExtraido.objects.filter(
+                sha256=sha256, max_paginas=max_pages, max_caracteres=max_chars or 0
+            ).first()
+        except Exception as e:
+            logger.warning(f"No se pudo leer el caché de texto extraído: {str(e)}")
+            return None
+        if registro is None:
+            return None
+        logger.info(f"Texto extraído encontrado en caché: {sha256[:12]} ({registro.metodo}, "
+                    f"{registro.duracion:.2f}s ahorrados)")
+        return registro.texto, registro.metodo
+
+    def set(self, sha256: str, max_pages: int, max_chars: Optional[int], texto: str, metodo: str,
+            duracion: float) -> None:
+        """Guarda o reemplaza una extracción"""
+        from alerts.models import TextoExtraido
+        try:
+            TextoExtraido.objects.update_or_create(
+                sha256=sha256,
+                max_paginas=max_pages,
+                max_caracteres=max_chars or 0,
+                defaults={'texto': texto, 'metodo': metodo, 'duracion': duracion}
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el texto extraído: {str(e)}")
+
+
+# Instancia global del servicio
+text_cache = ExtractedTextCache()
@@ -0,0 +1,101 @@
+"""
+Caché persistente de veredictos de relevancia generados por IA
+"""
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Caracteres del texto del PDF que forman parte de la clave (los mismos que ve el prompt)
+CARACTERES_TEXTO = 2000
+
+
+class VerdictCache:
+    """
+    Guarda en la base de datos los veredictos de relevancia por título normalizado
+    y hash del inicio del texto. Las entradas generadas con otra versión del prompt
+    se ignoran y se sobrescriben.
+    """
+
+    TTL_VEREDICTO = timedelta(days=30)
+
+    def __init__(self, version_prompt: str):
+        self.version_prompt = version_prompt
+
+    @staticmethod
+    def normalizar_titulo(titulo: str) -> str:
+        """Normaliza mayúsculas y espacios para que títulos recurrentes compartan clave"""
+        return ' '.join((titulo or '').upper().split())
+
+    @classmethod
+    def clave(cls, titulo: str, texto_pdf: Optional[str] = None) -> Tuple[str, str]:
+        """Retorna (hash_titulo, hash_texto) para un título y su texto opcional"""
+        hash_titulo = hashlib.sha256(cls.normalizar_titulo(titulo).encode('utf-8')).hexdigest()
+        hash_texto = ''
+        if texto_pdf:
+            hash_texto = hashlib.sha256(texto_pdf[:CARACTERES_TEXTO].encode('utf-8')).hexdigest()
+        return hash_titulo, hash_texto
+
+    def _vigentes(self):
+        from alerts.models import VeredictoRelevancia
+        return VeredictoRelevancia.objects.filter(
+            version_prompt=self.version_prompt,
+            fecha_expiracion__gt=timezone.now()
+        )
+
+    def get(self, titulo: str, texto_pdf: Optional[str] = None) -> Optional[Tuple[bool, str]]:
+        """Obtiene un veredicto vigente o None"""
+        hash_titulo, hash_texto = self.clave(titulo, texto_pdf)
+        try:
+            veredicto = self._vigentes().filter(hash_titulo=hash_titulo, hash_texto=hash_texto).first()
+        except Exception as e:
+            logger.warning(f"No se pudo leer el caché de veredictos: {str(e)}")
+            return None
+        if veredicto is None:
+            return None
+        return veredicto.relevante, veredicto.razon
+
+    def get_many(self, titulos: Iterable[str]) -> Dict[str, Tuple[bool, str]]:
+        """Obtiene en una sola consulta los veredictos vigentes de varios títulos (sin texto)"""
+        por_hash = {self.clave(titulo)[0]: titulo for titulo in titulos}
+        if not por_hash:
+            return {}
+        try:
+            veredictos = self._vigentes().filter(hash_titulo__in=list(por_hash), hash_texto='')
+            return {por_hash[v.hash_titulo]: (v.relevante, v.razon) for v in veredictos}
+        except Exception as e:
+            logger.warning(f"No se pudo leer el caché de veredictos: {str(e)}")
+            return {}
+
+    def set(self, titulo: str, texto_pdf: Optional[str], relevante: bool, razon: str, proveedor: str) -> None:
+        """Guarda o reemplaza el veredicto de un título"""
+        from alerts.models import VeredictoRelevancia
+        hash_titulo, hash_texto = self.clave(titulo, texto_pdf)
+        try:
+            VeredictoRelevancia.objects.update_or_create(
+                hash_titulo=hash_titulo,
+                hash_texto=hash_texto,
+                defaults={
+                    'titulo': self.normalizar_titulo(titulo),
+                    'relevante': relevante,
+                    'razon': razon,
+                    'proveedor': proveedor,
+                    'version_prompt': self.version_prompt,
+                    'fecha_expiracion': timezone.now() + self.TTL_VEREDICTO,
+                }
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el veredicto en caché: {str(e)}")
+
+    def purgar_expirados(self) -> int:
+        """Elimina los veredictos vencidos o de versiones anteriores del prompt"""
+        from alerts.models import VeredictoRelevancia
+        from django.db.models import Q
+        eliminados, _ = VeredictoRelevancia.objects.filter(
+            Q(fecha_expiracion__lte=timezone.now()) | ~Q(version_prompt=self.version_prompt)
+        ).delete()
+        logger.info(f"Veredictos de relevancia eliminados: {eliminados}")
+        return eliminados
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark de la clasificación de criticidad de hechos esenciales: recorrido
+anterior (cada palabra clave de cada categoría con `in`) contra el clasificador
+compilado, que además entrega todas las palabras clave encontradas. En CPython los
+`in` sobre cadenas cortas son muy rápidos: la ganancia está en los títulos y en no
+repetir la clasificación entre pasadas (memoización), no en textos largos.
+
+Uso:
+    python -m alerts.tests.benchmark_criticidad_hechos [repeticiones]
+"""
+import sys
+import timeit
+
+from alerts.cmf_criterios_profesionales import clasificar_criticidad
+from alerts.tests.test_cmf_criterios_profesionales import _categoria_por_recorrido, corpus_criticidad
+
+MATERIA = (
+    "La sociedad informa que en sesión de directorio celebrada con esta fecha se acordó "
+    "convocar a los accionistas para pronunciarse sobre la propuesta de la administración, "
+    "cuyos antecedentes se encuentran a disposición de los interesados en el domicilio social. "
+)
+
+
+def main(repeticiones=20):
+    corpus = corpus_criticidad()
+    casos = [
+        ("títulos", ["Fe de erratas", "Otros", "Reparto de dividendo provisorio", "Renuncia Gerente General"]),
+        ("título + materia", [f"Otros {MATERIA * 3}", f"Citación a junta extraordinaria {MATERIA * 3}"]),
+        ("corpus de pruebas", corpus),
+    ]
+    print(f"{'textos':<20}{'recorrido':>14}{'compilado':>14}{'aceleración':>14}")
+    for nombre, textos in casos:
+        t_anterior = timeit.timeit(lambda: [_categoria_por_recorrido(t.lower()) for t in textos],
+                                   number=repeticiones) / repeticiones / len(textos)
+        # Sin la memoización, que haría gratis toda repetición después de la primera
+        t_nuevo = timeit.timeit(lambda: [clasificar_criticidad.__wrapped__(t) for t in textos],
+                                number=repeticiones) / repeticiones / len(textos)
+        print(f"{nombre:<20}{t_anterior * 1e6:>11.1f} µs{t_nuevo * 1e6:>11.1f} µs{t_anterior / t_nuevo:>13.1f}x")
+
+    # Otra pasada de filtrado sobre los mismos hechos
+    [clasificar_criticidad(t) for t in corpus]
+    t_memoizado = timeit.timeit(lambda: [clasificar_criticidad(t) for t in corpus],
+                                number=repeticiones) / repeticiones / len(corpus)
+    print(f"{'corpus, 2ª pasada':<20}{'':>14}{t_memoizado * 1e6:>11.1f} µs")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,115 @@
+"""
+Micro-benchmark del parser de páginas índice del Diario Oficial contra el recorrido
+anterior con BeautifulSoup, usando las páginas guardadas en fixtures/diario_oficial.
+Antes de medir verifica que ambos extraen las mismas filas (sección, título, PDF).
+
+La única diferencia es de espacios: el recorrido anterior usaba get_text(strip=True),
+que recorta cada nodo de texto y los une sin separador, por lo que perdía el espacio
+entre etiquetas en línea ("Autoriza a <b>Empresa</b>" quedaba "Autoriza aEmpresa").
+El parser nuevo conserva ese espacio y normaliza los espacios repetidos, así que los
+títulos se comparan sin espacios.
+
+Uso:
+    python -m alerts.tests.benchmark_parser_diario_oficial [repeticiones]
+"""
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from alerts.parser_diario_oficial import parsear_avisos_destacados, parsear_sumario
+from alerts.tests.test_parser_diario_oficial import leer_fixture
+
+SECCIONES_VALIDAS = ["NORMAS GENERALES", "NORMAS PARTICULARES", "AVISOS DESTACADOS",
+                     "Normas Generales", "Normas Particulares", "Avisos Destacados"]
+
+
+def sumario_beautifulsoup(html):
+    """Recorrido anterior: html.parser y búsqueda hacia atrás de la sección por cada fila"""
+    filas = []
+    soup = BeautifulSoup(html, "html.parser")
+    for tr in soup.find_all('tr', class_='content'):
+        tds = tr.find_all('td')
+        if len(tds) >= 2:
+            titulo = re.sub(r"Ver PDF.*", "", tds[0].get_text(strip=True)).strip()
+            link_tag = tds[1].find('a', href=True)
+            if link_tag and link_tag['href'].endswith('.pdf'):
+                seccion = None
+                tr_parent = tr.find_parent('table')
+                if tr_parent:
+                    for prev in tr_parent.find_all_previous(['td', 'th']):
+                        texto_prev = prev.get_text(strip=True).upper()
+                        if texto_prev in [s.upper() for s in SECCIONES_VALIDAS]:
+                            seccion = texto_prev
+                            break
+                filas.append((seccion or "NORMAS GENERALES", titulo, link_tag['href']))
+    return filas
+
+
+def avisos_beautifulsoup(html):
+    filas = []
+    soup = BeautifulSoup(html, "html.parser")
+    for fila in soup.find_all('tr'):
+        texto_fila = fila.get_text(strip=True)
+        for enlace in fila.find_all('a', href=True):
+            if enlace['href'].endswith('.pdf'):
+                titulo = texto_fila.replace('Ver PDF', '').replace(enlace.get_text(), '').strip()
+                titulo = re.sub(r'\(CVE-\d+\).*', '', titulo).strip()
+                if titulo:
+                    filas.append(("AVISOS DESTACADOS", titulo, enlace['href']))
+    return filas
+
+
+def normas_particulares_beautifulsoup(html):
+    """Recorrido anterior de normas particulares: sección fija, sin buscarla en la página"""
+    filas = []
+    soup = BeautifulSoup(html, "html.parser")
+    for tr in soup.find_all('tr', class_='content'):
+        tds = tr.find_all('td')
+        if len(tds) >= 2:
+            titulo = re.sub(r"Ver PDF.*", "", tds[0].get_text(strip=True)).strip()
+            link_tag = tds[1].find('a', href=True)
+            if link_tag and link_tag['href'].endswith('.pdf'):
+                filas.append(("NORMAS PARTICULARES", titulo, link_tag['href']))
+    return filas
+
+
+def casos():
+    """(nombre, html, recorrido anterior, parser nuevo) de cada página guardada"""
+    return [
+        ("sumario", leer_fixture('sumario.html'), sumario_beautifulsoup, parsear_sumario),
+        ("normas particulares", leer_fixture('normas_particulares.html'), normas_particulares_beautifulsoup,
+         lambda html: parsear_sumario(html, seccion_por_defecto="NORMAS PARTICULARES")),
+        ("avisos destacados", leer_fixture('avisos_destacados.html'), avisos_beautifulsoup, parsear_avisos_destacados),
+    ]
+
+
+def filas_comparables(filas):
+    """(sección, título sin espacios, PDF) de cada fila"""
+    return [(seccion, "".join(titulo.split()), url_pdf) for seccion, titulo, url_pdf, *_ in filas]
+
+
+def diferencias(anterior, nuevo, html):
+    """Filas en que el parser nuevo y el recorrido anterior no coinciden"""
+    filas_anterior, filas_nuevo = filas_comparables(anterior(html)), filas_comparables(nuevo(html))
+    if len(filas_anterior) != len(filas_nuevo):
+        return [(filas_anterior, filas_nuevo)]
+    return [(a, n) for a, n in zip(filas_anterior, filas_nuevo) if a != n]
+
+
+def main(repeticiones=50):
+    for nombre, html, anterior, nuevo in casos():
+        distintas = diferencias(anterior, nuevo, html)
+        if distintas:
+            raise SystemExit(f"{nombre}: el parser nuevo no extrae las mismas filas: {distintas}")
+
+    print(f"{'página':<22}{'BeautifulSoup':>16}{'lxml':>12}{'aceleración':>14}")
+    for nombre, html, anterior, nuevo in casos():
+        t_anterior = timeit.timeit(lambda: anterior(html), number=repeticiones) / repeticiones
+        t_nuevo = timeit.timeit(lambda: nuevo(html), number=repeticiones) / repeticiones
+        print(f"{nombre:<22}{t_anterior * 1000:>13.2f} ms{t_nuevo * 1000:>9.2f} ms{t_anterior / t_nuevo:>13.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
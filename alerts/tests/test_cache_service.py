@@ -2,12 +2,16 @@
 Tests para el servicio de caché
 """
 import pytest
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.core.cache import cache
 from datetime import datetime
 from alerts.services.cache_service import CacheService
 
+# Los tests nunca usan el caché configurado (directorio cache/ o Redis): cache.clear() lo vaciaría
+CACHE_EN_MEMORIA = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
 
+
+@override_settings(CACHES=CACHE_EN_MEMORIA)
 class TestCacheService(TestCase):
     """Tests para el servicio de caché"""
     
@@ -121,4 +125,32 @@ class TestCacheService(TestCase):
         self.assertEqual(hash1, hash2)
         
         # El hash debe ser de longitud fija (MD5)
-        self.assertEqual(len(hash1), 32)
\ No newline at end of file
+        self.assertEqual(len(hash1), 32)
+
+@override_settings(CACHES=CACHE_EN_MEMORIA)
+class TestCacheServiceCompresion(TestCase):
+    """Tests para la compresión de PDFs y la limpieza del caché"""
+
+    def setUp(self):
+        self.cache_service = CacheService()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_pdf_se_guarda_comprimido(self):
+        url = "https://example.com/grande.pdf"
+        content = b"%PDF-1.4 " + b"texto repetido " * 1000
+
+        self.cache_service.set_pdf_content(url, content)
+
+        guardado = cache.get(self.cache_service._generate_key("pdf", self.cache_service._hash_url(url)))
+        self.assertTrue(guardado.startswith(CacheService.PREFIJO_COMPRIMIDO))
+        self.assertLess(len(guardado), len(content))
+        self.assertEqual(self.cache_service.get_pdf_content(url), content)
+
+    def test_pdf_sin_comprimir_se_lee_igual(self):
+        """Entradas guardadas antes de la compresión siguen siendo válidas"""
+        url = "https://example.com/antiguo.pdf"
+        cache.set(self.cache_service._generate_key("pdf", self.cache_service._hash_url(url)), b"%PDF-1.4 antiguo")
+        self.assertEqual(self.cache_service.get_pdf_content(url), b"%PDF-1.4 antiguo")
@@ -0,0 +1,70 @@
+"""
+Tests para el calendario de publicación y la estimación de ediciones del Diario Oficial
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+from alerts import calendario_diario_oficial as calendario
+
+CACHE_EDICIONES = os.path.join(os.path.dirname(__file__), '..', '..', 'edition_cache.json')
+
+
+class TestCalendarioDiarioOficial(TestCase):
+    """Tests para dias_de_publicacion, estimar y validar"""
+
+    def test_feriados_2025(self):
+        feriados = calendario.feriados(2025)
+        for dia in [date(2025, 4, 18), date(2025, 4, 19), date(2025, 6, 20), date(2025, 7, 16),
+                    date(2025, 10, 31), date(2025, 12, 8)]:
+            self.assertIn(dia, feriados)
+        # San Pedro y San Pablo de 2023 (jueves) se trasladó al lunes 26
+        self.assertIn(date(2023, 6, 26), calendario.feriados(2023))
+
+    def test_conteo_cerrado_igual_al_conteo_dia_a_dia(self):
+        desde = date(2023, 12, 20)
+        for hasta in [desde + timedelta(days=n) for n in range(0, 800, 7)]:
+            esperado = sum(
+                calendario.es_dia_de_publicacion(desde + timedelta(days=i))
+                for i in range(1, (hasta - desde).days + 1)
+            )
+            self.assertEqual(calendario.dias_de_publicacion(desde, hasta), esperado)
+
+    def test_valida_las_ediciones_conocidas(self):
+        with open(CACHE_EDICIONES) as f:
+            ediciones = {datetime.strptime(k, "%d-%m-%Y").date(): int(v) for k, v in json.load(f).items()}
+
+        aciertos, discrepancias = calendario.validar(ediciones)
+
+        # Solo no cuadran el 16-07 (feriado) al 19-07: estimaciones antiguas que lo contaban
+        self.assertEqual(aciertos, len(ediciones) - 3)
+        self.assertEqual(discrepancias, [
+            calendario.Discrepancia(date(2025, 7, 15), date(2025, 7, 16), 44199, 44200),
+            calendario.Discrepancia(date(2025, 7, 19), date(2025, 7, 21), 44204, 44203),
+        ])
+
+    def test_fuera_de_calendario(self):
+        with open(CACHE_EDICIONES) as f:
+            ediciones = {datetime.strptime(k, "%d-%m-%Y").date(): int(v) for k, v in json.load(f).items()}
+
+        self.assertEqual(calendario.fuera_de_calendario(ediciones),
+                         [date(2025, 7, 16), date(2025, 7, 17), date(2025, 7, 18), date(2025, 7, 19)])
+
+        # Un desfase que se mantiene hasta el final (feriado no previsto) se conserva
+        ediciones = {date(2025, 7, 14): 44198, date(2025, 7, 15): 44199, date(2025, 7, 17): 44199,
+                     date(2025, 7, 18): 44200}
+        self.assertEqual(calendario.fuera_de_calendario(ediciones), [])
+        self.assertEqual(calendario.fuera_de_calendario({}), [])
+
+    def test_estimar_y_confianza(self):
+        estimacion = calendario.estimar(date(2025, 7, 23), (date(2025, 7, 21), 44203))
+        self.assertEqual(estimacion.numero, 44205)
+        self.assertAlmostEqual(estimacion.confianza, 0.99 ** 2, places=4)
+
+        # En domingo o feriado no hay edición ordinaria
+        self.assertEqual(calendario.estimar(date(2025, 7, 16), (date(2025, 7, 15), 44199)).confianza, 0.0)
+        self.assertEqual(calendario.estimar(date(2025, 7, 20), (date(2025, 7, 19), 44202)).confianza, 0.0)
+
+        # Fuera de los años con feriados extraordinarios cargados, la confianza se reduce a la mitad
+        lejana = calendario.estimar(date(2027, 1, 4), (date(2026, 12, 30), 44640))
+        self.assertLess(lejana.confianza, 0.5)
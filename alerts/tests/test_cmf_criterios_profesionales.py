@@ -0,0 +1,104 @@
+"""
+Tests para la clasificación de empresas y hechos de los criterios profesionales CMF
+"""
+import random
+from unittest import TestCase
+from alerts.cmf_criterios_profesionales import (
+    CATEGORIAS_HECHOS, EMPRESAS_ESTRATEGICAS, EMPRESAS_IPSA, clasificar_criticidad, clasificar_empresa,
+    es_empresa_estrategica, es_empresa_ipsa, evaluar_criticidad_hecho
+)
+
+
+def _coincide_por_recorrido(nombre, empresas):
+    """Implementación original: recorre la lista buscando subcadenas en ambos sentidos"""
+    nombre_upper = nombre.upper().strip()
+    return any(e in nombre_upper or nombre_upper in e for e in empresas)
+
+
+# Entidades tal como aparecen en los hechos esenciales de la CMF, más casos borde
+CORPUS = [
+    "BANCO DE CHILE", "Banco de Chile", "  banco santander-chile  ", "BANCO BICE", "Banco Internacional",
+    "S.A.C.I. FALABELLA", "CENCOSUD S.A.", "Cencosud Shopping S.A.", "EMPRESAS COPEC S.A.",
+    "SOCIEDAD QUIMICA Y MINERA DE CHILE S.A.", "SQM", "sqm-b", "VIÑA CONCHA Y TORO S.A.",
+    "LATAM AIRLINES GROUP S.A.", "Latam", "AFP CAPITAL S.A.", "A.F.P. HABITAT S.A.", "AFP UNO",
+    "ENJOY S.A.", "Salfacorp S.A.", "INVERSIONES LA CONSTRUCCION S.A.", "Compañía Cervecerías Unidas S.A.",
+    "AGUAS ANDINAS S.A.", "Aguas", "BAN", "CO", "C", "E", "Ñ", "", "   ",
+    "FONDO DE INVERSION LARRAIN VIAL", "Administradora General de Fondos Security S.A.",
+    "SOCIEDAD DE INVERSIONES ORO BLANCO S.A.", "Telefónica Chile S.A.", "Sonda", "PUERTO VENTANAS",
+    "Compañía Sud Americana de Vapores S.A.", "Inversiones Aguas Metropolitanas", "Itaú Chile",
+    "Empresa Nacional de Telecomunicaciones S.A. (ENTEL)", "Molibdenos y Metales S.A.", "Modelo",
+]
+CORPUS += sorted(EMPRESAS_IPSA | EMPRESAS_ESTRATEGICAS)
+CORPUS += [e.lower()[1:-1] for e in sorted(EMPRESAS_IPSA | EMPRESAS_ESTRATEGICAS)]
+
+
+class TestClasificarEmpresa(TestCase):
+    """Tests para es_empresa_ipsa, es_empresa_estrategica y clasificar_empresa"""
+
+    def test_mismo_resultado_que_el_recorrido(self):
+        for nombre in CORPUS:
+            with self.subTest(nombre=nombre):
+                es_ipsa = _coincide_por_recorrido(nombre, EMPRESAS_IPSA)
+                self.assertEqual(es_empresa_ipsa(nombre), es_ipsa)
+                self.assertEqual(
+                    es_empresa_estrategica(nombre),
+                    es_ipsa or _coincide_por_recorrido(nombre, EMPRESAS_ESTRATEGICAS),
+                )
+
+    def test_casos_conocidos(self):
+        self.assertEqual(clasificar_empresa("Banco de Chile"), (True, True))
+        self.assertEqual(clasificar_empresa("LATAM AIRLINES GROUP S.A."), (False, True))
+        self.assertEqual(clasificar_empresa("Telefónica Chile S.A."), (False, False))
+
+
+def _categoria_por_recorrido(texto):
+    """Implementación original: prueba cada palabra clave de cada categoría con `in`"""
+    for categoria, info in CATEGORIAS_HECHOS.items():
+        for keyword in info["keywords"]:
+            if keyword in texto:
+                return categoria
+    return "RUTINARIO"
+
+
+def corpus_criticidad(cantidad=500, semilla=7):
+    """Títulos reales de hechos esenciales y textos armados con palabras clave superpuestas"""
+    keywords = [k for info in CATEGORIAS_HECHOS.values() for k in info["keywords"]]
+    textos = [
+        "Citación a Junta Extraordinaria de Accionistas", "Renuncia Gerente General",
+        "Colocación de bonos en el mercado local", "Adquisición de activos en Europa",
+        "Reparto de dividendo provisorio", "Fe de erratas", "Otros", "",
+        "Oferta Pública de Adquisición de Acciones (OPA)", "Cambio de control y fusión por absorción",
+        "Acuerdo de división de la sociedad", "Incumplimiento de covenant y aceleracion de deuda",
+    ]
+    textos += keywords
+    textos += [f"la sociedad informa {k} en sesión de directorio" for k in keywords]
+    aleatorio = random.Random(semilla)
+    relleno = ["sociedad", "informa", "de", "acuerdo", "junta", "emisión", "cambio", "control", "por"]
+    for _ in range(cantidad):
+        partes = aleatorio.sample(keywords, 3) + aleatorio.sample(relleno, 4)
+        aleatorio.shuffle(partes)
+        # Sin espacios a veces, para que las palabras clave se superpongan
+        textos.append(aleatorio.choice([" ", ""]).join(partes))
+    return textos
+
+
+class TestClasificarCriticidad(TestCase):
+    """Equivalencia del clasificador compilado con el recorrido por categorías"""
+
+    def test_misma_categoria_y_todas_las_palabras(self):
+        keywords = {k for info in CATEGORIAS_HECHOS.values() for k in info["keywords"]}
+        for texto in corpus_criticidad():
+            with self.subTest(texto=texto):
+                categoria, palabras_clave = clasificar_criticidad(texto)
+                self.assertEqual(categoria, _categoria_por_recorrido(texto.lower()))
+                self.assertEqual(set(palabras_clave), {k for k in keywords if k in texto.lower()})
+
+    def test_prefijo_de_otra_categoria(self):
+        # "adquisicion" (crítico) es prefijo de "adquisicion de activos" (importante)
+        self.assertEqual(clasificar_criticidad("Adquisicion de activos"),
+                         ("CRITICO", ("adquisicion", "adquisicion de activos")))
+        self.assertEqual(clasificar_criticidad("Hecho esencial", "sin palabras clave"), ("RUTINARIO", ()))
+
+    def test_evaluar_criticidad_hecho(self):
+        self.assertEqual(evaluar_criticidad_hecho("Renuncia Gerente General", "", "LATAM AIRLINES GROUP S.A."),
+                         ("IMPORTANTE", 7.5, True))
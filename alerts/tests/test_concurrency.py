@@ -0,0 +1,154 @@
+"""
+Tests para las utilidades de ejecución en paralelo
+"""
+import threading
+import time
+from unittest import TestCase
+from alerts.utils.concurrency import LimitesConcurrencia, ejecutar_con_plazos, ejecutar_en_paralelo
+from alerts.utils.rate_limiter import RateLimiter
+
+
+class TestEjecutarEnParalelo(TestCase):
+    """Tests para el pool acotado de hilos"""
+
+    def test_mantiene_orden_original(self):
+        """Los resultados deben volver en el orden de entrada aunque terminen desordenados"""
+        def tarea(n):
+            time.sleep(0.05 * (5 - n))
+            return n * 10
+
+        resultados = ejecutar_en_paralelo(tarea, range(5), max_workers=5)
+
+        self.assertEqual([r['resultado'] for r in resultados], [0, 10, 20, 30, 40])
+        self.assertEqual([r['item'] for r in resultados], [0, 1, 2, 3, 4])
+
+    def test_respeta_limite_de_concurrencia(self):
+        """Nunca debe haber más tareas simultáneas que max_workers"""
+        activos = 0
+        maximo = 0
+        lock = threading.Lock()
+
+        def tarea(n):
+            nonlocal activos, maximo
+            with lock:
+                activos += 1
+                maximo = max(maximo, activos)
+            time.sleep(0.02)
+            with lock:
+                activos -= 1
+            return n
+
+        ejecutar_en_paralelo(tarea, range(12), max_workers=3)
+        self.assertLessEqual(maximo, 3)
+
+    def test_captura_errores_por_item(self):
+        """Un error en un item no debe interrumpir al resto"""
+        def tarea(n):
+            if n == 2:
+                raise ValueError("falla")
+            return n
+
+        resultados = ejecutar_en_paralelo(tarea, range(4), max_workers=2)
+
+        self.assertIsInstance(resultados[2]['error'], ValueError)
+        self.assertEqual([r['resultado'] for r in resultados], [0, 1, None, 3])
+
+    def test_registra_duracion_por_item(self):
+        """Cada resultado debe incluir el tiempo de ejecución de su item"""
+        resultados = ejecutar_en_paralelo(lambda n: time.sleep(0.05), [1, 2], max_workers=2)
+        for resultado in resultados:
+            self.assertGreaterEqual(resultado['duracion'], 0.04)
+
+    def test_ejecucion_secuencial(self):
+        """Con un solo worker las tareas se ejecutan en el hilo actual"""
+        hilos = set()
+        ejecutar_en_paralelo(lambda n: hilos.add(threading.get_ident()), range(3), max_workers=1)
+        self.assertEqual(hilos, {threading.get_ident()})
+
+    def test_lista_vacia(self):
+        self.assertEqual(ejecutar_en_paralelo(lambda n: n, []), [])
+
+
+class TestLimitesConcurrencia(TestCase):
+    """Tests para los límites de concurrencia por proveedor"""
+
+    def test_limite_por_proveedor(self):
+        limites = LimitesConcurrencia({'openai': 2})
+        activos = {'openai': 0, 'cmf': 0}
+        maximos = {'openai': 0, 'cmf': 0}
+        lock = threading.Lock()
+
+        def tarea(proveedor):
+            with limites.limite(proveedor):
+                with lock:
+                    activos[proveedor] += 1
+                    maximos[proveedor] = max(maximos[proveedor], activos[proveedor])
+                time.sleep(0.02)
+                with lock:
+                    activos[proveedor] -= 1
+
+        ejecutar_en_paralelo(tarea, ['openai', 'cmf'] * 6, max_workers=12)
+
+        # 'cmf' no tiene límite configurado: usa el por defecto (1)
+        self.assertEqual(maximos, {'openai': 2, 'cmf': 1})
+
+    def test_mismo_semaforo_por_proveedor(self):
+        limites = LimitesConcurrencia(limite_por_defecto=3)
+        self.assertIs(limites.limite('gemini'), limites.limite('gemini'))
+        self.assertIsNot(limites.limite('gemini'), limites.limite('openai'))
+
+
+class TestRateLimiterConcurrente(TestCase):
+    """El rate limiter debe respetar su presupuesto con varios hilos esperando"""
+
+    def test_presupuesto_con_hilos(self):
+        limiter = RateLimiter(max_requests=2, time_window=0.3)
+        marcas = []
+        lock = threading.Lock()
+
+        def tarea(_):
+            limiter.acquire()
+            with lock:
+                marcas.append(time.time())
+
+        ejecutar_en_paralelo(tarea, range(6), max_workers=6)
+
+        marcas.sort()
+        # En cualquier ventana de 0.3s no puede haber más de 2 adquisiciones
+        for i in range(len(marcas) - 2):
+            self.assertGreaterEqual(marcas[i + 2] - marcas[i], 0.3)
+
+
+class TestEjecutarConPlazos(TestCase):
+    """Tests para la ejecución de fuentes independientes con plazos"""
+
+    def test_tiempo_total_es_el_maximo(self):
+        inicio = time.time()
+        resultados = ejecutar_con_plazos(
+            {'a': lambda: time.sleep(0.2) or 'A', 'b': lambda: time.sleep(0.2) or 'B'},
+            {'a': 5, 'b': 5}
+        )
+        self.assertLess(time.time() - inicio, 0.35)
+        self.assertEqual({k: r['resultado'] for k, r in resultados.items()}, {'a': 'A', 'b': 'B'})
+
+    def test_fuente_lenta_se_abandona(self):
+        inicio = time.time()
+        resultados = ejecutar_con_plazos(
+            {'rapida': lambda: 1, 'lenta': lambda: time.sleep(1) or 2},
+            {'lenta': 0.1},
+            plazo_por_defecto=5
+        )
+        self.assertLess(time.time() - inicio, 0.5)
+        self.assertEqual(resultados['rapida']['resultado'], 1)
+        self.assertTrue(resultados['lenta']['vencido'])
+        self.assertIsNone(resultados['lenta']['resultado'])
+
+    def test_error_de_una_fuente(self):
+        def fallar():
+            raise RuntimeError("caída")
+
+        resultados = ejecutar_con_plazos({'ok': lambda: 1, 'mala': fallar}, {})
+
+        self.assertEqual(resultados['ok']['resultado'], 1)
+        self.assertIsInstance(resultados['mala']['error'], RuntimeError)
+        self.assertFalse(resultados['mala']['vencido'])
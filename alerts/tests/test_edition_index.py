@@ -0,0 +1,88 @@
+"""
+Tests para el índice de ediciones del Diario Oficial
+"""
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from alerts.models import Edicion
+from alerts.scraper_diario_oficial import estimar_edicion_por_dias_habiles
+from alerts.services.edition_index import EditionIndex
+
+
+class TestEditionIndex(TestCase):
+    """Tests para EditionIndex y el comando importar_ediciones"""
+
+    def setUp(self):
+        self.indice = EditionIndex()
+
+    def test_registrar_y_get(self):
+        self.assertIsNone(self.indice.get(date(2025, 7, 11)))
+        self.assertTrue(self.indice.registrar(date(2025, 7, 11), '44196'))
+        self.assertEqual(self.indice.get(date(2025, 7, 11)), '44196')
+
+        # Registrar de nuevo la misma fecha actualiza en vez de duplicar
+        self.indice.registrar(date(2025, 7, 11), '44197', origen='selenium')
+        self.assertEqual(Edicion.objects.get().numero, 44197)
+        self.assertEqual(Edicion.objects.get().origen, 'selenium')
+
+    def test_el_sitio_reasigna_un_numero_repetido(self):
+        self.indice.registrar(date(2025, 7, 21), 44203)
+        self.indice.registrar(date(2025, 7, 19), 44203)
+
+        self.assertEqual(list(Edicion.objects.values_list('fecha', 'numero')),
+                         [(date(2025, 7, 21), None), (date(2025, 7, 19), 44203)])
+        self.assertIsNone(self.indice.get(date(2025, 7, 21)))
+        self.assertEqual(self.indice.referencia_anterior(date(2025, 7, 22)), (date(2025, 7, 19), 44203))
+
+    def test_referencia_anterior(self):
+        self.indice.registrar_varios({date(2025, 7, 7): 44192, date(2025, 7, 11): 44196, date(2025, 7, 14): 44198})
+
+        self.assertEqual(self.indice.referencia_anterior(date(2025, 7, 13)), (date(2025, 7, 11), 44196))
+        self.assertEqual(self.indice.referencia_anterior(date(2025, 7, 14)), (date(2025, 7, 14), 44198))
+        self.assertIsNone(self.indice.referencia_anterior(date(2025, 7, 6)))
+
+    def test_carga_masiva_omite_numeros_repetidos(self):
+        guardadas = self.indice.registrar_varios({
+            date(2025, 7, 18): 44202,
+            date(2025, 7, 19): 44203,
+            date(2025, 7, 21): 44203,
+        })
+
+        self.assertEqual(guardadas, 2)
+        self.assertIsNone(self.indice.get(date(2025, 7, 21)))
+        self.assertEqual(self.indice.get(date(2025, 7, 19)), '44203')
+
+    def test_estimacion_desde_la_referencia_anterior(self):
+        self.indice.registrar(date(2025, 7, 11), 44196)
+
+        # Sábado 12, lunes 14 y martes 15: tres días de publicación después del viernes 11
+        self.assertEqual(estimar_edicion_por_dias_habiles('15-07-2025'), '44199')
+        self.assertFalse(Edicion.objects.filter(fecha=date(2025, 7, 15)).exists())
+
+    def test_comando_importa_el_archivo(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"11-07-2025": "44196", "12-07-2025": "44197"}, f)
+        self.addCleanup(os.remove, f.name)
+
+        call_command('importar_ediciones', archivo=f.name, stdout=StringIO())
+
+        self.assertEqual(
+            list(Edicion.objects.order_by('fecha').values_list('numero', 'origen')),
+            [(44196, 'archivo'), (44197, 'archivo')]
+        )
+
+    def test_comando_no_importa_ediciones_fuera_de_calendario(self):
+        salida = StringIO()
+
+        call_command('importar_ediciones', archivo=os.path.join(os.path.dirname(__file__), '..', '..',
+                                                                'edition_cache.json'), stdout=salida)
+
+        # 16..19-07 tienen los números corridos en uno; gana el 21-07 del sitio
+        self.assertEqual(self.indice.get(date(2025, 7, 21)), '44203')
+        self.assertEqual(self.indice.get(date(2025, 7, 15)), '44199')
+        self.assertFalse(Edicion.objects.filter(fecha__range=(date(2025, 7, 16), date(2025, 7, 19))).exists())
+        self.assertIn("16-07-2025, 17-07-2025, 18-07-2025, 19-07-2025", salida.getvalue())
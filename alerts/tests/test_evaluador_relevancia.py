@@ -0,0 +1,181 @@
+"""
+Tests para la evaluación de relevancia en lote
+"""
+import json
+from datetime import timedelta
+from unittest import TestCase
+from unittest.mock import patch
+from django.test import TestCase as DjangoTestCase
+from django.utils import timezone
+from alerts.evaluador_relevancia import EvaluadorRelevancia
+from alerts.models import VeredictoRelevancia
+from alerts.services.verdict_cache import VerdictCache
+
+
+def crear_evaluador(use_openai=False, cache_veredictos=None):
+    """Crea un evaluador sin leer variables de entorno"""
+    evaluador = EvaluadorRelevancia.__new__(EvaluadorRelevancia)
+    evaluador.cache_veredictos = cache_veredictos
+    evaluador.openai_api_key = 'test' if use_openai else None
+    evaluador.use_openai = use_openai
+    evaluador.use_groq = False
+    evaluador.use_deepseek = False
+    evaluador.model = None
+    return evaluador
+
+
+class TestParsearRespuestaLote(TestCase):
+    """Tests para el parseo de respuestas JSON de la IA"""
+
+    def test_respuesta_valida(self):
+        respuesta = json.dumps({"resultados": [
+            {"id": 1, "relevante": True, "razon": "Ley nacional"},
+            {"id": 2, "relevante": False, "razon": "Nombramiento"},
+        ]})
+        veredictos = EvaluadorRelevancia._parsear_respuesta_lote(respuesta, 2)
+        self.assertEqual(veredictos, {1: (True, "Ley nacional"), 2: (False, "Nombramiento")})
+
+    def test_tolera_texto_alrededor_del_json(self):
+        respuesta = '```json\n[{"id": 1, "relevante": "SÍ", "razon": "x"}]\n```'
+        veredictos = EvaluadorRelevancia._parsear_respuesta_lote(respuesta, 1)
+        self.assertEqual(veredictos, {1: (True, "x")})
+
+    def test_descarta_items_mal_formados(self):
+        respuesta = json.dumps({"resultados": [
+            {"id": 1, "relevante": "quizás"},
+            {"id": 7, "relevante": True},
+            {"id": "dos", "relevante": True},
+            {"id": 3, "relevante": False},
+        ]})
+        veredictos = EvaluadorRelevancia._parsear_respuesta_lote(respuesta, 3)
+        self.assertEqual(veredictos, {3: (False, "Evaluado por IA")})
+
+    def test_respuesta_invalida(self):
+        self.assertEqual(EvaluadorRelevancia._parsear_respuesta_lote("no es json", 2), {})
+        self.assertEqual(EvaluadorRelevancia._parsear_respuesta_lote("", 2), {})
+
+
+class TestEvaluarLote(TestCase):
+    """Tests para la evaluación de una edición completa en lotes"""
+
+    def test_sin_ia_usa_reglas(self):
+        evaluador = crear_evaluador()
+        titulos = ["Ley número 21.000 que modifica el código del trabajo", "Nombra a Juan Pérez"]
+        self.assertEqual(
+            evaluador.evaluar_lote(titulos),
+            [evaluador._evaluar_con_reglas(t) for t in titulos]
+        )
+
+    def test_divide_en_lotes_y_mantiene_orden(self):
+        evaluador = crear_evaluador(use_openai=True)
+        titulos = [f"Publicación {i}" for i in range(5)]
+
+        def responder(bloque):
+            return json.dumps({"resultados": [
+                {"id": i, "relevante": i % 2 == 0, "razon": titulo}
+                for i, titulo in enumerate(bloque, start=1)
+            ]})
+
+        with patch.object(evaluador, '_consultar_lote', side_effect=responder) as consultar:
+            resultados = evaluador.evaluar_lote(titulos, tamano_lote=2)
+
+        self.assertEqual(consultar.call_count, 3)
+        self.assertEqual([razon for _, razon in resultados], titulos)
+        self.assertEqual([rel for rel, _ in resultados], [False, True, False, True, False])
+
+    def test_items_faltantes_usan_reglas(self):
+        evaluador = crear_evaluador(use_openai=True)
+        titulos = ["Publicación sin veredicto", "Nombra a Juan Pérez"]
+        respuesta = json.dumps({"resultados": [{"id": 1, "relevante": True, "razon": "IA"}]})
+
+        with patch.object(evaluador, '_consultar_lote', return_value=respuesta):
+            resultados = evaluador.evaluar_lote(titulos)
+
+        self.assertEqual(resultados[0], (True, "IA"))
+        self.assertEqual(resultados[1], evaluador._evaluar_con_reglas(titulos[1]))
+        self.assertEqual(evaluador.titulos_por_reglas(), {titulos[1]})
+
+    def test_error_del_proveedor_usa_reglas(self):
+        evaluador = crear_evaluador(use_openai=True)
+        titulos = ["Nombra a Juan Pérez"]
+
+        with patch.object(evaluador, '_consultar_lote', side_effect=RuntimeError("Error 500")):
+            resultados = evaluador.evaluar_lote(titulos)
+
+        self.assertEqual(resultados, [evaluador._evaluar_con_reglas(titulos[0])])
+
+
+class TestVerdictCache(DjangoTestCase):
+    """Tests para el caché persistente de veredictos"""
+
+    def setUp(self):
+        self.cache = VerdictCache('v1')
+
+    def test_clave_normaliza_titulo(self):
+        self.assertEqual(
+            VerdictCache.clave("Fija precios de paridad  para combustibles"),
+            VerdictCache.clave("FIJA PRECIOS DE PARIDAD PARA COMBUSTIBLES ")
+        )
+
+    def test_clave_usa_inicio_del_texto(self):
+        texto = "a" * 2000
+        self.assertEqual(VerdictCache.clave("T", texto), VerdictCache.clave("T", texto + "distinto"))
+        self.assertNotEqual(VerdictCache.clave("T", texto), VerdictCache.clave("T"))
+
+    def test_guarda_y_recupera(self):
+        self.cache.set("Ley 21.000", "texto", True, "Norma de alto nivel", "openai")
+        self.assertEqual(self.cache.get("LEY 21.000", "texto"), (True, "Norma de alto nivel"))
+        self.assertIsNone(self.cache.get("LEY 21.000"))
+
+    def test_cambio_de_version_invalida(self):
+        self.cache.set("Ley 21.000", None, True, "razón", "openai")
+        self.assertIsNone(VerdictCache('v2').get("Ley 21.000"))
+
+    def test_expiracion(self):
+        self.cache.set("Ley 21.000", None, True, "razón", "openai")
+        VeredictoRelevancia.objects.update(fecha_expiracion=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(self.cache.get("Ley 21.000"))
+        self.assertEqual(self.cache.purgar_expirados(), 1)
+
+    def test_get_many(self):
+        self.cache.set("A", None, True, "x", "groq")
+        self.cache.set("B", "texto", False, "y", "groq")
+        self.assertEqual(self.cache.get_many(["A", "B", "C"]), {"A": (True, "x")})
+
+
+class TestEvaluadorConCache(DjangoTestCase):
+    """La IA solo se consulta para títulos sin veredicto guardado"""
+
+    def setUp(self):
+        self.evaluador = crear_evaluador(use_openai=True, cache_veredictos=VerdictCache('v1'))
+
+    def test_evaluar_relevancia_reutiliza_veredicto(self):
+        with patch.object(self.evaluador, '_evaluar_con_openai', return_value=(True, "IA")) as openai:
+            self.assertEqual(self.evaluador.evaluar_relevancia("Tipos de cambio"), (True, "IA"))
+            self.assertEqual(self.evaluador.evaluar_relevancia("TIPOS DE CAMBIO"), (True, "IA"))
+        self.assertEqual(openai.call_count, 1)
+        self.assertEqual(VeredictoRelevancia.objects.get().proveedor, 'openai')
+
+    def test_no_guarda_veredictos_por_reglas(self):
+        def fallar(titulo, texto_pdf=None):
+            return self.evaluador._evaluar_con_reglas(titulo)
+
+        with patch.object(self.evaluador, '_evaluar_con_openai', side_effect=fallar):
+            self.evaluador.evaluar_relevancia("Nombra a don Juan Pérez")
+            self.assertTrue(self.evaluador.veredicto_por_reglas())
+        self.assertFalse(VeredictoRelevancia.objects.exists())
+
+        with patch.object(self.evaluador, '_evaluar_con_openai', return_value=(True, "IA")):
+            self.evaluador.evaluar_relevancia("Ley 21.000")
+        self.assertFalse(self.evaluador.veredicto_por_reglas())
+
+    def test_lote_solo_envia_titulos_nuevos(self):
+        self.evaluador.cache_veredictos.set("Conocido", None, False, "guardado", "openai")
+        respuesta = json.dumps({"resultados": [{"id": 1, "relevante": True, "razon": "nuevo"}]})
+
+        with patch.object(self.evaluador, '_consultar_lote', return_value=respuesta) as consultar:
+            resultados = self.evaluador.evaluar_lote(["Conocido", "Nuevo", "Nuevo"])
+
+        consultar.assert_called_once_with(["Nuevo"])
+        self.assertEqual(resultados, [(False, "guardado"), (True, "nuevo"), (True, "nuevo")])
+        self.assertEqual(self.evaluador.cache_veredictos.get("Nuevo"), (True, "nuevo"))
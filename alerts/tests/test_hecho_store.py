@@ -0,0 +1,94 @@
+"""
+Tests para el ingreso masivo de hechos esenciales
+"""
+from datetime import datetime
+from unittest.mock import patch
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from alerts.models import DocumentoBusqueda, Empresa, HechoEsencial
+from alerts.services.hecho_store import HechoStore
+
+FECHA = timezone.make_aware(datetime(2025, 7, 11))
+
+
+def hecho(n, empresa="Banco de Chile", **kwargs):
+    datos = {
+        "fecha": FECHA,
+        "empresa": empresa,
+        "titulo": f"Hecho esencial número {n}",
+        "url": f"https://www.cmfchile.cl/sitio/aplic/serdoc/ver_sgd.php?s567={n}",
+    }
+    datos.update(kwargs)
+    return datos
+
+
+class TestHechoStore(TestCase):
+    """Tests para HechoStore"""
+
+    def setUp(self):
+        self.store = HechoStore()
+
+    def test_registrar_crea_empresas_y_hechos(self):
+        Empresa.objects.create(nombre="Banco de Chile", es_ipsa=True)
+        hechos = [hecho(1), hecho(2, empresa="Falabella"), hecho(3, empresa="Viña Santa Rita"), hecho(1)]
+
+        registro = self.store.registrar(hechos)
+
+        self.assertEqual(registro.empresas_nuevas, ["Falabella", "Viña Santa Rita"])
+        self.assertEqual([(h.url, creado) for h, creado in registro.hechos],
+                         [(hechos[n]["url"], True) for n in range(3)])
+        self.assertTrue(all(h.pk for h, _ in registro.hechos))
+        self.assertEqual(
+            dict(HechoEsencial.objects.values_list('empresa__nombre', 'es_empresa_ipsa')),
+            {"Banco de Chile": True, "Falabella": True, "Viña Santa Rita": False},
+        )
+
+    def test_consultas_constantes(self):
+        self.store.registrar([hecho(n, empresa=f"Empresa {n % 7}") for n in range(50)])
+        hechos = [hecho(n, empresa=f"Empresa {n % 11}") for n in range(100)]
+
+        # Empresas: leer, crear y releer; hechos: leer, último id, crear y releer; más el savepoint
+        with self.assertNumQueries(9):
+            registro = self.store.registrar(hechos)
+
+        self.assertEqual(sum(creado for _, creado in registro.hechos), 50)
+        self.assertEqual(len(registro.empresas_nuevas), 4)
+        with self.assertNumQueries(0):
+            [h.empresa.nombre for h, _ in registro.hechos]
+
+    def test_hecho_creado_por_otra_ejecucion(self):
+        empresa = Empresa.objects.create(nombre="Banco de Chile")
+        hechos = [hecho(n) for n in range(3)]
+        in_bulk = QuerySet.in_bulk
+
+        def leer_y_otra_ejecucion_inserta(queryset, *args, **kwargs):
+            leidos = in_bulk(queryset, *args, **kwargs)
+            if queryset.model is HechoEsencial and not HechoEsencial.objects.filter(url=hechos[1]["url"]).exists():
+                HechoEsencial.objects.create(empresa=empresa, titulo="Otra ejecución", url=hechos[1]["url"],
+                                             fecha_publicacion=FECHA)
+            return leidos
+
+        with patch.object(QuerySet, 'in_bulk', autospec=True, side_effect=leer_y_otra_ejecucion_inserta):
+            registro = self.store.registrar(hechos)
+
+        self.assertEqual([(h.url, creado) for h, creado in registro.hechos],
+                         [(hechos[0]["url"], True), (hechos[1]["url"], False), (hechos[2]["url"], True)])
+        self.assertTrue(all(h.pk for h, _ in registro.hechos))
+        self.assertEqual(registro.hechos[1][0].titulo, "Otra ejecución")
+        self.assertEqual(HechoEsencial.objects.count(), 3)
+
+    def test_guardar_calculados(self):
+        registro = self.store.registrar([hecho(1, titulo="Reparto de dividendos"), hecho(2)])
+        procesados = [h for h, _ in registro.hechos]
+        for h in procesados:
+            h.resumen = "La junta acordó repartir dividendos"
+            h.categoria = 'IMPORTANTE'
+            h.relevancia_profesional = 7.5
+            h.relevancia = 2
+
+        self.assertEqual(self.store.guardar_calculados(procesados), 2)
+
+        self.assertEqual(HechoEsencial.objects.filter(categoria='IMPORTANTE', relevancia=2).count(), 2)
+        self.assertEqual(DocumentoBusqueda.objects.filter(tipo='hecho').count(), 2)
+        self.assertEqual(self.store.guardar_calculados([]), 0)
@@ -0,0 +1,130 @@
+"""
+Tests para el cliente HTTP compartido
+"""
+import asyncio
+from unittest import TestCase
+from unittest.mock import Mock, patch
+import httpx
+import requests
+from alerts.utils import http_client
+
+
+def respuesta(status_code):
+    response = Mock()
+    response.status_code = status_code
+    return response
+
+
+@patch('alerts.utils.http_client.time.sleep')
+@patch('alerts.utils.http_client.rate_limiter')
+class TestRequestSincrono(TestCase):
+    """Tests para las peticiones con la sesión compartida"""
+
+    def test_reutiliza_la_sesion(self, mock_limiter, mock_sleep):
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    @patch('alerts.utils.http_client.get_session')
+    def test_reintenta_estados_reintentables(self, mock_session, mock_limiter, mock_sleep):
+        mock_session.return_value.request.side_effect = [respuesta(503), respuesta(200)]
+
+        response = http_client.get('https://www.sii.cl/x.htm')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_limiter.acquire_for_url.call_count, 2)
+        mock_session.return_value.request.assert_called_with('GET', 'https://www.sii.cl/x.htm', timeout=30)
+
+    @patch('alerts.utils.http_client.get_session')
+    def test_retorna_ultima_respuesta_al_agotar_reintentos(self, mock_session, mock_limiter, mock_sleep):
+        mock_session.return_value.request.return_value = respuesta(500)
+
+        response = http_client.post('https://api.openai.com/v1/chat/completions', reintentos=1)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(mock_session.return_value.request.call_count, 2)
+
+    @patch('alerts.utils.http_client.get_session')
+    def test_relanza_error_de_conexion(self, mock_session, mock_limiter, mock_sleep):
+        mock_session.return_value.request.side_effect = requests.ConnectionError("sin red")
+
+        with self.assertRaises(requests.ConnectionError):
+            http_client.get('https://www.sii.cl/x.htm', reintentos=2)
+        self.assertEqual(mock_session.return_value.request.call_count, 3)
+
+    @patch('alerts.utils.http_client.get_session')
+    def test_sin_rate_limit(self, mock_session, mock_limiter, mock_sleep):
+        mock_session.return_value.request.return_value = respuesta(200)
+        http_client.get('https://www.sii.cl/x.htm', rate_limit=False)
+        mock_limiter.acquire_for_url.assert_not_called()
+
+
+@patch('alerts.utils.http_client._delay_reintento', new=Mock(return_value=0))
+class TestAsyncHTTPClient(TestCase):
+    """Tests para el cliente asíncrono"""
+
+    def test_peticiones_concurrentes_y_reintentos(self):
+        intentos = {}
+
+        def manejar(request):
+            url = str(request.url)
+            intentos[url] = intentos.get(url, 0) + 1
+            if url.endswith('/falla') and intentos[url] == 1:
+                return httpx.Response(502)
+            return httpx.Response(200, text=url)
+
+        async def ejecutar():
+            async with AsyncHTTPClient(transport=httpx.MockTransport(manejar)) as client:
+                return await asyncio.gather(
+                    client.get('https://a.cl/ok', rate_limit=False),
+                    client.get('https://b.cl/falla', rate_limit=False),
+                )
+
+        AsyncHTTPClient = http_client.AsyncHTTPClient
+        ok, reintentada = asyncio.run(ejecutar())
+
+        self.assertEqual(ok.text, 'https://a.cl/ok')
+        self.assertEqual(reintentada.status_code, 200)
+        self.assertEqual(intentos['https://b.cl/falla'], 2)
+
+    def test_obtener_varios_lista_vacia(self):
+        self.assertEqual(http_client.obtener_varios([]), [])
+
+    def test_obtener_varios_con_un_event_loop_corriendo(self):
+        transporte = httpx.MockTransport(lambda request: httpx.Response(200, text=str(request.url)))
+        cliente = http_client.AsyncHTTPClient
+        urls = ['https://a.cl/1', 'https://b.cl/2']
+
+        async def desde_codigo_asincrono():
+            return http_client.obtener_varios(urls, rate_limit=False), \
+                await http_client.obtener_varios_async(urls, rate_limit=False)
+
+        with patch('alerts.utils.http_client.AsyncHTTPClient', lambda: cliente(transport=transporte)):
+            self.assertEqual([r.text for r in http_client.obtener_varios(urls, rate_limit=False)], urls)
+            sincronas, asincronas = asyncio.run(desde_codigo_asincrono())
+
+        self.assertEqual([r.text for r in sincronas], urls)
+        self.assertEqual([r.text for r in asincronas], urls)
+
+
+class TestPeticionesCondicionales(TestCase):
+    """Tests para los validadores y las cabeceras condicionales"""
+
+    def test_validadores_y_cabeceras(self):
+        response = httpx.Response(200, text="<html/>", headers={'ETag': '"abc"', 'Last-Modified': 'Fri, 11 Jul 2025 08:00:00 GMT'})
+
+        validadores = http_client.validadores(response)
+
+        self.assertEqual(http_client.cabeceras_condicionales(validadores), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Fri, 11 Jul 2025 08:00:00 GMT',
+        })
+        self.assertEqual(http_client.cabeceras_condicionales(None), {})
+
+    def test_sin_cambios(self):
+        previos = http_client.validadores(httpx.Response(200, text="sumario"))
+
+        self.assertTrue(http_client.sin_cambios(httpx.Response(304), previos))
+        # Sin ETag ni Last-Modified se compara el contenido
+        self.assertTrue(http_client.sin_cambios(httpx.Response(200, text="sumario"), previos))
+        self.assertFalse(http_client.sin_cambios(httpx.Response(200, text="sumario nuevo"), previos))
+        self.assertFalse(http_client.sin_cambios(httpx.Response(304), None))
+        self.assertFalse(http_client.sin_cambios(httpx.ConnectError("x"), previos))
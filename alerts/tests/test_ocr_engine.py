@@ -0,0 +1,91 @@
+"""
+Tests para el motor de OCR
+"""
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from alerts.services.ocr_engine import OCREngine, PresupuestoOCRAgotado, reconocer_pagina
+from alerts.services.pdf_extractor import PDFExtractor
+
+
+class TestOCREngine(TestCase):
+    """Tests para OCREngine"""
+
+    @patch('alerts.services.ocr_engine.reconocer_pagina')
+    def test_reconoce_en_orden_y_suma_cpu(self, mock_pagina):
+        mock_pagina.side_effect = [("pagina 1", 2.0), ("pagina 2", 3.0)]
+        engine = OCREngine(max_workers=1, presupuesto_cpu=100)
+
+        textos = engine.reconocer([Mock(), Mock()], mejorado=True)
+
+        self.assertEqual(textos, ["pagina 1", "pagina 2"])
+        self.assertEqual(engine.cpu_usado, 5.0)
+        self.assertTrue(all(c.args[1] for c in mock_pagina.call_args_list))
+
+    @patch('alerts.services.ocr_engine.reconocer_pagina')
+    def test_presupuesto_agotado(self, mock_pagina):
+        mock_pagina.return_value = ("texto", 6.0)
+        engine = OCREngine(max_workers=1, presupuesto_cpu=10)
+
+        with self.assertRaises(PresupuestoOCRAgotado):
+            engine.reconocer([Mock(), Mock(), Mock()])
+        self.assertEqual(mock_pagina.call_count, 2)
+
+        # Sin presupuesto no se intenta ninguna página más
+        with self.assertRaises(PresupuestoOCRAgotado):
+            engine.reconocer([Mock()])
+        self.assertEqual(mock_pagina.call_count, 2)
+
+        engine.reiniciar_presupuesto()
+        self.assertEqual(engine.reconocer([Mock()]), ["texto"])
+
+    @patch('alerts.services.ocr_engine._tesseract', return_value="texto")
+    def test_en_proceso_cuenta_solo_la_pagina(self, mock_tesseract):
+        # Otra tarea consume CPU del proceso mientras tanto (p. ej. un hilo de descargas)
+        with patch('alerts.services.ocr_engine._tiempo_cpu_proceso', side_effect=[0.0, 50.0]):
+            texto, segundos = reconocer_pagina(Mock())
+
+        self.assertEqual(texto, "texto")
+        self.assertLess(segundos, 1.0)
+
+    def test_pool_no_usa_fork(self):
+        engine = OCREngine(max_workers=2)
+        self.addCleanup(engine.cerrar)
+
+        self.assertIn(engine._obtener_pool()._mp_context.get_start_method(), ('forkserver', 'spawn'))
+
+
+class TestPDFExtractorOCR(TestCase):
+    """Tests de la integración del motor de OCR con PDFExtractor"""
+
+    def setUp(self):
+        self.engine = Mock(max_workers=4)
+        self.extractor = PDFExtractor(ocr_engine=self.engine)
+        self.extractor._extract_with_pypdf2 = Mock(return_value="")
+        self.extractor._extract_with_pdfminer = Mock(return_value="")
+        self.extractor.methods_priority = [
+            ('pypdf2', self.extractor._extract_with_pypdf2),
+            ('pdfminer', self.extractor._extract_with_pdfminer),
+            ('ocr', self.extractor._extract_with_ocr),
+            ('ocr_enhanced', self.extractor._extract_with_enhanced_ocr),
+        ]
+
+    @patch('alerts.services.pdf_extractor.convert_from_bytes')
+    def test_rasteriza_una_vez_para_ambos_ocr(self, mock_convert):
+        mock_convert.return_value = [Mock(), Mock()]
+        texto_valido = "Texto reconocido por el OCR mejorado con suficientes palabras para ser considerado válido"
+        self.engine.reconocer.side_effect = [["~~", "##"], [texto_valido, ""]]
+
+        text, method = self.extractor.extract_text(b"%PDF escaneado", max_pages=2)
+
+        self.assertEqual(method, "ocr_enhanced")
+        self.assertEqual(text, texto_valido)
+        mock_convert.assert_called_once_with(b"%PDF escaneado", first_page=1, last_page=2, dpi=300)
+        self.assertEqual(self.engine.reconocer.call_args_list[1].kwargs, {'mejorado': True})
+
+    @patch('alerts.services.pdf_extractor.convert_from_bytes')
+    def test_presupuesto_agotado_detiene_la_extraccion(self, mock_convert):
+        mock_convert.return_value = [Mock()]
+        self.engine.reconocer.side_effect = PresupuestoOCRAgotado("agotado")
+
+        self.assertEqual(self.extractor.extract_text(b"%PDF"), ("", "failed"))
+        self.assertEqual(self.engine.reconocer.call_count, 1)
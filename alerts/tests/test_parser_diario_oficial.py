@@ -0,0 +1,98 @@
+"""
+Tests para el parser de las páginas índice del Diario Oficial
+"""
+import os
+from unittest import TestCase
+from alerts.parser_diario_oficial import (
+    FilaEdicion, extraer_numero_edicion, numero_edicion_de_url, parsear_avisos_destacados, parsear_sumario
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'diario_oficial')
+
+
+def leer_fixture(nombre):
+    with open(os.path.join(FIXTURES, nombre), encoding='utf-8') as f:
+        return f.read()
+
+
+class TestParserDiarioOficial(TestCase):
+    """Tests para parsear_sumario y parsear_avisos_destacados"""
+
+    def test_sumario_normas_generales(self):
+        filas = parsear_sumario(leer_fixture('sumario.html'))
+
+        self.assertEqual(len(filas), 17)
+        self.assertTrue(all(f.seccion == "NORMAS GENERALES" for f in filas))
+        self.assertEqual(filas[0], FilaEdicion(
+            "NORMAS GENERALES",
+            "Extracto de resolución exenta número 73, de 2025.- Complementa lista anexa de "
+            "resolución N° 8 exenta, de 2024",
+            "https://www.diariooficial.interior.gob.cl/publicaciones/2025/07/11/44196/01/2667213.pdf",
+            "MINISTERIO DE HACIENDA",
+        ))
+        self.assertEqual(filas[-1].organismo, "BANCO CENTRAL DE CHILE")
+        self.assertFalse(any("Ver PDF" in f.titulo for f in filas))
+
+    def test_normas_particulares(self):
+        filas = parsear_sumario(leer_fixture('normas_particulares.html'), seccion_por_defecto="NORMAS PARTICULARES")
+
+        # La fila sin PDF se omite
+        self.assertEqual([f.url_pdf[-11:] for f in filas], ["2668001.pdf", "2668002.pdf", "2668003.pdf", "2668004.pdf"])
+        self.assertTrue(all(f.seccion == "NORMAS PARTICULARES" for f in filas))
+        self.assertEqual(filas[2].titulo, "Resolución número 32.101 exenta, de 2025.- Autoriza a "
+                                          "Empresa Eléctrica de Aisén S.A. a modificar instalaciones")
+        self.assertEqual(filas[2].organismo, "MINISTERIO DE ENERGÍA")
+        self.assertEqual(filas[3].organismo, "MUNICIPALIDAD DE LAS CONDES")
+
+    def test_seccion_sale_de_la_fila_de_titulo(self):
+        html = """<table>
+            <tr><td class="title2">Avisos Destacados</td><td></td></tr>
+            <tr class="content"><td>Aviso</td><td><a href="/a.pdf">Ver PDF</a></td></tr>
+        </table>"""
+        self.assertEqual(parsear_sumario(html)[0].seccion, "AVISOS DESTACADOS")
+
+    def test_avisos_destacados(self):
+        filas = parsear_avisos_destacados(leer_fixture('avisos_destacados.html'))
+
+        self.assertEqual([f.titulo for f in filas], [
+            "Tipos de cambio y paridades de monedas extranjeras para efectos del número 6 del Capítulo I "
+            "del Compendio de Normas de Cambios Internacionales y la Circular N° 1",
+            "Llamado a licitación pública para la adquisición de durmientes de hormigón",
+            "Concurso público para proveer el cargo de Jefe de División de Fiscalización",
+        ])
+        self.assertTrue(all(f.seccion == "AVISOS DESTACADOS" for f in filas))
+
+    def test_mismas_filas_que_el_recorrido_anterior(self):
+        from alerts.tests.benchmark_parser_diario_oficial import casos, diferencias
+
+        for nombre, html, anterior, nuevo in casos():
+            with self.subTest(pagina=nombre):
+                self.assertEqual(diferencias(anterior, nuevo, html), [])
+
+
+class TestNumeroEdicion(TestCase):
+    """Tests para extraer_numero_edicion"""
+
+    def test_indice_de_la_edicion(self):
+        self.assertEqual(extraer_numero_edicion(leer_fixture('sumario.html'), '11-07-2025'), '44196')
+
+    def test_indice_de_otra_fecha_no_cuenta(self):
+        # Sin edición para la fecha, el sitio muestra la última publicada
+        self.assertIsNone(extraer_numero_edicion(leer_fixture('sumario.html'), '12-07-2025'))
+
+    def test_selector_de_ediciones(self):
+        html = """<select id="ediciones">
+            <option value="/publicaciones/2025/07/11/edicion-44196/">44.196</option>
+            <option value="/publicaciones/2025/07/11/edicion-44197/" selected>44.197 (extraordinaria)</option>
+        </select>"""
+        self.assertEqual(extraer_numero_edicion(html, '11-07-2025'), '44197')
+
+    def test_opcion_seleccionada_de_otra_fecha_no_cuenta(self):
+        # Sin edición para el domingo 13, el selector queda en la última publicada
+        html = """<select id="ediciones">
+            <option value="/publicaciones/2025/07/12/edicion-44197/" selected>44.197</option>
+        </select>"""
+        self.assertIsNone(extraer_numero_edicion(html, '13-07-2025'))
+        self.assertIsNone(numero_edicion_de_url("/edicion-44197/", '12-07-2025'))
+        self.assertEqual(numero_edicion_de_url("https://www.diariooficial.interior.gob.cl/publicaciones/2025/07/12/"
+                                               "edicion-44197/", '12-07-2025'), '44197')
@@ -1,12 +1,44 @@
 """
 Tests para el servicio de extracción de PDFs
 """
+import io
 import pytest
 from unittest import TestCase
 from unittest.mock import Mock, patch, MagicMock
+from PIL import Image
 from alerts.services.pdf_extractor import PDFExtractor
 
 
+def pdf_con_texto(texto="Documento con capa de texto"):
+    """Construye un PDF mínimo de una página con texto en Helvetica"""
+    contenido = f"BT /F1 12 Tf 72 720 Td ({texto}) Tj ET".encode()
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(contenido), contenido),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for i, objeto in enumerate(objetos, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (i, objeto)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, xref)
+    return pdf
+
+
+def pdf_escaneado():
+    """Construye un PDF de una página que solo contiene una imagen"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (200, 200), 'white').save(buffer, 'PDF')
+    return buffer.getvalue()
+
+
 class TestPDFExtractor(TestCase):
     """Tests para el servicio de extracción de PDFs"""
     
@@ -184,4 +216,59 @@ class TestPDFExtractor(TestCase):
         text = self.extractor._extract_with_ocr(pdf_content, max_pages=2)
         self.assertIn("OCR", text)
 
+    def _metodos_mock(self):
+        texto_valido = "Este es un texto válido con suficientes palabras para ser considerado útil en la extracción."
+        metodos = {nombre: Mock(return_value=texto_valido) for nombre in ('pypdf2', 'pdfminer', 'ocr', 'ocr_enhanced')}
+        self.extractor.methods_priority = list(metodos.items())
+        return metodos
+
+    def test_pdf_con_texto_nunca_usa_ocr(self):
+        """Un PDF nativo se envía solo a los extractores de capa de texto"""
+        metodos = self._metodos_mock()
+        metodos['pypdf2'].return_value = ""
+
+        _, method = self.extractor.extract_text(pdf_con_texto(), max_pages=2)
+
+        self.assertEqual(self.extractor._clasificar_pdf(pdf_con_texto(), 2), 'texto')
+        self.assertEqual(method, "pdfminer")
+        metodos['ocr'].assert_not_called()
+        self.assertEqual(self.extractor.rutas['texto'], 1)
+
+    def test_pdf_escaneado_va_directo_a_ocr(self):
+        """Un PDF de solo imágenes se salta PyPDF2 y PDFMiner"""
+        metodos = self._metodos_mock()
+
+        _, method = self.extractor.extract_text(pdf_escaneado(), max_pages=2)
+
+        self.assertEqual(method, "ocr")
+        metodos['pypdf2'].assert_not_called()
+        metodos['pdfminer'].assert_not_called()
+        self.assertEqual(self.extractor.rutas['escaneado'], 1)
+
+    def test_pdf_ilegible_prueba_todos_los_metodos(self):
+        self.assertEqual(self.extractor._clasificar_pdf(b"no es un pdf", 2), 'desconocido')
+
+    def test_max_chars_detiene_la_extraccion(self):
+        """Con max_chars no se procesan las páginas que sobran"""
+        procesadas = []
+
+        def paginas(pdf_content, max_pages):
+            for i in range(max_pages):
+                procesadas.append(i)
+                yield f"Página {i} " + "palabra " * 100
+
+        self.extractor._paginas_pypdf2 = paginas
+        text, method = self.extractor.extract_text(b"fake pdf content", max_pages=8, max_chars=1000)
+
+        self.assertEqual(method, "pypdf2")
+        self.assertEqual(procesadas, [0, 1])
+        self.assertIn("Página 1", text)
+        self.assertNotIn("Página 2", text)
+
+    def test_iter_pages_es_perezoso(self):
+        paginas = self.extractor.iter_pages(pdf_con_texto("Primera pagina"), max_pages=2)
+        self.assertIn("Primera pagina", next(paginas))
+        with self.assertRaises(StopIteration):
+            next(paginas)
+
     # Nota: Para testear el pipeline completo con archivos PDF reales, se recomienda un test de integración aparte con archivos válidos en el repo.
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Tests para el almacén de PDFs en disco
+"""
+import mmap
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import Mock, patch
+from django.test import TestCase
+from django.utils import timezone
+from alerts.models import PDFAlmacenado
+from alerts.services.pdf_extractor import PDFExtractor
+from alerts.services.pdf_store import PDFStore
+
+
+class TestPDFStore(TestCase):
+    """Tests para PDFStore"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = PDFStore(root=self.root, max_bytes=1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_guarda_y_lee_como_mmap(self):
+        self.store.put("https://x/a.pdf", b"%PDF contenido")
+
+        buffer = self.store.get("https://x/a.pdf")
+        self.assertIsInstance(buffer, mmap.mmap)
+        self.assertEqual(buffer[:], b"%PDF contenido")
+        buffer.close()
+        self.assertIsNone(self.store.get("https://x/otra.pdf"))
+
+    def test_mismo_contenido_se_guarda_una_vez(self):
+        sha_a = self.store.put("https://x/a.pdf", b"%PDF igual")
+        sha_b = self.store.put("https://x/b.pdf", b"%PDF igual")
+
+        self.assertEqual(sha_a, sha_b)
+        archivos = [f for _, _, fs in os.walk(self.root) for f in fs]
+        self.assertEqual(archivos, [f"{sha_a}.pdf"])
+        self.assertEqual(PDFAlmacenado.objects.count(), 2)
+
+    def test_abrir_descarga_solo_una_vez(self):
+        descargar = Mock(return_value=b"%PDF descargado")
+
+        with self.store.abrir("https://x/a.pdf", descargar) as buffer:
+            self.assertEqual(buffer[:], b"%PDF descargado")
+        with self.store.abrir("https://x/a.pdf", descargar) as buffer:
+            self.assertEqual(buffer[:], b"%PDF descargado")
+
+        descargar.assert_called_once()
+        self.assertTrue(buffer.closed)
+
+    def test_abrir_sin_almacen_entrega_bytes(self):
+        with patch.object(self.store, 'get', side_effect=RuntimeError("sin base de datos")):
+            with self.store.abrir("https://x/a.pdf", lambda: b"%PDF directo") as contenido:
+                self.assertEqual(contenido, b"%PDF directo")
+
+    def test_evict_elimina_los_menos_usados(self):
+        self.store.put("https://x/viejo.pdf", b"v" * 400)
+        self.store.put("https://x/reciente.pdf", b"r" * 400)
+        PDFAlmacenado.objects.filter(url="https://x/viejo.pdf").update(
+            fecha_ultimo_acceso=timezone.now() - timedelta(days=1)
+        )
+
+        self.store.put("https://x/nuevo.pdf", b"n" * 400)
+
+        self.assertIsNone(self.store.get("https://x/viejo.pdf"))
+        for url in ("https://x/reciente.pdf", "https://x/nuevo.pdf"):
+            buffer = self.store.get(url)
+            self.assertIsNotNone(buffer)
+            buffer.close()
+
+    def test_evict_bajo_el_maximo_solo_suma(self):
+        self.store.put("https://x/a.pdf", b"a" * 400)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.store.evict(), 0)
+
+    def test_evict_cuenta_una_vez_los_pdfs_repetidos(self):
+        # Tres URLs del mismo PDF suman 1200 bytes por URL, pero ocupan 400 en disco
+        for url in ("https://x/a.pdf", "https://x/b.pdf", "https://x/c.pdf"):
+            self.store.put(url, b"a" * 400)
+
+        self.assertEqual(PDFAlmacenado.objects.count(), 3)
+
+    def test_archivo_eliminado_limpia_el_indice(self):
+        sha = self.store.put("https://x/a.pdf", b"%PDF contenido")
+        os.remove(self.store._ruta(sha))
+
+        self.assertIsNone(self.store.get("https://x/a.pdf"))
+        self.assertFalse(PDFAlmacenado.objects.exists())
+
+
+class TestExtractorConMmap(TestCase):
+    """El extractor debe leer un mmap directamente"""
+
+    def test_lector_sobre_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write(b"%PDF-1.4 contenido")
+            f.flush()
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            leidos = []
+
+            def leer(stream):
+                stream.seek(-9, os.SEEK_END)
+                leidos.append(stream.read())
+                stream.seek(0)
+                leidos.append(stream.read(4))
+                reader = Mock()
+                reader.pages = []
+                return reader
+
+            with patch('PyPDF2.PdfReader', side_effect=leer):
+                PDFExtractor()._extract_with_pypdf2(buffer, max_pages=2)
+
+            self.assertEqual(leidos, [b"contenido", b"%PDF"])
+            self.assertFalse(buffer.closed)
+            buffer.close()
@@ -0,0 +1,86 @@
+"""
+Tests para el archivo de ediciones y publicaciones del Diario Oficial
+"""
+from datetime import date
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from alerts.models import DocumentoBusqueda, Edicion, Publicacion
+from alerts.services.edition_index import EditionIndex
+from alerts.services.publication_archive import PublicationArchive
+
+FECHA = date(2025, 7, 11)
+
+
+def publicacion(n, **kwargs):
+    pub = {
+        "seccion": "NORMAS GENERALES",
+        "titulo": f"Decreto número {n}",
+        "url_pdf": f"https://www.diariooficial.interior.gob.cl/publicaciones/2025/07/11/44196/01/{2667000 + n}.pdf",
+        "relevante": False,
+        "es_licitacion": False,
+        "razon_relevancia": "No relevante",
+        "resumen": "",
+        "es_sii": False,
+    }
+    pub.update(kwargs)
+    return pub
+
+
+class TestPublicationArchive(TestCase):
+    """Tests para PublicationArchive"""
+
+    def setUp(self):
+        self.archivo = PublicationArchive()
+
+    def test_guardar_y_reconstruir_resultado(self):
+        pubs = [publicacion(1), publicacion(2, relevante=True, resumen="Resumen del decreto", es_sii=True)]
+
+        self.assertEqual(self.archivo.guardar_edicion(FECHA, "44196", pubs, pubs[1:], 120, {'dolar': '950.1'}), 2)
+
+        edicion = Edicion.objects.get(fecha=FECHA)
+        self.assertEqual((edicion.numero, edicion.total_documentos), (44196, 120))
+        self.assertEqual(edicion.publicaciones.filter(relevante=True).get().resumen, "Resumen del decreto")
+        self.assertEqual(self.archivo.resultado(FECHA), {
+            'publicaciones': [pubs[1]],
+            'valores_monedas': {'dolar': '950.1'},
+            'total_documentos': 120,
+        })
+        self.assertIsNone(self.archivo.resultado(date(2025, 7, 12)))
+
+    def test_edicion_archivada_el_mismo_dia_no_se_reutiliza(self):
+        hoy = timezone.localdate()
+        self.archivo.guardar_edicion(hoy, "44500", [publicacion(1)])
+
+        self.assertIsNone(self.archivo.resultado(hoy))
+
+    def test_reingesta_solo_escribe_los_cambios(self):
+        pubs = [publicacion(n) for n in range(200)]
+        self.archivo.guardar_edicion(FECHA, "44196", pubs)
+
+        # Cambia un título, desaparece una publicación y aparece otra
+        pubs[0] = publicacion(0, titulo="Decreto número 0 (rectificado)")
+        pubs = pubs[:-1] + [publicacion(500)]
+        with CaptureQueriesContext(connection) as consultas:
+            escritas = self.archivo.guardar_edicion(FECHA, "44196", pubs)
+
+        self.assertEqual(escritas, 2)
+        # Las consultas no dependen del número de publicaciones
+        self.assertLess(len(consultas), 16)
+        self.assertEqual(Publicacion.objects.count(), 200)
+        self.assertEqual(Publicacion.objects.get(url_pdf=pubs[0]['url_pdf']).titulo, "Decreto número 0 (rectificado)")
+        self.assertFalse(Publicacion.objects.filter(titulo="Decreto número 199").exists())
+
+    def test_reasignar_el_numero_conserva_la_edicion_archivada(self):
+        indice = EditionIndex()
+        indice.registrar_varios({date(2025, 7, 19): 44203})
+        self.archivo.guardar_edicion(date(2025, 7, 19), "44203", [publicacion(1)])
+
+        # El sitio confirma que la 44203 es la del 21-07
+        self.assertTrue(indice.registrar(date(2025, 7, 21), '44203'))
+
+        self.assertIsNone(Edicion.objects.get(fecha=date(2025, 7, 19)).numero)
+        self.assertEqual(Publicacion.objects.count(), 1)
+        self.assertEqual(DocumentoBusqueda.objects.filter(tipo='publicacion').count(), 1)
+        self.assertEqual(indice.get(date(2025, 7, 21)), '44203')
@@ -0,0 +1,69 @@
+"""
+Tests para el motor de reglas de relevancia
+"""
+import json
+import os
+import tempfile
+from unittest import TestCase
+from alerts.reglas_relevancia import RUTA_REGLAS, MotorReglas, motor_reglas
+from alerts.utils.keyword_matcher import BuscadorPalabras
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'reglas_relevancia')
+
+
+def leer_corpus():
+    """Títulos con el veredicto que daban las reglas escritas como código (título, relevante, razón)"""
+    with open(os.path.join(FIXTURES, 'veredictos.json'), encoding='utf-8') as f:
+        return [(titulo, (relevante, razon)) for titulo, relevante, razon in json.load(f)]
+
+
+class TestMotorReglas(TestCase):
+    """Tests para MotorReglas"""
+
+    def test_mismos_veredictos_que_las_reglas_anteriores(self):
+        for titulo, esperado in leer_corpus():
+            with self.subTest(titulo=titulo):
+                self.assertEqual(motor_reglas.evaluar(titulo), esperado)
+
+    def test_evaluar_lote(self):
+        corpus = leer_corpus()
+        titulos = [titulo for titulo, _ in corpus]
+        # Con repetidos, para verificar el orden de salida
+        self.assertEqual(motor_reglas.evaluar_lote(titulos + titulos[:50]),
+                         [esperado for _, esperado in corpus + corpus[:50]])
+        self.assertEqual(motor_reglas.evaluar_lote([]), [])
+
+    def test_cargo_importante_no_se_excluye(self):
+        self.assertEqual(motor_reglas.evaluar("Nombra a don Juan Pérez como Subsecretario de Hacienda")[0], False)
+        self.assertEqual(motor_reglas.evaluar("Nombra a don Juan Pérez como Subsecretario del SII"),
+                         (True, "Normativa tributaria del SII"))
+        self.assertEqual(motor_reglas.evaluar("Nombra a don Juan Pérez como Jefe del SII"),
+                         (False, "Nombramiento individual"))
+
+    def test_reglas_desde_archivo(self):
+        with open(RUTA_REGLAS, encoding='utf-8') as f:
+            reglas = json.load(f)
+        reglas['criterios'].insert(0, {"palabras": ["HIDRÓGENO VERDE"], "razon": "Política energética"})
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+            json.dump(reglas, f, ensure_ascii=False)
+        self.addCleanup(os.remove, f.name)
+
+        motor = MotorReglas.desde_archivo(f.name)
+
+        self.assertEqual(motor.evaluar("Aprueba estrategia de hidrógeno verde"), (True, "Política energética"))
+        self.assertEqual(motor_reglas.evaluar("Aprueba estrategia de hidrógeno verde")[0], False)
+
+
+class TestBuscadorPalabras(TestCase):
+    """Tests para BuscadorPalabras"""
+
+    def test_coincidencias_superpuestas(self):
+        buscador = BuscadorPalabras(["CREA", "CREACIÓN DE", "ACIÓN", "DE"])
+        self.assertEqual(buscador.encontrar("LEY DE CREACIÓN DE"), ["DE", "CREA", "CREACIÓN DE", "ACIÓN"])
+        self.assertEqual(buscador.mascara("SIN NADA"), 0)
+        self.assertEqual(buscador.mascara("CREACIÓN"), buscador.bits["CREA"] | buscador.bits["ACIÓN"])
+
+    def test_sin_palabras(self):
+        buscador = BuscadorPalabras(["", ""])
+        self.assertEqual(buscador.encontrar("TEXTO"), [])
+        self.assertEqual(buscador.mascara("TEXTO"), 0)
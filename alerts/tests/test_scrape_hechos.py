@@ -0,0 +1,107 @@
+"""
+Tests para el procesamiento concurrente de hechos esenciales (comando scrape_hechos)
+"""
+import importlib
+import shutil
+import sys
+import tempfile
+import threading
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from django.core.management.base import OutputWrapper
+from django.test import TestCase
+from alerts.models import HechoEsencial, PDFAlmacenado, TextoExtraido
+from alerts.services.pdf_store import PDFStore
+from alerts.services.text_cache import text_cache
+from alerts.tests.test_hecho_store import hecho
+
+
+class TestProcesarHechos(TestCase):
+    """Los workers descargan, extraen y resumen; solo el hilo principal escribe en la base de datos"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # El SDK de OpenAI no es necesario: generar_resumen_ia se reemplaza en cada test
+        with patch.dict(sys.modules, {'openai': MagicMock()}):
+            cls.modulo = importlib.import_module('alerts.management.commands.scrape_hechos')
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.store = PDFStore(root=self.root, max_bytes=10 ** 6)
+        self.hilos = []
+
+        self.comando = self.modulo.Command()
+        self.comando.stdout = OutputWrapper(StringIO())
+        self.comando.openai_api_key = 'clave'
+
+        def registrar_hilo(original):
+            def envoltura(*args, **kwargs):
+                self.hilos.append(threading.current_thread())
+                return original(*args, **kwargs)
+            return envoltura
+
+        for parche in [
+            patch.object(self.modulo, 'pdf_store', self.store),
+            patch.object(self.modulo, 'HECHOS_WORKERS', 3),
+            patch.object(self.store, 'put', side_effect=registrar_hilo(self.store.put)),
+            patch.object(text_cache, 'set', side_effect=registrar_hilo(text_cache.set)),
+        ]:
+            parche.start()
+            self.addCleanup(parche.stop)
+        self.descargar = patch.object(self.comando, '_descargar_pdf',
+                                      side_effect=lambda url: f"%PDF {url}".encode()).start()
+        self.extraer = patch.object(self.comando.pdf_extractor, 'extract_text',
+                                    return_value=("Texto del hecho esencial " * 10, 'pypdf2')).start()
+        patch.object(self.comando, 'generar_resumen_ia',
+                     side_effect=lambda titulo, texto, es_ipsa=False: f"Resumen de {titulo}").start()
+        self.addCleanup(patch.stopall)
+
+    def test_procesa_en_paralelo_y_guarda_en_el_hilo_principal(self):
+        hechos = [hecho(n) for n in range(5)]
+
+        self.comando.procesar_hechos(hechos)
+
+        self.assertEqual(
+            dict(HechoEsencial.objects.values_list('url', 'resumen')),
+            {h['url']: f"Resumen de {h['titulo']}" for h in hechos},
+        )
+        self.assertEqual(PDFAlmacenado.objects.count(), 5)
+        self.assertEqual(TextoExtraido.objects.count(), 5)
+        self.assertEqual(len(self.hilos), 10)
+        self.assertTrue(all(hilo is threading.main_thread() for hilo in self.hilos))
+
+        # Sin resumen de nuevo: el PDF y su texto salen del almacén, sin descargar ni extraer
+        HechoEsencial.objects.update(resumen='')
+        self.descargar.reset_mock()
+        self.extraer.reset_mock()
+
+        self.comando.procesar_hechos(hechos)
+
+        self.descargar.assert_not_called()
+        self.extraer.assert_not_called()
+        self.assertEqual(HechoEsencial.objects.exclude(resumen='').count(), 5)
+
+    def test_error_de_descarga_no_detiene_al_resto(self):
+        def descargar(url):
+            if url.endswith('=1'):
+                raise ConnectionError("sin red")
+            return f"%PDF {url}".encode()
+        self.descargar.side_effect = descargar
+
+        hechos = [hecho(n) for n in range(3)]
+
+        self.comando.procesar_hechos(hechos)
+
+        self.assertEqual(set(HechoEsencial.objects.filter(resumen__startswith='Resumen').values_list('url', flat=True)),
+                         {hechos[0]['url'], hechos[2]['url']})
+        self.assertEqual(PDFAlmacenado.objects.count(), 2)
+
+    def test_descarga_con_el_cliente_compartido(self):
+        respuesta = MagicMock(content=b"%PDF-1.4")
+        with patch.object(self.modulo.http_client, 'get', return_value=respuesta) as mock_get:
+            descargar = self.modulo.Command._descargar_pdf
+            self.assertEqual(descargar(self.comando, 'https://www.cmfchile.cl/a.pdf'), b"%PDF-1.4")
+        mock_get.assert_called_once_with('https://www.cmfchile.cl/a.pdf', timeout=30)
+        respuesta.raise_for_status.assert_called_once_with()
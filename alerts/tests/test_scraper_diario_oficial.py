@@ -0,0 +1,281 @@
+"""
+Tests para el scraper del Diario Oficial
+"""
+from datetime import date
+from unittest import TestCase
+from unittest.mock import patch
+import httpx
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from alerts import scraper_diario_oficial
+from alerts.tests.test_parser_diario_oficial import leer_fixture
+from alerts.utils import http_client
+
+RESULTADO_ANTERIOR = {"publicaciones": [{"titulo": "Decreto"}], "valores_monedas": None, "total_documentos": 1}
+
+
+@patch('alerts.scraper_diario_oficial.obtener_numero_edicion', return_value="44196")
+@patch('alerts.scraper_diario_oficial.cache_service')
+@patch('alerts.scraper_diario_oficial.http_client.obtener_varios')
+class TestRefrescoCondicional(TestCase):
+    """Tests del refresco condicional de las páginas de la edición"""
+
+    def test_paginas_sin_cambios_reutilizan_el_resultado(self, mock_obtener, mock_cache, mock_edicion):
+        mock_cache.get_scraping_result.return_value = RESULTADO_ANTERIOR
+        mock_cache.get_validadores.return_value = http_client.validadores(
+            httpx.Response(200, text="x", headers={'ETag': '"v1"'})
+        )
+        mock_obtener.return_value = [httpx.Response(304)] * 3
+
+        with patch('alerts.scraper_diario_oficial.parsear_sumario') as mock_parsear:
+            resultado = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", force_refresh=True)
+
+        self.assertIs(resultado, RESULTADO_ANTERIOR)
+        mock_parsear.assert_not_called()
+        headers = mock_obtener.call_args.kwargs['headers_por_url']
+        self.assertEqual(headers, [{'If-None-Match': '"v1"'}] * 3)
+
+    def test_sin_resultado_anterior_no_se_piden_condicionales(self, mock_obtener, mock_cache, mock_edicion):
+        mock_cache.get_scraping_result.return_value = None
+        mock_obtener.return_value = [httpx.ConnectError("sin red")] * 3
+
+        with patch('alerts.scraper_diario_oficial.send_mail'):
+            scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", force_refresh=True)
+
+        self.assertEqual(mock_obtener.call_args.kwargs['headers_por_url'], [{}] * 3)
+        mock_cache.get_validadores.assert_not_called()
+
+
+@patch('alerts.scraper_diario_oficial.edition_index')
+@patch('alerts.scraper_diario_oficial.http_client.get')
+class TestNumeroEdicion(TestCase):
+    """Tests de la detección del número de edición sin navegador"""
+
+    def test_edicion_por_http_sin_selenium(self, mock_get, mock_indice):
+        mock_indice.get.return_value = None
+        mock_indice.referencia_anterior.return_value = None
+        mock_get.side_effect = [
+            httpx.Response(404, request=httpx.Request('GET', 'https://x')),
+            httpx.Response(200, text=leer_fixture('sumario.html'), request=httpx.Request('GET', 'https://x')),
+        ]
+
+        with patch('alerts.scraper_diario_oficial._detectar_edicion_selenium') as mock_selenium:
+            edicion = scraper_diario_oficial.obtener_numero_edicion('11-07-2025')
+
+        self.assertEqual(edicion, '44196')
+        mock_selenium.assert_not_called()
+        mock_indice.registrar.assert_called_once_with(date(2025, 7, 11), '44196', origen='sitio')
+        self.assertIn('/publicaciones/2025/07/11/', mock_get.call_args_list[0].args[0])
+
+    def test_opcion_de_otra_fecha_no_se_registra(self, mock_get, mock_indice):
+        # Sin edición el 13-07, el sitio muestra el selector en la del 12-07
+        pagina = """<select id="ediciones">
+            <option value="/publicaciones/2025/07/12/edicion-44197/" selected>44.197</option>
+        </select>"""
+        mock_get.return_value = httpx.Response(200, text=pagina, request=httpx.Request('GET', 'https://x'))
+
+        self.assertIsNone(scraper_diario_oficial.resolver_edicion_http('13-07-2025'))
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(scraper_diario_oficial.resolver_edicion_http('12-07-2025'), '44197')
+
+    def test_estimacion_confiable_no_consulta_el_sitio(self, mock_get, mock_indice):
+        mock_indice.get.return_value = None
+        mock_indice.referencia_anterior.return_value = (date(2025, 7, 21), 44203)
+
+        self.assertEqual(scraper_diario_oficial.obtener_numero_edicion('23-07-2025'), '44205')
+        mock_get.assert_not_called()
+
+    def test_estimacion_lejana_consulta_el_sitio(self, mock_get, mock_indice):
+        mock_indice.get.return_value = None
+        # Nueve días de publicación desde la referencia (el 16-07 es feriado)
+        mock_indice.referencia_anterior.return_value = (date(2025, 7, 11), 44196)
+        mock_get.side_effect = httpx.ConnectError("sin red")
+
+        with patch('alerts.scraper_diario_oficial._detectar_edicion_selenium') as mock_selenium:
+            edicion = scraper_diario_oficial.obtener_numero_edicion('23-07-2025')
+
+        self.assertEqual(edicion, '44205')
+        self.assertEqual(mock_get.call_count, 2)
+        mock_selenium.assert_not_called()
+        mock_indice.registrar.assert_not_called()
+
+    def test_selenium_solo_si_se_pide(self, mock_get, mock_indice):
+        mock_indice.get.return_value = None
+        mock_indice.referencia_anterior.return_value = None
+        mock_get.side_effect = httpx.ConnectError("sin red")
+
+        with patch('alerts.scraper_diario_oficial._detectar_edicion_selenium', return_value='44197') as mock_selenium:
+            edicion = scraper_diario_oficial.obtener_numero_edicion('14-07-2025', usar_selenium=True)
+
+        self.assertEqual(edicion, '44197')
+        mock_selenium.assert_called_once_with('14-07-2025', None)
+
+    def test_edicion_registrada_no_consulta_el_sitio(self, mock_get, mock_indice):
+        mock_indice.get.return_value = '44196'
+
+        self.assertEqual(scraper_diario_oficial.obtener_numero_edicion('11-07-2025'), '44196')
+        mock_indice.get.assert_called_once_with(date(2025, 7, 11))
+        mock_get.assert_not_called()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+@patch('alerts.scraper_diario_oficial.publication_archive')
+@patch('alerts.scraper_diario_oficial.edition_index')
+@patch('alerts.scraper_diario_oficial.obtener_numero_edicion', return_value="44196")
+@patch('alerts.scraper_diario_oficial.cache_service')
+@patch('alerts.scraper_diario_oficial.extraer_texto_pdf_mixto', return_value="")
+@patch('alerts.scraper_diario_oficial.procesar_publicacion_relevante')
+@patch('alerts.scraper_diario_oficial.evaluador_relevancia')
+@patch('alerts.scraper_diario_oficial.http_client.obtener_varios')
+class TestReprocesoIncremental(SimpleTestCase):
+    """Al volver a scrapear una edición solo se procesan las publicaciones nuevas"""
+
+    def setUp(self):
+        cache.clear()
+
+    def _paginas(self, sumario):
+        peticion = httpx.Request('GET', 'https://www.diariooficial.interior.gob.cl/')
+        return [
+            httpx.Response(200, text=sumario, request=peticion),
+            httpx.Response(200, text=leer_fixture('normas_particulares.html'), request=peticion),
+            httpx.Response(200, text="<html></html>", request=peticion),
+        ]
+
+    def test_solo_procesa_publicaciones_nuevas(self, mock_obtener, mock_evaluador, mock_procesar,
+                                               mock_extraer, mock_cache, mock_edicion, mock_indice,
+                                               mock_archivo):
+        mock_cache.get_scraping_result.return_value = None
+        mock_archivo.resultado.return_value = None
+        mock_evaluador.evaluar_lote.side_effect = lambda titulos: [(True, "Relevante")] * len(titulos)
+        mock_procesar.side_effect = lambda pub: {"incluir": True, "razon": None, "resumen": f"Resumen {pub['titulo'][:10]}",
+                                                 "definitivo": True, "tiempos": {"extraccion": 0.0, "total": 0.0}}
+        sumario = leer_fixture('sumario.html')
+        mock_obtener.return_value = self._paginas(sumario)
+
+        primero = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", max_workers=1)
+        self.assertEqual(mock_procesar.call_count, 21)
+        fecha, edicion, publicaciones, incluidas = mock_archivo.guardar_edicion.call_args.args[:4]
+        self.assertEqual((fecha, edicion), (date(2025, 7, 11), "44196"))
+        self.assertEqual(len(publicaciones), 21)
+        self.assertEqual(incluidas, primero['publicaciones'])
+
+        # Aparece una publicación nueva y cambia el título de otra
+        sumario = sumario.replace("Extracto de resolución exenta número 73", "Extracto de resolución exenta N° 73")
+        sumario = sumario.replace("</tbody>", """<tr class="content"><td>Decreto número 99, de 2025.- Nuevo</td>
+            <td><a href="https://www.diariooficial.interior.gob.cl/publicaciones/2025/07/11/44196/01/2679999.pdf">Ver PDF</a></td></tr></tbody>""", 1)
+        mock_obtener.return_value = self._paginas(sumario)
+        mock_evaluador.reset_mock()
+        mock_procesar.reset_mock()
+
+        segundo = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", force_refresh=True, max_workers=1)
+
+        self.assertEqual(mock_procesar.call_count, 2)
+        self.assertEqual(len(mock_evaluador.evaluar_lote.call_args.args[0]), 2)
+        self.assertEqual(segundo['total_documentos'], primero['total_documentos'] + 1)
+        self.assertEqual(len(segundo['publicaciones']), len(primero['publicaciones']) + 1)
+
+    def test_edicion_estimada_errada_se_corrige_con_el_sumario(self, mock_obtener, mock_evaluador, mock_procesar,
+                                                               mock_extraer, mock_cache, mock_edicion, mock_indice,
+                                                               mock_archivo):
+        mock_cache.get_scraping_result.return_value = None
+        mock_archivo.resultado.return_value = None
+        mock_edicion.return_value = "44195"
+        mock_evaluador.evaluar_lote.side_effect = lambda titulos: [(False, "No relevante")] * len(titulos)
+        paginas = self._paginas(leer_fixture('sumario.html'))
+        mock_obtener.side_effect = [paginas, paginas[1:]]
+
+        resultado = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", max_workers=1)
+
+        mock_indice.registrar.assert_called_once_with(date(2025, 7, 11), '44196')
+        urls_corregidas = mock_obtener.call_args_list[1].args[0]
+        self.assertEqual(len(urls_corregidas), 2)
+        self.assertTrue(all('edition=44196' in u for u in urls_corregidas))
+        self.assertEqual(resultado['total_documentos'], 21)
+
+    def test_pagina_fallida_no_se_archiva(self, mock_obtener, mock_evaluador, mock_procesar,
+                                          mock_extraer, mock_cache, mock_edicion, mock_indice, mock_archivo):
+        mock_cache.get_scraping_result.return_value = None
+        mock_archivo.resultado.return_value = None
+        mock_evaluador.evaluar_lote.side_effect = lambda titulos: [(False, "No relevante")] * len(titulos)
+        paginas = self._paginas(leer_fixture('sumario.html'))
+        mock_obtener.return_value = paginas[:2] + [httpx.ConnectError("sin red")]
+
+        resultado = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", max_workers=1)
+
+        self.assertEqual(resultado['total_documentos'], 21)
+        mock_archivo.guardar_edicion.assert_not_called()
+
+    def test_edicion_archivada_no_se_vuelve_a_scrapear(self, mock_obtener, mock_evaluador, mock_procesar,
+                                                      mock_extraer, mock_cache, mock_edicion, mock_indice,
+                                                      mock_archivo):
+        mock_cache.get_scraping_result.return_value = None
+        mock_archivo.resultado.return_value = RESULTADO_ANTERIOR
+
+        resultado = scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025")
+
+        self.assertIs(resultado, RESULTADO_ANTERIOR)
+        mock_archivo.resultado.assert_called_once_with(date(2025, 7, 11))
+        mock_cache.set_scraping_result.assert_called_once()
+        mock_obtener.assert_not_called()
+
+    def test_resultados_fallidos_se_reintentan(self, mock_obtener, mock_evaluador, mock_procesar,
+                                              mock_extraer, mock_cache, mock_edicion, mock_indice,
+                                              mock_archivo):
+        mock_cache.get_scraping_result.return_value = None
+        mock_archivo.resultado.return_value = None
+        mock_obtener.return_value = self._paginas(leer_fixture('sumario.html'))
+        titulos = []
+
+        def evaluar_lote(lote):
+            titulos[:] = lote
+            # Los dos primeros títulos quedan con veredicto por reglas (IA caída)
+            mock_evaluador.titulos_por_reglas.return_value = set(lote[:2])
+            return [(i % 2 == 0, "Veredicto") for i in range(len(lote))]
+
+        def procesar(pub):
+            # El primer PDF relevante con veredicto de IA no se pudo leer
+            fallido = pub['titulo'] == titulos[2]
+            return {"incluir": True, "razon": None,
+                    "resumen": scraper_diario_oficial.RESUMEN_SIN_TEXTO if fallido else "Resumen",
+                    "definitivo": not fallido, "tiempos": {"extraccion": 0.0, "total": 0.0}}
+
+        mock_evaluador.evaluar_lote.side_effect = evaluar_lote
+        mock_procesar.side_effect = procesar
+        scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", max_workers=1)
+        primeros = list(titulos)
+        # Una edición con un PDF fallido no se archiva
+        mock_archivo.guardar_edicion.assert_not_called()
+        mock_procesar.reset_mock()
+
+        scraper_diario_oficial.obtener_sumario_diario_oficial("11-07-2025", force_refresh=True, max_workers=1)
+
+        # Se vuelven a evaluar los veredictos por reglas y a procesar el PDF fallido
+        self.assertEqual(titulos, primeros[:3])
+        self.assertEqual([c.args[0]['titulo'] for c in mock_procesar.call_args_list], [primeros[0], primeros[2]])
+
+
+@patch('alerts.scraper_diario_oficial.generar_resumen_desde_texto', return_value="Resumen del decreto.")
+@patch('alerts.scraper_diario_oficial.evaluador_relevancia')
+@patch('alerts.scraper_diario_oficial.extraer_texto_pdf_mixto')
+class TestProcesarPublicacionRelevante(TestCase):
+    """Solo los resultados con texto, resumen y veredicto de la IA son definitivos"""
+
+    PUB = {"titulo": "Decreto número 1", "url_pdf": "https://x/1.pdf"}
+
+    def test_resultado_completo(self, mock_extraer, mock_evaluador, mock_resumen):
+        mock_extraer.return_value = "texto " * 50
+        mock_evaluador.evaluar_relevancia.return_value = (True, "Relevante")
+        mock_evaluador.veredicto_por_reglas.return_value = False
+
+        self.assertTrue(scraper_diario_oficial.procesar_publicacion_relevante(self.PUB)['definitivo'])
+
+    def test_sin_texto_o_sin_ia_no_es_definitivo(self, mock_extraer, mock_evaluador, mock_resumen):
+        mock_extraer.return_value = ""
+        mock_resumen.return_value = scraper_diario_oficial.RESUMEN_SIN_TEXTO
+        self.assertFalse(scraper_diario_oficial.procesar_publicacion_relevante(self.PUB)['definitivo'])
+
+        mock_extraer.return_value = "texto " * 50
+        mock_evaluador.evaluar_relevancia.return_value = (False, "Nombramiento individual")
+        mock_evaluador.veredicto_por_reglas.return_value = True
+        procesado = scraper_diario_oficial.procesar_publicacion_relevante(self.PUB)
+        self.assertEqual((procesado['incluir'], procesado['definitivo']), (False, False))
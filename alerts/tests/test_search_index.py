@@ -0,0 +1,92 @@
+"""
+Tests para la búsqueda de texto completo
+"""
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from alerts.models import DocumentoBusqueda, DocumentoSII, Empresa, HechoEsencial, Publicacion
+from alerts.services.publication_archive import PublicationArchive
+from alerts.services.search_index import SearchIndex, consulta_fts5
+from alerts.tests.test_publication_archive import publicacion
+
+FECHA = date(2025, 7, 11)
+
+
+class TestSearchIndex(TestCase):
+    """Tests para SearchIndex y la vista de búsqueda"""
+
+    def setUp(self):
+        self.indice = SearchIndex()
+        PublicationArchive().guardar_edicion(FECHA, "44196", [
+            publicacion(1, titulo="Llamado a licitación pública para obras del Hospital de Talca"),
+            publicacion(2, titulo="Decreto que fija tipos de cambio", resumen="Dólar observado y euro"),
+        ], [publicacion(2, resumen="Dólar observado y euro")])
+
+    def titulos(self, consulta, tipo=None):
+        return [d.titulo for d in self.indice.buscar(consulta, tipo)[0:20]]
+
+    def test_consulta_fts5(self):
+        self.assertEqual(consulta_fts5("Licitaciones públicas"), '"licit"* "public"*')
+        self.assertEqual(consulta_fts5('"; DROP TABLE'), '"drop"* "tabl"*')
+
+    def test_publicaciones_archivadas_se_indexan(self):
+        # Sin tildes, en plural y buscando también en el resumen
+        self.assertEqual(self.titulos("licitaciones hospital"),
+                         ["Llamado a licitación pública para obras del Hospital de Talca"])
+        self.assertEqual(self.titulos("dolar"), ["Decreto que fija tipos de cambio"])
+        self.assertEqual(self.titulos("licitación minera"), [])
+        self.assertEqual(self.indice.buscar("decreto").count(), 1)
+
+    def test_reingesta_actualiza_y_retira(self):
+        PublicationArchive().guardar_edicion(FECHA, "44196", [
+            publicacion(1, titulo="Llamado a concurso para obras del Hospital de Talca"),
+        ])
+
+        self.assertEqual(self.titulos("licitacion"), [])
+        self.assertEqual(self.titulos("concurso"), ["Llamado a concurso para obras del Hospital de Talca"])
+        self.assertEqual(self.titulos("decreto"), [])
+        self.assertEqual(DocumentoBusqueda.objects.count(), 1)
+
+    def test_sii_y_hechos_se_indexan_al_guardarse(self):
+        documento = DocumentoSII.objects.create(
+            tipo_documento='CIRCULAR', numero='45', titulo="Instrucciones sobre IVA en servicios digitales",
+            url="https://www.sii.cl/normativa/circular45.pdf", fecha_publicacion=FECHA,
+        )
+        empresa = Empresa.objects.create(nombre="Banco de Chile")
+        HechoEsencial.objects.create(
+            empresa=empresa, titulo="Reparto de dividendos", url="https://www.cmf.cl/hecho/1",
+            fecha_publicacion=timezone.now(), resumen="La junta acordó repartir dividendos provisorios",
+        )
+
+        self.assertEqual(self.titulos("iva digitales"), ["Circular 45 - Instrucciones sobre IVA en servicios digitales"])
+        self.assertEqual(self.titulos("dividendo", tipo='hecho'), ["Banco de Chile: Reparto de dividendos"])
+        self.assertEqual(self.titulos("dividendo", tipo='sii'), [])
+
+        documento.delete()
+        self.assertEqual(self.titulos("iva"), [])
+
+    def test_comando_reindexa(self):
+        DocumentoBusqueda.objects.all().delete()
+        self.assertEqual(self.titulos("hospital"), [])
+
+        call_command('indexar_busqueda', stdout=StringIO())
+
+        self.assertEqual(len(self.titulos("hospital")), 1)
+        self.assertEqual(DocumentoBusqueda.objects.count(), Publicacion.objects.count())
+
+    def test_vista_paginada(self):
+        PublicationArchive().guardar_edicion(date(2025, 7, 14), "44198", [
+            publicacion(100 + n, titulo=f"Decreto número {n} del Ministerio de Salud") for n in range(25)
+        ])
+        self.client.force_login(User.objects.create_user('lector', 'lector@example.com', 'clave'))
+
+        respuesta = self.client.get(reverse('alerts:buscar'), {'q': 'decreto salud', 'page': 2})
+
+        self.assertEqual(respuesta.status_code, 200)
+        page_obj = respuesta.context['page_obj']
+        self.assertEqual(page_obj.paginator.count, 25)
+        self.assertEqual(len(page_obj.object_list), 5)
@@ -0,0 +1,49 @@
+"""
+Tests para el almacén persistente de resúmenes
+"""
+from unittest.mock import Mock
+from django.test import TestCase
+from alerts.models import ResumenGenerado
+from alerts.services.summary_store import SummaryStore, version_prompt
+
+
+class TestSummaryStore(TestCase):
+    """Tests para SummaryStore"""
+
+    def setUp(self):
+        self.store = SummaryStore()
+
+    def test_genera_y_reutiliza(self):
+        generar = Mock(return_value="Resumen")
+        generadores = [('gpt-4o-mini', generar)]
+
+        primero = self.store.obtener_o_generar("https://x/doc.pdf", "texto", "v1", generadores)
+        segundo = self.store.obtener_o_generar("https://x/doc.pdf", "texto", "v1", generadores)
+
+        self.assertEqual((primero, segundo), ("Resumen", "Resumen"))
+        generar.assert_called_once()
+        self.assertEqual(self.store.estadisticas(), {'hits': 1, 'misses': 1})
+        self.assertEqual(ResumenGenerado.objects.get().usos, 1)
+
+    def test_cambio_de_texto_o_version_regenera(self):
+        generar = Mock(side_effect=["uno", "dos", "tres"])
+        generadores = [('gpt-4o-mini', generar)]
+
+        self.store.obtener_o_generar("u", "texto", "v1", generadores)
+        self.assertEqual(self.store.obtener_o_generar("u", "texto nuevo", "v1", generadores), "dos")
+        self.assertEqual(self.store.obtener_o_generar("u", "texto", "v2", generadores), "tres")
+
+    def test_usa_siguiente_generador_y_guarda_su_modelo(self):
+        generadores = [('gpt-4o-mini', Mock(return_value=None)), ('gemini-1.5-flash', Mock(return_value="Gemini"))]
+
+        self.assertEqual(self.store.obtener_o_generar(None, "texto", "v1", generadores), "Gemini")
+        self.assertEqual(ResumenGenerado.objects.get().modelo, 'gemini-1.5-flash')
+
+    def test_no_guarda_si_todos_fallan(self):
+        generadores = [('gpt-4o-mini', Mock(return_value=None))]
+        self.assertIsNone(self.store.obtener_o_generar("u", "texto", "v1", generadores))
+        self.assertFalse(ResumenGenerado.objects.exists())
+
+    def test_version_prompt_cambia_con_plantilla(self):
+        self.assertEqual(version_prompt("a {x}"), version_prompt("a {x}"))
+        self.assertNotEqual(version_prompt("a {x}"), version_prompt("b {x}"))
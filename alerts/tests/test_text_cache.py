@@ -0,0 +1,54 @@
+"""
+Tests para el caché de texto extraído de PDFs
+"""
+import hashlib
+from unittest.mock import Mock
+from django.test import TestCase
+from alerts.models import TextoExtraido
+from alerts.services.pdf_extractor import PDFExtractor
+from alerts.services.text_cache import ExtractedTextCache
+
+TEXTO_VALIDO = "Este es un texto válido extraído del PDF con suficientes palabras para pasar la validación"
+
+
+class TestExtractedTextCache(TestCase):
+    """Tests para ExtractedTextCache y su uso en PDFExtractor"""
+
+    def setUp(self):
+        self.cache = ExtractedTextCache()
+        self.extractor = PDFExtractor(text_cache=self.cache)
+
+    def test_set_y_get(self):
+        self.assertIsNone(self.cache.get("abc", 2))
+        self.cache.set("abc", 2, None, "texto", "ocr", 12.5)
+
+        self.assertEqual(self.cache.get("abc", 2), ("texto", "ocr"))
+        self.assertIsNone(self.cache.get("abc", 3))
+        self.assertIsNone(self.cache.get("abc", 2, max_chars=1000))
+
+    def test_segunda_extraccion_sale_del_cache(self):
+        self.extractor._extract_with_pypdf2 = Mock(side_effect=Exception("sin texto"))
+        self.extractor._extract_with_pdfminer = Mock(return_value="")
+        ocr = Mock(return_value=TEXTO_VALIDO)
+        self.extractor._extract_with_ocr = ocr
+        self.extractor.methods_priority = [
+            ('pypdf2', self.extractor._extract_with_pypdf2),
+            ('pdfminer', self.extractor._extract_with_pdfminer),
+            ('ocr', ocr),
+        ]
+
+        primero = self.extractor.extract_text(b"%PDF escaneado", max_pages=2)
+        segundo = self.extractor.extract_text(b"%PDF escaneado", max_pages=2)
+
+        self.assertEqual(primero, (TEXTO_VALIDO, "ocr"))
+        self.assertEqual(segundo, primero)
+        self.assertEqual(ocr.call_count, 1)
+        registro = TextoExtraido.objects.get()
+        self.assertEqual(registro.sha256, hashlib.sha256(b"%PDF escaneado").hexdigest())
+        self.assertGreaterEqual(registro.duracion, 0)
+
+    def test_fallos_no_se_guardan(self):
+        self.extractor.methods_priority = [('pypdf2', Mock(return_value=""))]
+
+        self.assertEqual(self.extractor.extract_text(b"%PDF vacio"), ("", "failed"))
+        self.assertFalse(TextoExtraido.objects.exists())
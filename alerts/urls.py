@@ -18,6 +18,7 @@ urlpatterns = [
     path('panel-organizacion/', views.panel_organizacion, name='panel_organizacion'),
     path('registro/', views.registro_empresa_admin, name='registro_empresa_admin'),
     path('historial-informes/', views.historial_informes, name='historial_informes'),
+    path('buscar/', views.buscar, name='buscar'),
     path('password_reset/', auth_views.PasswordResetView.as_view(template_name='alerts/password_reset_form.html'), name='password_reset'),
     path('password_reset/done/', auth_views.PasswordResetDoneView.as_view(template_name='alerts/password_reset_done.html'), name='password_reset_done'),
     path('reset/<uidb64>/<token>/', auth_views.PasswordResetConfirmView.as_view(template_name='alerts/password_reset_confirm.html'), name='password_reset_confirm'),
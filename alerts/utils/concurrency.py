@@ -0,0 +1,163 @@
+"""
+Utilidades para ejecutar tareas de I/O en paralelo con un pool acotado de hilos
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _cerrar_conexiones_db():
+    """Cierra las conexiones de Django abiertas por el hilo actual, si Django está configurado"""
+    try:
+        from django.db import connections
+        connections.close_all()
+    except Exception:
+        pass
+
+
+class LimitesConcurrencia:
+    """
+    Semáforos por proveedor (una API de resúmenes, un sitio de descargas) para que las
+    tareas de un pool no le hagan más llamadas simultáneas de las que admite. Los
+    proveedores sin límite configurado usan limite_por_defecto.
+
+    Uso:
+        with limites.limite('openai'):
+            ...
+    """
+
+    def __init__(self, limites: Optional[Dict[str, int]] = None, limite_por_defecto: int = 1):
+        self.limites = dict(limites or {})
+        self.limite_por_defecto = limite_por_defecto
+        self._semaforos: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limite(self, proveedor: str) -> threading.BoundedSemaphore:
+        """Semáforo del proveedor, creado con su límite la primera vez que se pide"""
+        with self._lock:
+            if proveedor not in self._semaforos:
+                maximo = max(1, self.limites.get(proveedor, self.limite_por_defecto))
+                self._semaforos[proveedor] = threading.BoundedSemaphore(maximo)
+            return self._semaforos[proveedor]
+
+
+def _ejecutar_item(func: Callable, item: Any, nombre: str, en_hilo: bool) -> Dict[str, Any]:
+    """Ejecuta una tarea individual registrando su duración y su posible error"""
+    inicio = time.time()
+    resultado = {'item': item, 'resultado': None, 'error': None, 'duracion': 0.0}
+    try:
+        resultado['resultado'] = func(item)
+    except Exception as e:
+        logger.warning(f"[{nombre}] Error procesando item: {str(e)}")
+        resultado['error'] = e
+    finally:
+        resultado['duracion'] = time.time() - inicio
+        if en_hilo:
+            _cerrar_conexiones_db()
+    return resultado
+
+
+def ejecutar_en_paralelo(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 4,
+    nombre: str = 'tarea'
+) -> List[Dict[str, Any]]:
+    """
+    Ejecuta func(item) para cada item usando un pool acotado de hilos.
+
+    Los errores de cada item se capturan y no interrumpen al resto. Con
+    max_workers <= 1 las tareas se ejecutan secuencialmente en el hilo actual.
+
+    Args:
+        func: Función a aplicar sobre cada item
+        items: Items a procesar
+        max_workers: Número máximo de hilos concurrentes
+        nombre: Etiqueta usada en los logs
+
+    Returns:
+        Lista de dicts {'item', 'resultado', 'error', 'duracion'} en el mismo
+        orden que los items de entrada
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    inicio = time.time()
+
+    if max_workers <= 1 or len(items) == 1:
+        resultados = [_ejecutar_item(func, item, nombre, en_hilo=False) for item in items]
+    else:
+        workers = min(max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=nombre) as executor:
+            futuros = [executor.submit(_ejecutar_item, func, item, nombre, True) for item in items]
+            resultados = [futuro.result() for futuro in futuros]
+
+    total = time.time() - inicio
+    suma = sum(r['duracion'] for r in resultados)
+    errores = sum(1 for r in resultados if r['error'] is not None)
+    logger.info(
+        f"[{nombre}] {len(items)} items en {total:.2f}s "
+        f"(suma individual {suma:.2f}s, workers {max(1, max_workers)}, errores {errores})"
+    )
+    return resultados
+
+
+def ejecutar_con_plazos(
+    tareas: Dict[str, Callable[[], Any]],
+    plazos: Dict[str, float],
+    plazo_por_defecto: Optional[float] = None,
+    nombre: str = 'fuente'
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta tareas independientes en paralelo, cada una con su propio plazo.
+
+    Los plazos se miden desde el inicio de la ejecución. Una tarea que no termina
+    a tiempo se marca como vencida y se abandona: su hilo sigue corriendo en
+    segundo plano, pero su resultado ya no se espera.
+
+    Args:
+        tareas: Dict nombre -> función sin argumentos
+        plazos: Dict nombre -> segundos máximos de espera
+        plazo_por_defecto: Plazo para tareas sin entrada en plazos (None = sin límite)
+        nombre: Etiqueta usada en los logs
+
+    Returns:
+        Dict nombre -> {'resultado', 'error', 'duracion', 'vencido'}
+    """
+    if not tareas:
+        return {}
+
+    inicio = time.time()
+    executor = ThreadPoolExecutor(max_workers=len(tareas), thread_name_prefix=nombre)
+    futuros = {
+        clave: executor.submit(_ejecutar_item, lambda _, tarea=tarea: tarea(), clave, nombre, True)
+        for clave, tarea in tareas.items()
+    }
+
+    resultados = {}
+    try:
+        for clave, futuro in futuros.items():
+            plazo = plazos.get(clave, plazo_por_defecto)
+            restante = None if plazo is None else max(0.0, inicio + plazo - time.time())
+            try:
+                resultado = futuro.result(timeout=restante)
+                resultado['vencido'] = False
+            except FuturesTimeoutError:
+                logger.warning(f"[{nombre}] {clave} no terminó dentro de su plazo de {plazo:.0f}s, se continúa sin su resultado")
+                resultado = {'item': clave, 'resultado': None, 'error': None,
+                             'duracion': time.time() - inicio, 'vencido': True}
+            resultados[clave] = resultado
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    resumen = ', '.join(
+        f"{clave} vencido" if r['vencido'] else f"{clave} {r['duracion']:.2f}s"
+        for clave, r in resultados.items()
+    )
+    logger.info(f"[{nombre}] Completado en {time.time() - inicio:.2f}s ({resumen})")
+    return resultados
@@ -0,0 +1,237 @@
+"""
+Cliente HTTP compartido con pool de conexiones, rate limiting por dominio y reintentos.
+
+Ofrece una API síncrona (sesión de requests compartida entre hilos) y una asíncrona
+(httpx con HTTP/2 cuando está disponible) para consultar varias fuentes en paralelo.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from alerts.utils.rate_limiter import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+DEFAULT_TIMEOUT = 30
+
+# Conexiones keep-alive por host
+POOL_POR_HOST = 10
+
+# Respuestas que vale la pena reintentar
+ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+MAX_REINTENTOS = 2
+DELAY_INICIAL = 1.0
+
+_sesion = None
+_sesion_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Retorna la sesión compartida por todo el proceso (se crea la primera vez)"""
+    global _sesion
+    with _sesion_lock:
+        if _sesion is None:
+            sesion = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_POR_HOST, pool_maxsize=POOL_POR_HOST)
+            sesion.mount('http://', adapter)
+            sesion.mount('https://', adapter)
+            sesion.headers.update(DEFAULT_HEADERS)
+            _sesion = sesion
+        return _sesion
+
+
+def _delay_reintento(intento: int) -> float:
+    """Backoff exponencial con jitter"""
+    return DELAY_INICIAL * (2 ** intento) * (0.5 + random.random())
+
+
+def request(
+    method: str,
+    url: str,
+    rate_limit: bool = True,
+    reintentos: int = MAX_REINTENTOS,
+    **kwargs
+) -> requests.Response:
+    """
+    Hace una petición con la sesión compartida.
+
+    Cada intento pasa por el rate limiter del dominio. Los errores de conexión,
+    timeouts y estados en ESTADOS_REINTENTABLES se reintentan con backoff; si
+    se agotan los reintentos se retorna la última respuesta (o se relanza el error).
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    for intento in range(reintentos + 1):
+        if rate_limit:
+            rate_limiter.acquire_for_url(url)
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if intento == reintentos:
+                raise
+            logger.warning(f"{method} {url} falló ({str(e)}), reintento {intento + 1}/{reintentos}")
+        else:
+            if response.status_code not in ESTADOS_REINTENTABLES or intento == reintentos:
+                return response
+            logger.warning(f"{method} {url} respondió {response.status_code}, reintento {intento + 1}/{reintentos}")
+        time.sleep(_delay_reintento(intento))
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def _http2_disponible() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class AsyncHTTPClient:
+    """
+    Cliente asíncrono basado en httpx con pool keep-alive por host y HTTP/2.
+    Usa el mismo rate limiter por dominio que el cliente síncrono.
+
+    Uso:
+        async with AsyncHTTPClient() as client:
+            response = await client.get(url)
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, headers: Optional[dict] = None, **kwargs):
+        import httpx
+        self._client = httpx.AsyncClient(
+            http2=_http2_disponible(),
+            timeout=timeout,
+            headers={**DEFAULT_HEADERS, **(headers or {})},
+            limits=httpx.Limits(max_keepalive_connections=POOL_POR_HOST, max_connections=POOL_POR_HOST * 4),
+            follow_redirects=True,
+            **kwargs
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def _adquirir(self, url: str):
+        """Espera un slot del rate limiter sin bloquear el event loop"""
+        while not rate_limiter.acquire_for_url(url, wait=False):
+            await asyncio.sleep(0.5)
+
+    async def request(self, method: str, url: str, rate_limit: bool = True,
+                      reintentos: int = MAX_REINTENTOS, **kwargs):
+        import httpx
+        for intento in range(reintentos + 1):
+            if rate_limit:
+                await self._adquirir(url)
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if intento == reintentos:
+                    raise
+                logger.warning(f"{method} {url} falló ({str(e)}), reintento {intento + 1}/{reintentos}")
+            else:
+                if response.status_code not in ESTADOS_REINTENTABLES or intento == reintentos:
+                    return response
+                logger.warning(f"{method} {url} respondió {response.status_code}, reintento {intento + 1}/{reintentos}")
+            await asyncio.sleep(_delay_reintento(intento))
+
+    async def get(self, url: str, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+
+def validadores(response) -> dict:
+    """
+    Validadores de una respuesta para pedirla después de forma condicional:
+    ETag, Last-Modified y el SHA-256 del contenido (para servidores que no envían los primeros).
+    """
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': hashlib.sha256(response.content).hexdigest(),
+    }
+
+
+def cabeceras_condicionales(validadores_previos: Optional[dict]) -> dict:
+    """If-None-Match / If-Modified-Since a partir de los validadores guardados de una URL"""
+    cabeceras = {}
+    if validadores_previos:
+        if validadores_previos.get('etag'):
+            cabeceras['If-None-Match'] = validadores_previos['etag']
+        if validadores_previos.get('last_modified'):
+            cabeceras['If-Modified-Since'] = validadores_previos['last_modified']
+    return cabeceras
+
+
+def sin_cambios(response, validadores_previos: Optional[dict]) -> bool:
+    """True si la respuesta indica que el recurso no cambió desde que se guardaron los validadores"""
+    if not validadores_previos or isinstance(response, Exception):
+        return False
+    if response.status_code == 304:
+        return True
+    return response.status_code == 200 and \
+        hashlib.sha256(response.content).hexdigest() == validadores_previos.get('sha256')
+
+
+async def obtener_varios_async(urls: List[str], headers_por_url: Optional[List[dict]] = None,
+                               **kwargs) -> List[Union[Any, Exception]]:
+    """
+    Descarga varias URLs en paralelo desde código asíncrono (ver obtener_varios).
+    """
+    headers_por_url = headers_por_url or [{}] * len(urls)
+    if not urls:
+        return []
+    async with AsyncHTTPClient() as client:
+        return await asyncio.gather(
+            *(client.get(url, headers=headers, **kwargs) for url, headers in zip(urls, headers_por_url)),
+            return_exceptions=True
+        )
+
+
+def obtener_varios(urls: List[str], headers_por_url: Optional[List[dict]] = None,
+                   **kwargs) -> List[Union[Any, Exception]]:
+    """
+    Descarga varias URLs en paralelo desde código síncrono. Si el hilo ya tiene un
+    event loop corriendo (asyncio.run fallaría), las descargas se hacen en un loop
+    propio en otro hilo; desde código asíncrono conviene usar obtener_varios_async.
+
+    Args:
+        headers_por_url: Cabeceras adicionales para cada URL (p. ej. cabeceras_condicionales())
+
+    Returns:
+        Lista en el mismo orden que urls con la respuesta httpx de cada una,
+        o la excepción si la petición falló
+    """
+    if not urls:
+        return []
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(obtener_varios_async(urls, headers_por_url, **kwargs))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, obtener_varios_async(urls, headers_por_url, **kwargs)).result()
@@ -0,0 +1,63 @@
+"""
+Búsqueda de muchas palabras clave (subcadenas) en una sola pasada por el texto
+"""
+import re
+from typing import Dict, Iterable, List
+
+
+class BuscadorPalabras:
+    """
+    Encuentra cuáles de un conjunto de palabras clave aparecen en un texto, con la
+    misma semántica que `palabra in texto` para cada una.
+
+    Las palabras se compilan en una regex con forma de trie (los prefijos comunes se
+    comparten) que encuentra la palabra más larga que empieza en cada posición; esa
+    coincidencia se expande a las palabras que son prefijo de ella y la búsqueda
+    sigue desde el carácter siguiente a su inicio, para no perder coincidencias
+    superpuestas. Cada palabra tiene además un bit, para representar las encontradas
+    como una máscara entera.
+    """
+
+    def __init__(self, palabras: Iterable[str]):
+        self.palabras = sorted({p for p in palabras if p})
+        self.bits = {palabra: 1 << i for i, palabra in enumerate(self.palabras)}
+        self._prefijos = {p: [k for k in self.palabras if p.startswith(k)] for p in self.palabras}
+        self._mascara_prefijos = {p: sum(self.bits[k] for k in prefijos) for p, prefijos in self._prefijos.items()}
+        self._regex = re.compile(self._trie(self.palabras)) if self.palabras else None
+
+    @classmethod
+    def _trie(cls, palabras: List[str]) -> str:
+        trie = {}
+        for palabra in palabras:
+            nodo = trie
+            for caracter in palabra:
+                nodo = nodo.setdefault(caracter, {})
+            nodo[''] = {}
+        return cls._patron(trie)
+
+    @classmethod
+    def _patron(cls, nodo: Dict) -> str:
+        ramas = [re.escape(c) + cls._patron(hijo) for c, hijo in sorted(nodo.items()) if c]
+        if not ramas:
+            return ''
+        patron = ramas[0] if len(ramas) == 1 else f"(?:{'|'.join(ramas)})"
+        return f"(?:{patron})?" if '' in nodo else patron
+
+    def encontrar(self, texto: str) -> List[str]:
+        """Palabras clave contenidas en el texto, en orden de aparición"""
+        encontradas = {}
+        match = self._regex.search(texto) if self._regex else None
+        while match is not None:
+            for palabra in self._prefijos[match.group()]:
+                encontradas.setdefault(palabra, None)
+            match = self._regex.search(texto, match.start() + 1)
+        return list(encontradas)
+
+    def mascara(self, texto: str) -> int:
+        """Bits de las palabras clave contenidas en el texto"""
+        mascara = 0
+        match = self._regex.search(texto) if self._regex else None
+        while match is not None:
+            mascara |= self._mascara_prefijos[match.group()]
+            match = self._regex.search(texto, match.start() + 1)
+        return mascara
@@ -59,9 +59,9 @@ class RateLimiter:
             
         # Esperar fuera del lock
         time.sleep(wait_time)
-        
-        # Reintentar
-        return self.acquire(wait=False)
+
+        # Reintentar: con varios hilos esperando, otro pudo tomar el slot liberado
+        return self.acquire(wait=True)
     
     def reset(self):
         """Resetea el rate limiter"""
@@ -88,6 +88,9 @@ class DomainRateLimiter:
             'diariooficial.interior.gob.cl': (5, 60),  # 5 requests por minuto
             'api.gemini.google.com': (60, 60),  # 60 requests por minuto
             'api.huggingface.co': (30, 60),  # 30 requests por minuto
+            'api.openai.com': (500, 60),  # 500 requests por minuto
+            'api.groq.com': (30, 60),  # 30 requests por minuto (plan gratuito)
+            'api.deepseek.com': (60, 60),  # 60 requests por minuto
         }
         self.lock = threading.Lock()
     
@@ -15,6 +15,9 @@ import urllib.parse
 from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib import messages
+from django.core.paginator import Paginator
+from alerts.services.search_index import search_index
+from .models import DocumentoBusqueda
 from alerts.utils.db_optimizations import optimize_empresa_queries, optimize_hecho_esencial_queries, optimize_metrics_queries, QueryOptimizer
 
 @login_required
@@ -333,6 +336,24 @@ def historial_informes(request):
             informes = []
     return render(request, 'alerts/historial_informes.html', {'informes': informes})
 
+@login_required
+def buscar(request):
+    """Búsqueda de texto completo en publicaciones del Diario Oficial, documentos del SII y hechos esenciales"""
+    consulta = request.GET.get('q', '').strip()
+    tipo = request.GET.get('tipo', '')
+    if tipo not in dict(DocumentoBusqueda.TIPO_CHOICES):
+        tipo = ''
+    page_obj = None
+    if consulta:
+        paginator = Paginator(search_index.buscar(consulta, tipo or None), 20)
+        page_obj = paginator.get_page(request.GET.get('page'))
+    return render(request, 'alerts/buscar.html', {
+        'consulta': consulta,
+        'tipo': tipo,
+        'tipos': DocumentoBusqueda.TIPO_CHOICES,
+        'page_obj': page_obj,
+    })
+
 @user_passes_test(lambda u: u.is_superuser)
 def admin_panel(request):
     from django.contrib.auth.models import User
@@ -35,10 +35,18 @@ from scraper_cmf_mejorado import ScraperCMFMejorado
 from alerts.cmf_criterios_profesionales import filtrar_hechos_profesional, get_icono_categoria
 from alerts.scraper_sii import obtener_circulares_sii, obtener_resoluciones_exentas_sii, obtener_jurisprudencia_administrativa_sii
 from alerts.cmf_resumenes_ai import generar_resumen_cmf
+from alerts.utils.concurrency import ejecutar_con_plazos
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Plazos máximos (segundos) de cada fuente; si una se atrasa el informe sale sin ella
+PLAZOS_FUENTES = {
+    'diario_oficial': float(os.environ.get('INFORME_PLAZO_DIARIO_OFICIAL', '900')),
+    'cmf': float(os.environ.get('INFORME_PLAZO_CMF', '300')),
+    'sii': float(os.environ.get('INFORME_PLAZO_SII', '180')),
+}
+
 def obtener_publicaciones_sii_dia(fecha):
     """
     Obtiene las publicaciones del SII del día anterior
@@ -155,7 +163,7 @@ def obtener_hechos_cmf_dia(fecha):
             materia = hecho.get('materia', hecho.get('titulo', ''))
             
             # Generar resumen con IA
-            resumen_ai = generar_resumen_cmf(entidad, materia)
+            resumen_ai = generar_resumen_cmf(entidad, materia, url=hecho.get('url_pdf'))
             if resumen_ai:
                 hecho['resumen'] = resumen_ai
                 logger.info(f"✅ Resumen generado para {entidad}")
@@ -169,6 +177,43 @@ def obtener_hechos_cmf_dia(fecha):
         logger.error(f"Error al leer hechos CMF: {str(e)}")
         return []
 
+def obtener_fuentes_informe(fecha, plazos=None):
+    """
+    Obtiene en paralelo el Diario Oficial, los hechos CMF y las publicaciones del SII.
+    Cada fuente tiene su propio plazo; si falla o no termina a tiempo se usa un resultado vacío.
+    Retorna (resultado_diario, hechos_cmf, publicaciones_sii).
+    """
+    logger.info("Obteniendo Diario Oficial, hechos CMF y publicaciones del SII en paralelo...")
+    resultados = ejecutar_con_plazos(
+        {
+            'diario_oficial': lambda: obtener_sumario_diario_oficial(fecha),
+            # Hechos CMF con actualización de enlaces
+            'cmf': lambda: obtener_hechos_cmf_dia(fecha),
+            'sii': lambda: obtener_publicaciones_sii_dia(fecha),
+        },
+        plazos or PLAZOS_FUENTES,
+        nombre='informe'
+    )
+    
+    vacios = {
+        'diario_oficial': {"publicaciones": [], "valores_monedas": None, "total_documentos": 0},
+        'cmf': [],
+        'sii': [],
+    }
+    datos = {}
+    for fuente, vacio in vacios.items():
+        resultado = resultados[fuente]
+        if resultado['vencido']:
+            logger.error(f"Fuente {fuente} superó su plazo, el informe se genera sin ella")
+            datos[fuente] = vacio
+        elif resultado['error'] is not None:
+            logger.error(f"Error obteniendo {fuente}: {resultado['error']}")
+            datos[fuente] = vacio
+        else:
+            datos[fuente] = resultado['resultado'] if resultado['resultado'] is not None else vacio
+    
+    return datos['diario_oficial'], datos['cmf'], datos['sii']
+
 def generar_informe_oficial(fecha=None):
     """
     Genera y envía el informe oficial del día
@@ -178,21 +223,7 @@ def generar_informe_oficial(fecha=None):
     
     logger.info(f"Generando informe para {fecha}")
     
-    # 1. Obtener datos del Diario Oficial
-    logger.info("Obteniendo datos del Diario Oficial...")
-    resultado_diario = obtener_sumario_diario_oficial(fecha)
-    
-    # 2. Obtener hechos CMF (con actualización de enlaces)
-    logger.info("Obteniendo hechos CMF...")
-    hechos_cmf = obtener_hechos_cmf_dia(fecha)
-    
-    # 3. Obtener publicaciones del SII
-    logger.info("Obteniendo publicaciones del SII...")
-    try:
-        publicaciones_sii = obtener_publicaciones_sii_dia(fecha)
-    except Exception as e:
-        logger.error(f"Error obteniendo SII: {e}")
-        publicaciones_sii = []
+    resultado_diario, hechos_cmf, publicaciones_sii = obtener_fuentes_informe(fecha)
     
     # 4. Generar HTML del informe
     html = generar_html_informe(fecha, resultado_diario, hechos_cmf, publicaciones_sii)
@@ -44,6 +44,7 @@ from alerts.cmf_resumenes_ai import generar_resumen_cmf
 from generar_informe_oficial_integrado_mejorado import (
     obtener_publicaciones_sii_dia,
     obtener_hechos_cmf_dia,
+    obtener_fuentes_informe,
     generar_html_informe
 )
 
@@ -213,21 +214,8 @@ def generar_informe_oficial_masivo(fecha=None):
     
     logger.info(f"📧 Destinatarios encontrados: {len(destinatarios)}")
     
-    # 2. Obtener datos del Diario Oficial
-    logger.info("Obteniendo datos del Diario Oficial...")
-    resultado_diario = obtener_sumario_diario_oficial(fecha)
-    
-    # 3. Obtener hechos CMF
-    logger.info("Obteniendo hechos CMF...")
-    hechos_cmf = obtener_hechos_cmf_dia(fecha)
-    
-    # 4. Obtener publicaciones del SII
-    logger.info("Obteniendo publicaciones del SII...")
-    try:
-        publicaciones_sii = obtener_publicaciones_sii_dia(fecha)
-    except Exception as e:
-        logger.error(f"Error obteniendo SII: {e}")
-        publicaciones_sii = []
+    # 2-4. Obtener Diario Oficial, hechos CMF y publicaciones del SII en paralelo
+    resultado_diario, hechos_cmf, publicaciones_sii = obtener_fuentes_informe(fecha)
     
     # 5. Generar HTML del informe
     html = generar_html_informe(fecha, resultado_diario, hechos_cmf, publicaciones_sii)
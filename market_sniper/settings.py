@@ -99,6 +99,38 @@ else:
     }
 
 
+# Caché
+# Con REDIS_URL el caché se comparte entre la web, el scheduler y los cron.
+# Sin Redis se usa un caché en disco, compartido por los procesos del mismo servidor.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'informe_diario',
+            'TIMEOUT': 86400,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache')),
+            'TIMEOUT': 86400,
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '5000')),
+            },
+        }
+    }
+
+
+# Almacén de PDFs descargados (direccionado por contenido, con evicción LRU por tamaño)
+PDF_STORE_DIR = os.environ.get('PDF_STORE_DIR', str(BASE_DIR / 'pdf_store'))
+PDF_STORE_MAX_BYTES = int(os.environ.get('PDF_STORE_MAX_MB', '2048')) * 1024 * 1024
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -4,7 +4,7 @@ Scraper mejorado de CMF que obtiene los enlaces directos correctos
 con el formato largo que incluye token + Base64
 """
 
-import requests
+from alerts.utils import http_client
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime, timedelta
@@ -21,10 +21,6 @@ class ScraperCMFMejorado:
     def __init__(self):
         self.base_url = "https://www.cmfchile.cl"
         self.hechos_portada_url = f"{self.base_url}/institucional/hechos/hechos_portada.php"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
     
     def obtener_hechos_dia(self, fecha: str) -> List[Dict]:
         """
@@ -35,7 +31,7 @@ class ScraperCMFMejorado:
         
         try:
             # Obtener la página de hechos recientes
-            response = self.session.get(self.hechos_portada_url)
+            response = http_client.get(self.hechos_portada_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
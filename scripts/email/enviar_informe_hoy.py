@@ -54,7 +54,7 @@ def obtener_publicaciones_diario(fecha):
                         # Intentar extraer texto del PDF y generar resumen
                         texto_pdf = extraer_texto_pdf_mixto(pub['url_pdf'])
                         if texto_pdf:
-                            resumen = generar_resumen_desde_texto(texto_pdf, pub['titulo'])
+                            resumen = generar_resumen_desde_texto(texto_pdf, pub['titulo'], url=pub['url_pdf'])
                             pub['resumen'] = resumen
                     except:
                         pass
@@ -134,7 +134,7 @@ def obtener_publicaciones_diario(fecha):
                     from alerts.scraper_diario_oficial import extraer_texto_pdf_mixto, generar_resumen_desde_texto
                     texto_pdf = extraer_texto_pdf_mixto(url_completa)
                     if texto_pdf:
-                        resumen = generar_resumen_desde_texto(texto_pdf, titulo)
+                        resumen = generar_resumen_desde_texto(texto_pdf, titulo, url=url_completa)
                 except:
                     pass
                 